@@ -0,0 +1,173 @@
+import argparse
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from Process import Process
+from ProcessTable import ProcessTable
+from utils import Utils
+
+try:
+    import numpy as np # opcional: colunas como arrays NumPy sobre o mmap
+except ImportError:
+    np = None
+
+# Carga de trabalho em formato binário de largura fixa, lida por mmap sem cópia nem parsing
+# Formato (little-endian):
+#   cabeçalho de 16 bytes: MAGIC, versão (uint8), flags (uint8), 2 bytes livres, n (uint64)
+#   colunas de n int64: todas as chegadas, depois todas as execuções, depois as prioridades
+# O PID do processo i é "P{i+1}", como na entrada de texto (Utils.readProcessesStdin).
+# FLAG_SORTED indica que as chegadas estão em ordem, então não há nada para ordenar ao abrir.
+# Abrir o arquivo só lê o cabeçalho e mapeia as colunas (arrays NumPy sobre o mmap ou, sem
+# NumPy, memoryviews): as páginas são lidas pelo sistema sob demanda, então uma carga de 100M
+# processos abre na hora. Pode ser usada como ProcessTable (table) ou como carga em streaming
+# (Scheduling.set_workload), percorrida em ordem de chegada em blocos.
+class BinaryWorkload:
+    MAGIC = b"PSWL"
+    VERSION = 1
+    HEADER = struct.Struct("<4sBBxxQ")
+    FLAG_SORTED = 1
+    CHUNK = 65536 # processos convertidos para int por bloco na iteração e na conversão
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as file:
+            header = file.read(self.HEADER.size)
+            if len(header) < self.HEADER.size:
+                raise ValueError(f"Arquivo de carga binária inválido: {path}")
+            magic, version, flags, count = self.HEADER.unpack(header)
+            if magic != self.MAGIC:
+                raise ValueError(f"Arquivo de carga binária inválido: {path}")
+            if version != self.VERSION:
+                raise ValueError(f"Versão de carga binária não suportada: {version}")
+            if os.fstat(file.fileno()).st_size < self.HEADER.size + 24 * count:
+                raise ValueError(f"Arquivo de carga binária truncado: {path}")
+            self.count = count
+            self.sorted = bool(flags & self.FLAG_SORTED)
+            self.arrival, self.burst, self.priority = self._columns(file, count)
+        self._table = None
+
+    # Mapeia as três colunas sem copiar
+    def _columns(self, file, count):
+        if count == 0:
+            return array('q'), array('q'), array('q')
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if np is not None:
+            data = np.frombuffer(buffer, dtype='<i8', count=3 * count, offset=self.HEADER.size)
+            return data[:count], data[count:2 * count], data[2 * count:]
+        data = memoryview(buffer)[self.HEADER.size:self.HEADER.size + 24 * count]
+        if sys.byteorder != 'little':
+            values = array('q', data.tobytes()) # memoryview só lê na ordem da máquina
+            values.byteswap()
+            data = memoryview(values)
+        else:
+            data = data.cast('q')
+        return data[:count], data[count:2 * count], data[2 * count:]
+
+    def __len__(self):
+        return self.count
+
+    # Pickle (modo paralelo): só o caminho, cada processo mapeia o arquivo de novo
+    def __reduce__(self):
+        return (BinaryWorkload, (self.path,))
+
+    # ProcessTable sobre as colunas mapeadas
+    def table(self):
+        if self._table is None:
+            self._table = MappedProcessTable(self)
+        return self._table
+
+    # Processos em ordem de chegada (como StreamWorkload), convertidos em blocos
+    def __iter__(self):
+        if self.sorted:
+            for start in range(0, self.count, self.CHUNK):
+                end = min(start + self.CHUNK, self.count)
+                rows = zip(self.arrival[start:end].tolist(), self.burst[start:end].tolist(),
+                           self.priority[start:end].tolist())
+                for i, (arrival, burst, priority) in enumerate(rows, start + 1):
+                    yield Process(f"P{i}", arrival, burst, priority)
+        else:
+            for i in self.table().arrival_order():
+                yield Process(f"P{i + 1}", int(self.arrival[i]), int(self.burst[i]), int(self.priority[i]))
+
+    # Converte registros (pid, chegada, execução, prioridade), como os de Utils.iterProcesses,
+    # para o formato binário em path. Os pids são descartados (viram P1, P2, ... pela posição).
+    # As colunas vão para arquivos temporários e são juntadas no final, então a memória
+    # não cresce com o tamanho da carga. Retorna o número de processos
+    @staticmethod
+    def write(records, path):
+        directory = os.path.dirname(os.path.abspath(path))
+        spools = [tempfile.TemporaryFile(dir=directory) for _ in range(3)]
+        columns = [array('q'), array('q'), array('q')]
+        count = 0
+        ordered = True
+        last_arrival = None
+        try:
+            for _, arrival, burst, priority in records:
+                if last_arrival is not None and arrival < last_arrival:
+                    ordered = False
+                last_arrival = arrival
+                columns[0].append(arrival)
+                columns[1].append(burst)
+                columns[2].append(priority)
+                count += 1
+                if len(columns[0]) >= BinaryWorkload.CHUNK:
+                    BinaryWorkload._flush(columns, spools)
+            BinaryWorkload._flush(columns, spools)
+
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as out:
+                flags = BinaryWorkload.FLAG_SORTED if ordered else 0
+                out.write(BinaryWorkload.HEADER.pack(BinaryWorkload.MAGIC, BinaryWorkload.VERSION, flags, count))
+                for spool in spools:
+                    spool.seek(0)
+                    shutil.copyfileobj(spool, out, 1 << 20)
+            os.replace(tmp, path)
+        finally:
+            for spool in spools:
+                spool.close()
+        return count
+
+    @staticmethod
+    def _flush(columns, spools):
+        for column, spool in zip(columns, spools):
+            if sys.byteorder != 'little':
+                column.byteswap()
+            column.tofile(spool)
+            del column[:]
+
+    # Converte linhas no formato de processos.txt para o formato binário
+    @staticmethod
+    def convert(lines, path):
+        return BinaryWorkload.write(Utils.iterProcesses(lines), path)
+
+    # Indica se o arquivo começa com o MAGIC do formato binário
+    @staticmethod
+    def is_binary(path):
+        with open(path, 'rb') as file:
+            return file.read(len(BinaryWorkload.MAGIC)) == BinaryWorkload.MAGIC
+
+
+# ProcessTable sobre as colunas de um BinaryWorkload
+# No pickle (modo paralelo, checkpoint) vai só o caminho do arquivo, e não as colunas
+class MappedProcessTable(ProcessTable):
+    def __init__(self, workload):
+        super().__init__(workload.arrival, workload.burst, workload.priority)
+        self.workload = workload
+        if workload.sorted:
+            self._order = range(len(workload)) # já está em ordem de chegada
+
+    def __reduce__(self):
+        return (BinaryWorkload.table, (self.workload,))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Converte uma carga no formato de processos.txt (stdin) "
+                                                 "para o formato binário")
+    parser.add_argument("output", help="arquivo binário de saída")
+    args = parser.parse_args()
+    count = BinaryWorkload.convert(sys.stdin, args.output)
+    print(f"{count} processos gravados em {args.output}")
@@ -0,0 +1,102 @@
+import io
+import os
+import pickle
+import random
+import tempfile
+import zlib
+from ProcessTable import ProcessTable
+from utils import Utils
+
+# Checkpoint de uma simulação longa (ver Scheduling.run_checkpointed)
+# Guarda o estado completo da sessão do SMPEngine: tempo, processos já admitidos (cursor da
+# entrada), filas de prontos, processo em execução e eventos de cada núcleo, timelines até agora,
+# trocas de contexto, o estado de cada processo (restante, início, término, prioridade dinâmica
+# ou as métricas acumuladas na carga em streaming) e o estado do random.
+# Formato: MAGIC + versão (1 byte) + pickle comprimido com zlib.
+# O pickle é escolhido porque o estado é um grafo de objetos do simulador (núcleos, filas com
+# as funções de chave, políticas, processos compartilhados entre filas e timelines, estado do
+# random), que um formato fixo teria que reproduzir campo a campo a cada mudança nos motores.
+# Carregar um pickle executa o código que o arquivo mandar: só continue (--resume) de
+# checkpoints gravados por você, nunca de arquivos de origem desconhecida. O MAGIC, a versão e
+# o hash da carga só detectam checkpoints de outra versão ou de outra carga, não arquivos forjados.
+# A carga não vai no arquivo: na continuação ela é lida de novo e conferida pelo hash, e a
+# ProcessTable é referenciada (persistent id) em vez de copiada.
+class Checkpoint:
+    MAGIC = b"SCHEDCKP"
+    VERSION = 3
+
+    # Parâmetros que precisam ser os mesmos para continuar a simulação
+    @staticmethod
+    def params(scheduling, method):
+        return {"method": method, "quantum": scheduling.quantum, "aging": scheduling.aging,
+                "cores": scheduling.cores, "placement": scheduling.placement, "steal": scheduling.steal,
+                "compact_timeline": scheduling.compact_timeline, "digest": scheduling.workload_digest()}
+
+    # Grava o checkpoint (arquivo temporário + rename, então um checkpoint nunca fica pela metade)
+    # procs: lista de Process, RunState ou MetricsAccumulator (o que run_algorithm retorna)
+    @staticmethod
+    def save(path, scheduling, engine, procs, finished):
+        state = {"params": Checkpoint.params(scheduling, engine.method), "engine": engine.snapshot(),
+                 "procs": procs, "finished": finished, "random": random.getstate(), "ties": Utils.ties}
+        body = _Pickler.dumps(state)
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, 'wb') as file:
+            file.write(Checkpoint.MAGIC + bytes([Checkpoint.VERSION]))
+            file.write(zlib.compress(body))
+        os.replace(tmp, path)
+
+    # Lê o checkpoint, restaura o estado no engine (SMPEngine) e no random
+    # Retorna (procs, finished); lança ValueError se o arquivo não é um checkpoint desta
+    # versão ou se a carga ou os parâmetros são outros
+    @staticmethod
+    def load(path, scheduling, engine, method):
+        with open(path, 'rb') as file:
+            data = file.read()
+        header = len(Checkpoint.MAGIC)
+        if data[:header] != Checkpoint.MAGIC:
+            raise ValueError(f"{path} não é um checkpoint")
+        if data[header] != Checkpoint.VERSION:
+            raise ValueError(f"Versão de checkpoint não suportada: {data[header]}")
+        state = _Unpickler.loads(zlib.decompress(data[header + 1:]), scheduling.table)
+        expected = Checkpoint.params(scheduling, method)
+        if state["params"] != expected:
+            changed = [k for k in expected if state["params"].get(k) != expected[k]]
+            raise ValueError(f"O checkpoint {path} é de outra simulação (diferem: {', '.join(changed)})")
+
+        procs = state["procs"]
+        if scheduling.workload is None:
+            if scheduling.table is not None:
+                scheduling.state = procs
+            else:
+                scheduling.processes = procs
+        engine.restore(state["engine"], scheduling.arrivals())
+        random.setstate(state["random"])
+        Utils.ties = state["ties"]
+        return procs, state["finished"]
+
+
+# Pickle que troca a ProcessTable por uma referência
+class _Pickler(pickle.Pickler):
+    @staticmethod
+    def dumps(obj):
+        buffer = io.BytesIO()
+        _Pickler(buffer, pickle.HIGHEST_PROTOCOL).dump(obj)
+        return buffer.getvalue()
+
+    def persistent_id(self, obj):
+        return "table" if isinstance(obj, ProcessTable) else None
+
+
+class _Unpickler(pickle.Unpickler):
+    @staticmethod
+    def loads(data, table):
+        unpickler = _Unpickler(io.BytesIO(data))
+        unpickler.table = table
+        return unpickler.load()
+
+    def persistent_load(self, pid):
+        if pid != "table" or self.table is None:
+            raise pickle.UnpicklingError(f"Referência desconhecida no checkpoint: {pid}")
+        return self.table
@@ -0,0 +1,103 @@
+from Policy import Policy
+from SMPEngine import Core
+
+# Motor de simulação orientado a eventos
+# Em vez de avançar o tempo de 1 em 1, salta direto para o próximo evento
+# (chegada, término ou fim do quantum). As decisões de escalonamento são as mesmas
+# do motor por ticks (inclusive a ordem das chamadas ao random), então com a mesma
+# semente as timelines, métricas e trocas de contexto são idênticas.
+# A timeline é gerada em trechos contíguos (tempo_inicio, tempo_fim, pid).
+# Um único laço (run) executa todos os algoritmos: as regras de cada um ficam numa
+# Policy (ver Policy.py), então uma otimização no laço vale para todos.
+class EventEngine:
+    def __init__(self, scheduling):
+        self.scheduling = scheduling # escalonador com os processos, quantum e aging
+
+    # Prepara os processos para a simulação e retorna o cursor em ordem de chegada
+    def _prepare(self):
+        self.scheduling.reset_processes()
+        return self.scheduling.arrivals()
+
+    # Executa uma política registrada pelo nome (Policy.register) e retorna (timeline, cs)
+    def run_policy(self, name):
+        return self.run(Policy.create(name, self.scheduling.quantum, self.scheduling.aging))
+
+    # Executa a simulação com uma política sobre uma CPU (um Core)
+    def run(self, policy):
+        time = 0 # Tempo atual
+        timeline = self.scheduling.new_timeline() # Trechos (tempo_inicio, tempo_fim, pid)
+        core = Core(0, policy.new_queue(), timeline) # Fila de prontos, processo atual e trocas de contexto
+        arrivals = self._prepare() # Processos em ordem de chegada (cursor com o indice idx)
+        finish_process = self.scheduling.finish_process
+        preemptive = policy.preemptive
+        arrive, select, dispatch = policy.arrive, policy.select, policy.dispatch
+
+        while True:
+            # Adiciona processos que chegaram até o tempo atual na fila de prontos
+            while arrivals.head is not None and arrivals.head.arrival <= time:
+                arrive(core, arrivals.pop())
+
+            # Escolhe o próximo processo: a CPU está livre, o quantum acabou ou pode haver preempção
+            process = core.current
+            if process is None or core.expired or preemptive:
+                process = select(core, time)
+                if process is not None:
+                    run = dispatch(core, process, time)
+                    core.current = process
+                    if process.start_time is None:
+                        process.start_time = time
+
+            if process is not None:
+                # Executa o tempo dado pela política (na preempção, só até a próxima chegada)
+                end = time + run
+                if preemptive and arrivals.head is not None and arrivals.head.arrival < end:
+                    end = arrivals.head.arrival
+                timeline.append((time, end, process.pid))
+                core.old_process = process
+                process.remaining -= end - time
+                if process.remaining == 0: # Processo terminou
+                    finish_process(process, end)
+                    core.current = None
+                elif end - time == run: # Quantum esgotado
+                    # os processos que chegaram durante a fatia entram na fila antes do atual
+                    while arrivals.head is not None and arrivals.head.arrival < end:
+                        arrive(core, arrivals.pop())
+                    policy.on_quantum_expiry(core, process, end)
+            else:
+                # CPU ociosa até a próxima chegada
+                end = arrivals.head.arrival if arrivals.head is not None else time + 1
+                timeline.append((time, end, None))
+                policy.on_tick(core, time)
+
+            time = end
+            if core.current is None and arrivals.exhausted() and not core.ready:
+                break # Sai se não há mais processos para executar
+        return timeline, core.cs
+
+    # FCFS (First Come, First Served)
+    def FCFS(self):
+        return self.run_policy("FCFS")
+
+    # Shortest Job First (SJF) - Não preemptivo
+    def SJF(self):
+        return self.run_policy("SJF")
+
+    # Shortest Remaning Time First - Shortest Job First Preemptivo
+    def SRTF(self):
+        return self.run_policy("SRTF")
+
+    # Por Prioridade (PS) - Cooperativo - Sem Preempção
+    def PriorityNonPreemptive(self):
+        return self.run_policy("PriorityNonPreemptive")
+
+    # Por Prioridade (PS) - Preemptivo
+    def PriorityPreemptive(self):
+        return self.run_policy("PriorityPreemptive")
+
+    # Round Robin (RR) - Preemptivo com Quantum e sem Prioridade
+    def RoundRobin(self):
+        return self.run_policy("RoundRobin")
+
+    # Round Robin (RR) - Com prioridade e envelhecimento
+    def RoundRobinPriorityAging(self):
+        return self.run_policy("RoundRobinPriorityAging")
@@ -0,0 +1,172 @@
+import heapq
+from ReadyQueue import OrderedBucket
+from utils import Utils
+
+try:
+    import numpy as np # opcional: FCFS vetorizado com somas acumuladas
+except ImportError:
+    np = None
+
+# Caminho rápido dos algoritmos sem preempção (FCFS, SJF e Prioridade sem preempção)
+# Sem preempção a escolha só muda quando um processo termina, então não é preciso simular
+# o tempo: a cada término o próximo processo sai da fila de prontos e executa até o fim.
+#  - FCFS: a ordem é a das chegadas (empates de chegada pela menor execução, e entre os
+#    iguais pelo desempate aleatório), e os tempos saem de uma soma acumulada das execuções
+#    com o máximo acumulado das chegadas (NumPy). Sem NumPy usa o laço por términos.
+#  - SJF e Prioridade: laço por términos, com a fila de prontos em baldes por chave (um heap
+#    das chaves e, em cada balde, os processos na ordem de chegada, num OrderedBucket como na
+#    ReadyQueue: o sorteio e a retirada custam O(log k) num grupo de k empatados)
+# As regras são as do motor por ticks: mesma ordem das chamadas ao random (um Utils.choice
+# por despacho, com os empatados na ordem de chegada), troca de contexto só quando o
+# despacho vem logo depois de outro processo (não depois de um trecho ocioso) e a mesma
+# timeline em trechos. Scheduling.run_algorithm escolhe este caminho sozinho quando ele se
+# aplica (ver applies).
+class FastPath:
+    METHODS = ("FCFS", "SJF", "PriorityNonPreemptive")
+
+    def __init__(self, scheduling):
+        self.scheduling = scheduling
+
+    # O caminho rápido precisa da carga inteira (lista ou tabela) e de execuções positivas
+    # (o motor por ticks executa pelo menos um tick de cada processo)
+    @staticmethod
+    def applies(scheduling, method):
+        if method not in FastPath.METHODS or scheduling.engine == "smp" or scheduling.workload is not None:
+            return False
+        if scheduling.table is not None:
+            burst = scheduling.table.burst
+            if np is not None and isinstance(burst, np.ndarray):
+                return len(burst) == 0 or int(burst.min()) > 0
+            return all(b > 0 for b in burst)
+        return all(p.burst > 0 for p in scheduling.processes)
+
+    def FCFS(self):
+        if np is None:
+            return self._by_completion(lambda arrival, burst, priority: (arrival, burst))
+        return self._fcfs_numpy()
+
+    def SJF(self):
+        return self._by_completion(lambda arrival, burst, priority: burst)
+
+    def PriorityNonPreemptive(self):
+        return self._by_completion(lambda arrival, burst, priority: (-priority, burst))
+
+    # Processos em ordem de chegada: (processos ou índices da tabela, chegadas, execuções, prioridades)
+    def _columns(self):
+        scheduling = self.scheduling
+        scheduling.reset_processes()
+        if scheduling.table is not None:
+            table = scheduling.table
+            order = table.arrival_order()
+            if np is not None and isinstance(table.arrival, np.ndarray):
+                order = np.asarray(order)
+                return (order.tolist(), table.arrival[order].tolist(), table.burst[order].tolist(),
+                        table.priority[order].tolist())
+            return (list(order), [table.arrival[i] for i in order], [table.burst[i] for i in order],
+                    [table.priority[i] for i in order])
+        procs = sorted(scheduling.processes, key=lambda p: p.arrival)
+        return (procs, [p.arrival for p in procs], [p.burst for p in procs], [p.priority for p in procs])
+
+    # Laço por términos: em cada despacho escolhe no balde da menor chave (key(chegada, execução,
+    # prioridade)) e executa o processo até o fim; sem prontos salta para a próxima chegada
+    def _by_completion(self, key):
+        procs, arrival, burst, priority = self._columns()
+        n = len(procs)
+        keys = [] # heap das chaves com processos prontos
+        buckets = {} # chave -> posições (em ordem de chegada) dos prontos com a chave
+        schedule = [] # posições na ordem de execução
+        starts = []
+        choice = Utils.choice
+        time = 0
+        i = 0 # próxima chegada
+        while len(schedule) < n:
+            while i < n and arrival[i] <= time:
+                k = key(arrival[i], burst[i], priority[i])
+                bucket = buckets.get(k)
+                if bucket is None:
+                    buckets[k] = OrderedBucket((i,))
+                    heapq.heappush(keys, k)
+                else:
+                    bucket.append(i)
+                i += 1
+            if not keys:
+                time = arrival[i] # CPU ociosa até a próxima chegada
+                continue
+            bucket = buckets[keys[0]]
+            # desempate entre os de menor chave na ordem de chegada (mesmo balde da ReadyQueue)
+            chosen = bucket.pop(choice(range(len(bucket))))
+            if not bucket:
+                del buckets[heapq.heappop(keys)]
+            schedule.append(chosen)
+            starts.append(time)
+            time += burst[chosen]
+        return self._finish(procs, schedule, starts, [s + burst[j] for s, j in zip(starts, schedule)])
+
+    # FCFS com NumPy: a ordem de execução é a das chaves (chegada, execução) e cada grupo de
+    # chaves iguais é sorteado como na fila de prontos. O término do k-ésimo despacho é
+    # S_k + max(max(0, chegada_j) - S_(j-1) para j <= k), com S a soma acumulada das execuções
+    def _fcfs_numpy(self):
+        procs, arrival, burst, _ = self._columns()
+        n = len(procs)
+        if n == 0:
+            return self._finish(procs, [], [], [])
+        arrival = np.asarray(arrival, dtype=np.int64)
+        burst = np.asarray(burst, dtype=np.int64)
+        order = np.lexsort((burst, arrival)) # estável: os iguais ficam na ordem de chegada
+        same = (arrival[order][1:] == arrival[order][:-1]) & (burst[order][1:] == burst[order][:-1])
+        # grupos de chaves iguais: um Utils.choice por despacho, com os que sobram do grupo
+        ordered = order.tolist()
+        bounds = [0] + (np.flatnonzero(~same) + 1).tolist() + [n]
+        choice = Utils.choice
+        schedule = []
+        for lo, hi in zip(bounds, bounds[1:]):
+            if hi - lo == 1:
+                choice(range(1)) # um só candidato: o random avança como no motor
+                schedule.append(ordered[lo])
+            else:
+                members = OrderedBucket(ordered[lo:hi])
+                while members:
+                    schedule.append(members.pop(choice(range(len(members)))))
+        schedule = np.asarray(schedule, dtype=np.int64)
+
+        run = burst[schedule]
+        total = np.cumsum(run)
+        previous = total - run # S_(k-1)
+        finish = total + np.maximum.accumulate(np.maximum(arrival[schedule], 0) - previous)
+        start = finish - run
+        return self._finish(procs, schedule.tolist(), start.tolist(), finish.tolist())
+
+    # Grava início e término dos processos (na ordem de execução, como os términos do motor),
+    # monta a timeline e conta as trocas de contexto
+    # schedule: posições (em ordem de chegada) na ordem de execução
+    def _finish(self, procs, schedule, starts, finishes):
+        scheduling = self.scheduling
+        timeline = scheduling.new_timeline()
+        append = timeline.append
+        cs = 0
+        state = scheduling.state if scheduling.table is not None else None
+        table = scheduling.table
+        finish_process = scheduling.finish_process
+        previous = 0 # fim do último trecho (0 = nenhum)
+        for position, start, finish in zip(schedule, starts, finishes):
+            if start > previous:
+                append((previous, start, None))
+            elif previous:
+                cs += 1 # despacho logo depois de outro processo (previous 0: é o primeiro, no tempo 0)
+            if state is not None:
+                index = procs[position]
+                state.remaining[index] = 0
+                state.start_time[index] = start
+                append((start, finish, table.pid(index)))
+                if scheduling.on_finish is not None:
+                    finish_process(state.view(index), finish)
+                else:
+                    state.finish_time[index] = finish
+            else:
+                p = procs[position]
+                p.remaining = 0
+                p.start_time = start
+                append((start, finish, p.pid))
+                finish_process(p, finish)
+            previous = finish
+        return timeline, cs
@@ -0,0 +1,337 @@
+import math
+from statistics import NormalDist
+
+try:
+    import numpy as np # opcional: calcula as métricas de forma vetorizada
+except ImportError:
+    np = None
+
+# Métricas de uma execução de um algoritmo
+# Médias e distribuição (p50/p95/p99/max) de turnaround, espera e resposta
+# (resposta = primeira execução - chegada), utilização da CPU e vazão.
+# A simulação sempre começa no tempo 0, então o makespan é o maior tempo de término.
+class Metrics:
+    PERCENTILES = (50, 95, 99) # percentis reportados (além do máximo)
+
+    def __init__(self, n, cs, avg_turnaround, avg_waiting, avg_response,
+                 turnaround=None, waiting=None, response=None, busy_time=0, makespan=0, stddev=None):
+        self.n = n # processos terminados
+        self.cs = cs # trocas de contexto
+        self.avg_turnaround = avg_turnaround
+        self.avg_waiting = avg_waiting
+        self.avg_response = avg_response
+        # distribuições {"p50": ..., "p95": ..., "p99": ..., "max": ...} (None se não calculadas)
+        self.turnaround = turnaround
+        self.waiting = waiting
+        self.response = response
+        # desvios padrão {"turnaround": ..., "waiting": ..., "response": ...} (só no acumulador)
+        self.stddev = stddev
+        self.busy_time = busy_time # tempo com a CPU ocupada
+        self.makespan = makespan # tempo total da simulação
+        self.cpu_utilization = busy_time / makespan if makespan > 0 else 0
+        self.throughput = n / makespan if makespan > 0 else 0 # processos por unidade de tempo
+        self.cores = 1 # núcleos da máquina simulada
+
+    # Máquina com vários núcleos: busy_time é a soma dos núcleos, então a utilização
+    # é dividida pelo número de núcleos
+    def set_cores(self, cores):
+        self.cores = cores
+        self.cpu_utilization = self.busy_time / (self.makespan * cores) if self.makespan > 0 else 0
+        return self
+
+    # Dicionário com todos os campos (para JSON, tabelas, cache...)
+    def as_dict(self):
+        return {
+            "n": self.n, "cs": self.cs,
+            "avg_turnaround": self.avg_turnaround, "avg_waiting": self.avg_waiting,
+            "avg_response": self.avg_response,
+            "turnaround": self.turnaround, "waiting": self.waiting, "response": self.response,
+            "stddev": self.stddev, "busy_time": self.busy_time, "makespan": self.makespan,
+            "cpu_utilization": self.cpu_utilization, "throughput": self.throughput,
+            "cores": self.cores,
+        }
+
+    def __repr__(self):
+        return f"Metrics({self.as_dict()!r})"
+
+    # Calcula as métricas a partir de colunas de inteiros (listas, array('q') ou NumPy)
+    # Com NumPy as colunas array('q') são lidas sem cópia (np.frombuffer)
+    @staticmethod
+    def from_columns(arrival, burst, start, finish, cs):
+        n = len(finish)
+        if n == 0:
+            return Metrics(0, cs, 0, 0, 0)
+        if np is not None:
+            arrival, burst, start, finish = (Metrics._as_numpy(c) for c in (arrival, burst, start, finish))
+            turnaround = finish - arrival
+            waiting = turnaround - burst
+            response = start - arrival
+            busy_time = int(burst.sum())
+            makespan = int(finish.max())
+            summaries = [(float(values.mean()), Metrics._distribution_numpy(values))
+                         for values in (turnaround, waiting, response)]
+        else:
+            turnaround = [f - a for f, a in zip(finish, arrival)]
+            waiting = [t - b for t, b in zip(turnaround, burst)]
+            response = [s - a for s, a in zip(start, arrival)]
+            busy_time = sum(burst)
+            makespan = max(finish)
+            summaries = [(sum(values) / n, Metrics._distribution(values))
+                         for values in (turnaround, waiting, response)]
+        (avg_t, dist_t), (avg_w, dist_w), (avg_r, dist_r) = summaries
+        return Metrics(n, cs, avg_t, avg_w, avg_r, dist_t, dist_w, dist_r, busy_time, makespan)
+
+    # Calcula as métricas de uma lista de processos (uma passada para montar as colunas)
+    @staticmethod
+    def from_processes(processes, cs):
+        arrival, burst, start, finish = [], [], [], []
+        for p in processes:
+            arrival.append(p.arrival)
+            burst.append(p.burst)
+            start.append(p.start_time)
+            finish.append(p.finish_time)
+        return Metrics.from_columns(arrival, burst, start, finish, cs)
+
+    # Calcula as métricas direto das colunas de um RunState (ProcessTable), sem criar visões
+    @staticmethod
+    def from_run_state(state, cs):
+        table = state.table
+        return Metrics.from_columns(table.arrival, table.burst, state.start_time, state.finish_time, cs)
+
+    # Métricas do MetricsAccumulator (carga em streaming, modo resumo, API online): médias
+    # exatas, desvios padrão e percentis aproximados pelo QuantileSketch (máximo exato)
+    @staticmethod
+    def from_accumulator(totals, cs):
+        n = totals.count
+        if n == 0:
+            return Metrics(0, cs, 0, 0, 0)
+        stats = (totals.turnaround, totals.waiting, totals.response)
+        t, w, r = (stat.distribution() for stat in stats)
+        stddev = {"turnaround": stats[0].stddev, "waiting": stats[1].stddev, "response": stats[2].stddev}
+        return Metrics(n, cs, stats[0].mean, stats[1].mean, stats[2].mean, t, w, r,
+                       busy_time=totals.busy_time, makespan=totals.makespan, stddev=stddev)
+
+    @staticmethod
+    def _as_numpy(column):
+        if isinstance(column, np.ndarray):
+            return column.astype(np.int64, copy=False)
+        if isinstance(column, (list, range)):
+            return np.asarray(column, dtype=np.int64)
+        return np.frombuffer(column, dtype=np.int64) # array('q') / memoryview sem cópia
+
+    @staticmethod
+    def _distribution_numpy(values):
+        p50, p95, p99 = np.percentile(values, Metrics.PERCENTILES)
+        return {"p50": float(p50), "p95": float(p95), "p99": float(p99), "max": int(values.max())}
+
+    # Percentis com interpolação linear (mesmo resultado de numpy.percentile)
+    @staticmethod
+    def _distribution(values):
+        ordered = sorted(values)
+        last = len(ordered) - 1
+        result = {}
+        for q in Metrics.PERCENTILES:
+            position = last * q / 100
+            lo = math.floor(position)
+            hi = min(lo + 1, last)
+            result[f"p{q}"] = float(ordered[lo] + (ordered[hi] - ordered[lo]) * (position - lo))
+        result["max"] = ordered[-1]
+        return result
+
+
+# Acumulador de métricas para a carga em streaming e o modo resumo
+# Soma turnaround, espera e resposta conforme os processos terminam, sem guardar os processos,
+# então a memória não cresce com o tamanho da carga
+class MetricsAccumulator:
+    def __init__(self):
+        self.count = 0 # processos terminados
+        self.turnaround = RunningStats()
+        self.waiting = RunningStats()
+        self.response = RunningStats()
+        self.busy_time = 0 # soma dos tempos de execução
+        self.makespan = 0 # maior tempo de término
+
+    def __len__(self):
+        return self.count
+
+    # Registra um processo terminado
+    def add(self, process):
+        turnaround = process.finish_time - process.arrival
+        self.count += 1
+        self.turnaround.add(turnaround)
+        self.waiting.add(turnaround - process.burst)
+        self.response.add(process.start_time - process.arrival)
+        self.busy_time += process.burst
+        if process.finish_time > self.makespan:
+            self.makespan = process.finish_time
+
+    # Junta outro acumulador (ex: de outra parte da carga) neste
+    def merge(self, other):
+        self.count += other.count
+        self.turnaround.merge(other.turnaround)
+        self.waiting.merge(other.waiting)
+        self.response.merge(other.response)
+        self.busy_time += other.busy_time
+        self.makespan = max(self.makespan, other.makespan)
+        return self
+
+
+# Estatísticas de uma métrica com memória constante
+# Soma exata (média igual à das listas), variância pelo método de Welford, máximo exato e
+# percentis pelo QuantileSketch
+class RunningStats:
+    __slots__ = ('count', 'total', 'mean_estimate', 'm2', 'max', 'sketch')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.mean_estimate = 0.0 # média de Welford (só para a variância)
+        self.m2 = 0.0 # soma dos quadrados dos desvios
+        self.max = None
+        self.sketch = QuantileSketch()
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        delta = value - self.mean_estimate
+        self.mean_estimate += delta / self.count
+        self.m2 += delta * (value - self.mean_estimate)
+        if self.max is None or value > self.max:
+            self.max = value
+        self.sketch.add(value)
+
+    # Junta outra RunningStats (fórmula de Chan para a variância)
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other.mean_estimate - self.mean_estimate
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.mean_estimate += delta * other.count / count
+        self.count = count
+        self.total += other.total
+        if self.max is None or other.max > self.max:
+            self.max = other.max
+        self.sketch.merge(other.sketch)
+        return self
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    # Desvio padrão populacional
+    @property
+    def stddev(self):
+        return math.sqrt(self.m2 / self.count) if self.count else 0.0
+
+    # Distribuição no formato de Metrics ({"p50": ..., "max": ...})
+    # O esboço estima o meio do bucket, então o percentil é limitado pelo máximo exato
+    def distribution(self):
+        result = {f"p{q}": min(self.sketch.quantile(q / 100), self.max) for q in Metrics.PERCENTILES}
+        result["max"] = self.max
+        return result
+
+
+# Esboço de quantis com erro relativo limitado (buckets logarítmicos, como o DDSketch)
+# O valor v > 0 cai no bucket ceil(log(v) / log(gamma)), com gamma = (1 + a) / (1 - a), e o
+# quantil é estimado pelo meio do bucket com erro relativo de no máximo a (accuracy).
+# Os buckets crescem com o logaritmo da faixa de valores e não com o número de valores
+# (com a = 1% cerca de 1000 buckets cobrem de 1 a 10^9). Valores <= 0 ficam em zeros.
+class QuantileSketch:
+    __slots__ = ('accuracy', 'gamma', 'log_gamma', 'buckets', 'zeros', 'count')
+
+    def __init__(self, accuracy=0.01):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {} # índice -> quantidade
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value <= 0:
+            self.zeros += 1
+        else:
+            index = math.ceil(math.log(value) / self.log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other):
+        if other.accuracy != self.accuracy:
+            raise ValueError("Só é possível juntar esboços com a mesma precisão")
+        self.count += other.count
+        self.zeros += other.zeros
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        return self
+
+    # Quantil q (0 a 1) com interpolação linear entre os postos vizinhos (como numpy.percentile)
+    def quantile(self, q):
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        lo = math.floor(rank)
+        hi = min(lo + 1, self.count - 1)
+        low, high = self._values(lo, hi)
+        return low + (high - low) * (rank - lo)
+
+    # Valores estimados dos postos lo <= hi (0 = menor valor)
+    def _values(self, lo, hi):
+        seen = self.zeros
+        low = 0.0 if lo < seen else None
+        if hi < seen:
+            return low, 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if low is None and lo < seen:
+                low = 2 * self.gamma ** index / (self.gamma + 1)
+            if hi < seen:
+                return low, 2 * self.gamma ** index / (self.gamma + 1)
+
+
+# Resumo de N replicações de um algoritmo com sementes independentes
+# Para cada campo (FIELDS) guarda (média, limite inferior, limite superior) do intervalo
+# de confiança da média (t de Student).
+# ties: desempates aleatórios da primeira replicação; com 0 a execução é determinística
+# e as outras replicações não são executadas (n = 1, intervalo de largura zero)
+class ReplicationSummary:
+    FIELDS = ("avg_turnaround", "avg_waiting", "cs")
+
+    # samples: lista de tuplas com os valores de FIELDS de cada replicação
+    def __init__(self, samples, confidence=0.95, ties=0):
+        self.n = len(samples)
+        self.confidence = confidence
+        self.ties = ties
+        for i, field in enumerate(self.FIELDS):
+            setattr(self, field, ReplicationSummary._interval([sample[i] for sample in samples], confidence))
+
+    def as_dict(self):
+        result = {"n": self.n, "confidence": self.confidence, "ties": self.ties}
+        for field in self.FIELDS:
+            mean, low, high = getattr(self, field)
+            result[field] = {"mean": mean, "low": low, "high": high}
+        return result
+
+    @staticmethod
+    def _interval(values, confidence):
+        n = len(values)
+        mean = sum(values) / n
+        if n < 2:
+            return (mean, mean, mean)
+        variance = sum((v - mean) ** 2 for v in values) / (n - 1)
+        half = ReplicationSummary._t_quantile((1 + confidence) / 2, n - 1) * math.sqrt(variance / n)
+        return (mean, mean - half, mean + half)
+
+    # Quantil p da t de Student com dof graus de liberdade
+    # Exato para 1 e 2 graus; senão expansão de Cornish-Fisher a partir da normal
+    @staticmethod
+    def _t_quantile(p, dof):
+        if dof == 1:
+            return math.tan(math.pi * (p - 0.5))
+        if dof == 2:
+            return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+        z = NormalDist().inv_cdf(p)
+        g1 = (z ** 3 + z) / 4
+        g2 = (5 * z ** 5 + 16 * z ** 3 + 3 * z) / 96
+        g3 = (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / 384
+        return z + g1 / dof + g2 / dof ** 2 + g3 / dof ** 3
@@ -0,0 +1,157 @@
+import argparse
+import asyncio
+import json
+import socket
+import sys
+from Policy import Policy
+from Process import Process
+from Scheduling import Scheduling
+from SMPEngine import SMPEngine
+from utils import Utils
+
+# Servidor do escalonador online
+# Protocolo em linhas JSON sobre TCP: cada pedido é um objeto com "op" e cada resposta
+# é um objeto com "ok" (e "error" quando ok é false):
+#   {"op": "submit", "pid": "P1", "arrival": 3, "burst": 5, "priority": 1}
+#   {"op": "advance", "to": 10}   -> {"ok": true, "time": 10, "decisions": [[tempo, núcleo, ação, pid], ...]}
+#                                    ("to" ausente ou null processa tudo o que já foi enviado)
+#   {"op": "next"}                -> {"ok": true, "decision": [tempo, núcleo, ação, pid] ou null}
+#   {"op": "metrics"}             -> {"ok": true, "metrics": {...}}
+# Todos os clientes compartilham a mesma simulação. Os pedidos são tratados na ordem em que
+# chegam, sem threads, e as respostas saem sem o atraso do algoritmo de Nagle.
+class OnlineServer:
+    def __init__(self, scheduling, method):
+        self.scheduling = scheduling
+        scheduling.start_online(method)
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def handle(self, reader, writer):
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write(json.dumps(self.dispatch(line)).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    # Executa um pedido e retorna a resposta
+    def dispatch(self, line):
+        try:
+            request = json.loads(line)
+            op = request.get("op")
+            scheduling = self.scheduling
+            if op == "submit":
+                scheduling.submit(Process(str(request["pid"]), int(request["arrival"]),
+                                          int(request["burst"]), int(request.get("priority", 0))))
+                return {"ok": True}
+            if op == "advance":
+                scheduling.advance(request.get("to"))
+                decisions = []
+                while (decision := scheduling.next_decision()) is not None:
+                    decisions.append(decision)
+                return {"ok": True, "time": scheduling.online.now, "decisions": decisions}
+            if op == "next":
+                return {"ok": True, "decision": scheduling.next_decision()}
+            if op == "metrics":
+                return {"ok": True, "metrics": scheduling.online_metrics().as_dict()}
+            return {"ok": False, "error": f"Operação desconhecida: {op}"}
+        except (ValueError, KeyError, TypeError) as e:
+            return {"ok": False, "error": str(e)}
+
+
+# Cliente asyncio do OnlineServer (um pedido por vez na conexão)
+class OnlineClient:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @staticmethod
+    async def connect(host="127.0.0.1", port=8765):
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.get_extra_info('socket').setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return OnlineClient(reader, writer)
+
+    async def request(self, **message):
+        self.writer.write(json.dumps(message).encode() + b"\n")
+        await self.writer.drain()
+        response = json.loads(await self.reader.readline())
+        if not response["ok"]:
+            raise ValueError(response["error"])
+        return response
+
+    async def submit(self, pid, arrival, burst, priority):
+        await self.request(op="submit", pid=pid, arrival=arrival, burst=burst, priority=priority)
+
+    # Avança o tempo e retorna as decisões tomadas até to_time
+    async def advance(self, to_time=None):
+        return (await self.request(op="advance", to=to_time))["decisions"]
+
+    async def next_decision(self):
+        return (await self.request(op="next"))["decision"]
+
+    async def metrics(self):
+        return (await self.request(op="metrics"))["metrics"]
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+# Envia os processos de uma carga em ordem de chegada, avançando o tempo a cada instante
+# de chegada, e imprime as decisões conforme elas saem
+async def replay(host, port, records):
+    client = await OnlineClient.connect(host, port)
+    try:
+        records = sorted(records, key=lambda r: r[1])
+        i = 0
+        while i < len(records):
+            arrival = records[i][1]
+            while i < len(records) and records[i][1] == arrival:
+                await client.submit(*records[i])
+                i += 1
+            for decision in await client.advance(arrival):
+                print(*decision)
+        for decision in await client.advance():
+            print(*decision)
+        print(json.dumps(await client.metrics()))
+    finally:
+        await client.close()
+
+def parseArgs():
+    parser = argparse.ArgumentParser(description="Escalonador online (servidor e cliente de teste)")
+    parser.add_argument("mode", choices=("serve", "replay"),
+                        help="serve: inicia o servidor; replay: envia a carga do stdin para o servidor")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--algorithm", choices=sorted(Policy.registry), default="RoundRobin",
+                        help="algoritmo do servidor")
+    parser.add_argument("--cores", type=int, default=1, help="núcleos simulados pelo servidor")
+    parser.add_argument("--placement", choices=SMPEngine.PLACEMENTS, default="least-loaded")
+    parser.add_argument("--no-steal", action="store_true")
+    parser.add_argument("--seed", type=int, default=None, help="semente do desempate aleatório")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parseArgs()
+    if args.mode == "replay":
+        asyncio.run(replay(args.host, args.port, list(Utils.iterProcesses(sys.stdin))))
+    else:
+        quantum, aging = Utils.readConfig()
+        scheduling = Scheduling(quantum=quantum, aging=aging, engine="smp", seed=args.seed, cores=args.cores,
+                                placement=args.placement, steal=not args.no_steal)
+        print(f"Servidor {args.algorithm} em {args.host}:{args.port} ({args.cores} núcleo(s))", flush=True)
+        try:
+            asyncio.run(OnlineServer(scheduling, args.algorithm).serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,199 @@
+from collections import deque
+from operator import attrgetter
+from utils import Utils
+from ReadyQueue import ReadyQueue, MultiLevelQueue
+
+# Política de escalonamento: as regras de um algoritmo sobre a fila de prontos de um núcleo
+# (Core). Os laços ficam nos motores (EventEngine com uma CPU, SMPEngine com vários núcleos),
+# que chamam os ganchos abaixo; a chegada, a contagem de tempo, o início/término dos processos
+# e a condição de parada são os mesmos para todos os algoritmos.
+#   preemptive: uma chegada interrompe o processo em execução e a escolha é refeita
+#   new_queue: cria a fila de prontos do núcleo
+#   arrive: um processo chegou ao núcleo
+#   select: escolhe o próximo processo (pode ser o atual, se preemptive) ou None
+#   dispatch: o processo escolhido vai executar; conta a troca de contexto e retorna por
+#             quanto tempo ele executa antes do próximo evento do núcleo
+#   on_quantum_expiry: o processo executou o tempo todo de dispatch e não terminou
+#   on_tick: o núcleo ficou ocioso (nada para executar)
+#   steal: tira o próximo processo da fila de um núcleo para outro (roubo de trabalho)
+# Novas políticas são registradas com Policy.register(nome, fábrica) e ficam disponíveis
+# pelo nome em Scheduling.run_algorithm, como os algoritmos originais.
+class Policy:
+    preemptive = False
+    registry = {} # nome -> fábrica(quantum, aging)
+
+    @staticmethod
+    def register(name, factory):
+        Policy.registry[name] = factory
+
+    @staticmethod
+    def create(name, quantum, aging):
+        factory = Policy.registry.get(name)
+        if factory is None:
+            raise ValueError(f"Algoritmo desconhecido: {name}")
+        return factory(quantum, aging)
+
+    def new_queue(self):
+        raise NotImplementedError
+
+    def arrive(self, core, process):
+        core.ready.push(process)
+
+    def select(self, core, time):
+        raise NotImplementedError
+
+    # Troca de contexto pela timeline: só quando o trecho anterior é de outro processo
+    # (depois de um trecho ocioso não conta). Executa até o fim
+    def dispatch(self, core, process, time):
+        timeline = core.timeline
+        if timeline:
+            last = timeline[-1][2]
+            if last is not None and last != process.pid:
+                core.cs += 1
+        return process.remaining
+
+    def on_quantum_expiry(self, core, process, time):
+        pass
+
+    def on_tick(self, core, time):
+        pass
+
+    def steal(self, victim):
+        return victim.ready.pop_best(_first)
+
+
+# Chaves das filas de prontos e desempates (funções do módulo, não lambdas, para as filas
+# irem no pickle do checkpoint)
+def _arrival_key(p):
+    return (p.arrival, p.remaining)
+
+def _priority_key(p):
+    return (-p.priority, p.remaining)
+
+# as duas chaves terminam no tempo restante, então os empatados já são os de menor tempo
+# restante e o desempate se reduz ao sorteio entre eles
+def _break_tie(tied):
+    return Utils.choice(tied)
+
+def _first(tied):
+    return tied[0]
+
+
+# FCFS, SJF e Prioridade sem preempção: executa cada processo até o fim
+# key: chave da fila de prontos (menor sai primeiro)
+# tie_break: desempate entre os processos com a mesma chave
+class NonPreemptive(Policy):
+    def __init__(self, key, tie_break):
+        self.key = key
+        self.tie_break = tie_break
+
+    def new_queue(self):
+        return ReadyQueue(self.key)
+
+    def select(self, core, time):
+        return core.ready.pop_best(self.tie_break) if core.ready else None
+
+
+# SRTF e Prioridade com preempção: escolhe de novo a cada chegada
+# choose: função que escolhe (e tira da fila) o próximo processo dado o processo atual
+class Preemptive(Policy):
+    preemptive = True
+
+    def __init__(self, key, choose):
+        self.key = key
+        self.choose = choose
+
+    def new_queue(self):
+        return ReadyQueue(self.key)
+
+    def select(self, core, time):
+        if core.current is None and not core.ready:
+            return None
+        return self.choose(core.ready, core.current)
+
+    # Troca de contexto pelo último processo que executou; o interrompido volta para a fila
+    def dispatch(self, core, process, time):
+        old = core.old_process
+        if old and old.pid != process.pid:
+            if old.remaining > 0:
+                core.ready.push(old)
+            core.cs += 1
+        return process.remaining
+
+
+# Round Robin: fatias inteiras do quantum, o processo volta para o fim da fila
+class RoundRobin(Policy):
+    def __init__(self, quantum):
+        self.quantum = quantum
+
+    def new_queue(self):
+        return deque()
+
+    def arrive(self, core, process):
+        core.ready.append(process)
+
+    def select(self, core, time):
+        return core.ready.popleft() if core.ready else None
+
+    # Uma fatia do quantum (quantum <= 0 executa até o fim)
+    def dispatch(self, core, process, time):
+        remaining = Policy.dispatch(self, core, process, time)
+        timeslice = min(self.quantum, remaining)
+        return timeslice if timeslice > 0 else remaining
+
+    # Volta para o fim da fila, antes das chegadas do instante em que o quantum acabou
+    def on_quantum_expiry(self, core, process, time):
+        core.current = None
+        core.ready.append(process)
+
+    def steal(self, victim):
+        return victim.ready.popleft()
+
+
+# Round Robin com prioridade e envelhecimento (MultiLevelQueue)
+class RoundRobinAging(Policy):
+    def __init__(self, quantum, aging):
+        self.quantum = quantum
+        self.aging = aging
+
+    def new_queue(self):
+        return MultiLevelQueue(self.aging)
+
+    def select(self, core, time):
+        prefer = None
+        if core.expired:
+            # envelhece os prontos antes de re-enfileirar o processo atual, depois das chegadas
+            if self.aging > 0:
+                core.ready.age()
+            core.ready.push(core.current)
+            prefer = core.current
+            core.current = None
+            core.expired = False
+        return Utils.chooseNext(core.ready, prefer)
+
+    # Troca de contexto pelo último processo que executou; executa o quantum
+    def dispatch(self, core, process, time):
+        old = core.old_process
+        if old is not None and old.pid != process.pid:
+            core.cs += 1
+        remaining = process.remaining
+        timeslice = min(self.quantum, remaining)
+        return timeslice if timeslice > 0 else remaining
+
+    # Volta para a fila na próxima escolha (depois das chegadas deste instante)
+    def on_quantum_expiry(self, core, process, time):
+        core.expired = True
+
+    # O envelhecimento no ocioso só descarta os níveis vazios (não há ninguém pronto)
+    def on_tick(self, core, time):
+        if self.aging > 0:
+            core.ready.age()
+
+
+Policy.register("FCFS", lambda quantum, aging: NonPreemptive(_arrival_key, _break_tie))
+Policy.register("SJF", lambda quantum, aging: NonPreemptive(attrgetter('burst'), Utils.choice))
+Policy.register("SRTF", lambda quantum, aging: Preemptive(attrgetter('remaining'), Utils.chooseNextSRTF))
+Policy.register("PriorityNonPreemptive", lambda quantum, aging: NonPreemptive(_priority_key, _break_tie))
+Policy.register("PriorityPreemptive", lambda quantum, aging: Preemptive(_priority_key, Utils.chooseNextPriority))
+Policy.register("RoundRobin", lambda quantum, aging: RoundRobin(quantum))
+Policy.register("RoundRobinPriorityAging", lambda quantum, aging: RoundRobinAging(quantum, aging))
@@ -1,6 +1,10 @@
 
 # Estrutura de dados para um processo
 class Process:
+    # sem __dict__: cada processo ocupa bem menos memória
+    __slots__ = ('pid', 'arrival', 'burst', 'priority', 'remaining', 'start_time',
+                 'finish_time', 'waiting_time', 'turnaround_time', 'dynamic_priority')
+
     def __init__(self, pid, arrival, burst, priority):
         self.pid = pid              # Processo P1, P2, ...
         self.arrival = arrival      # Tempo de chegada em segundos
@@ -0,0 +1,168 @@
+from array import array
+
+try:
+    import numpy as np # opcional: acelera a ordenação e aceita colunas NumPy/memmap
+except ImportError:
+    np = None
+
+# Tabela de processos em colunas (struct-of-arrays)
+# A especificação (chegada, execução, prioridade) fica em colunas imutáveis de inteiros,
+# separada do estado de cada execução (RunState). Colunas podem ser array('q'), arrays
+# NumPy ou qualquer sequência indexável de inteiros.
+# O PID do processo i é "P{i+1}" (como em Utils.readProcessesStdin) ou vem de pids.
+class ProcessTable:
+    def __init__(self, arrival, burst, priority, pids=None):
+        if not (len(arrival) == len(burst) == len(priority)):
+            raise ValueError("As colunas da tabela de processos devem ter o mesmo tamanho")
+        self.arrival = arrival
+        self.burst = burst
+        self.priority = priority
+        self.pids = pids # None = P1, P2, ...
+        self._order = None # índices em ordem de chegada (calculado sob demanda)
+
+    def __len__(self):
+        return len(self.arrival)
+
+    # Cria a tabela a partir de tuplas (pid, chegada, execução, prioridade)
+    @staticmethod
+    def from_records(records):
+        arrival, burst, priority = array('q'), array('q'), array('q')
+        pids = []
+        default_pids = True # os pids seguem a numeração P1, P2, ...
+        for pid, a, b, p in records:
+            default_pids = default_pids and pid == f"P{len(pids) + 1}"
+            pids.append(pid)
+            arrival.append(a)
+            burst.append(b)
+            priority.append(p)
+        return ProcessTable(arrival, burst, priority, None if default_pids else pids)
+
+    def pid(self, i):
+        return self.pids[i] if self.pids is not None else f"P{i + 1}"
+
+    # Índices dos processos em ordem de chegada (ordenação estável, como sorted por arrival)
+    def arrival_order(self):
+        if self._order is None:
+            n = len(self)
+            if np is not None and isinstance(self.arrival, np.ndarray):
+                self._order = np.argsort(self.arrival, kind='stable')
+            elif all(self.arrival[i] <= self.arrival[i + 1] for i in range(n - 1)):
+                self._order = range(n) # já está em ordem, não precisa de índice
+            else:
+                self._order = array('q', sorted(range(n), key=self.arrival.__getitem__))
+        return self._order
+
+    # Cria um novo estado de execução sobre a tabela
+    def new_run(self):
+        return RunState(self)
+
+
+# Estado de uma execução sobre a ProcessTable, também em colunas
+# Várias execuções podem usar a mesma tabela sem copiar a especificação
+class RunState:
+    UNSET = -(2 ** 63) # valor das colunas de tempo ainda não marcadas (None no Process)
+
+    def __init__(self, table):
+        self.table = table
+        n = len(table)
+        self.remaining = array('q', bytes(8 * n))
+        self.start_time = array('q', bytes(8 * n))
+        self.finish_time = array('q', bytes(8 * n))
+        self.dynamic_priority = array('q', bytes(8 * n))
+        self.reset()
+
+    def __len__(self):
+        return len(self.table)
+
+    # Percorre os processos (visões) em ordem de índice
+    def __iter__(self):
+        return (ProcessView(self, i) for i in range(len(self.table)))
+
+    # Reseta todos os processos (equivale a Process.reset em cada um)
+    def reset(self):
+        n = len(self.table)
+        self.remaining[:] = RunState._copy(self.table.burst)
+        self.start_time[:] = array('q', [RunState.UNSET]) * n
+        self.finish_time[:] = array('q', [RunState.UNSET]) * n
+        self.dynamic_priority[:] = RunState._copy(self.table.priority)
+
+    # Copia uma coluna da especificação para um array('q')
+    @staticmethod
+    def _copy(column):
+        if np is not None and isinstance(column, np.ndarray):
+            values = array('q')
+            values.frombytes(column.astype(np.int64).tobytes())
+            return values
+        return array('q', column)
+
+    # Visão do processo i (os algoritmos criam uma por chegada)
+    def view(self, i):
+        return ProcessView(self, i)
+
+
+# Visão de um processo da ProcessTable com a mesma interface de Process
+# Não guarda dados: lê a especificação da tabela e lê/escreve o estado nas colunas do RunState
+class ProcessView:
+    __slots__ = ('state', 'index')
+
+    def __init__(self, state, index):
+        self.state = state
+        self.index = index
+
+    pid = property(lambda self: self.state.table.pid(self.index))
+    arrival = property(lambda self: self.state.table.arrival[self.index])
+    burst = property(lambda self: self.state.table.burst[self.index])
+    priority = property(lambda self: self.state.table.priority[self.index])
+
+    @property
+    def remaining(self):
+        return self.state.remaining[self.index]
+
+    @remaining.setter
+    def remaining(self, value):
+        self.state.remaining[self.index] = value
+
+    @property
+    def dynamic_priority(self):
+        return self.state.dynamic_priority[self.index]
+
+    @dynamic_priority.setter
+    def dynamic_priority(self, value):
+        self.state.dynamic_priority[self.index] = value
+
+    @property
+    def start_time(self):
+        value = self.state.start_time[self.index]
+        return None if value == RunState.UNSET else value
+
+    @start_time.setter
+    def start_time(self, value):
+        self.state.start_time[self.index] = RunState.UNSET if value is None else value
+
+    @property
+    def finish_time(self):
+        value = self.state.finish_time[self.index]
+        return None if value == RunState.UNSET else value
+
+    @finish_time.setter
+    def finish_time(self, value):
+        self.state.finish_time[self.index] = RunState.UNSET if value is None else value
+
+    @property
+    def turnaround_time(self): # Tempo de resposta do processo
+        finish = self.finish_time
+        return None if finish is None else finish - self.arrival
+
+    @property
+    def waiting_time(self): # Tempo de espera do processo
+        turnaround = self.turnaround_time
+        return 0 if turnaround is None else turnaround - self.burst
+
+    def reset(self):
+        self.remaining = self.burst
+        self.start_time = None
+        self.finish_time = None
+        self.dynamic_priority = self.priority
+
+    def get_info(self):
+        return f"PID: {self.pid}, Arrival: {self.arrival}, Burst: {self.burst}, Priority: {self.priority}"
@@ -0,0 +1,147 @@
+import cProfile
+import json
+import pstats
+from collections import Counter, defaultdict
+from time import perf_counter
+from FastPath import FastPath
+from Policy import Policy, NonPreemptive, Preemptive, RoundRobin, RoundRobinAging
+from ReadyQueue import ReadyQueue, MultiLevelQueue
+from Scheduling import Scheduling
+from SMPEngine import LoadIndex
+from Timeline import Timeline, TimelineSummary
+from utils import Utils
+
+# Instrumentação dos escalonadores
+# install() troca os métodos do caminho quente (filas de prontos e ganchos das políticas,
+# desempates, envelhecimento, balanceamento do smp, caminho rápido, timeline e métricas) por versões que contam as chamadas e medem o tempo com perf_counter;
+# uninstall() devolve os originais. Desligado, o código não tem nenhum teste extra, então o
+# custo é zero. Ligado, cada chamada medida custa duas leituras do relógio.
+# As contagens e os tempos são separados por algoritmo (o método passado a run_algorithm).
+# O tempo de cada fase é exclusivo: uma chamada medida dentro de outra (ex: Utils.choice dentro
+# de ReadyQueue.pop_best) conta só na fase de dentro. O que sobra do tempo de run_algorithm
+# é o laço principal do algoritmo ("simulação").
+# Cargas vindas do cache não passam por run_algorithm e não aparecem no perfil.
+class Profiler:
+    # (classe, método, fase)
+    TARGETS = [
+        (ReadyQueue, "push", "fila de prontos"),
+        (ReadyQueue, "push_front", "fila de prontos"),
+        (ReadyQueue, "pop_best", "fila de prontos"),
+        (ReadyQueue, "discard", "fila de prontos"),
+        (MultiLevelQueue, "push", "fila de prontos"),
+        (MultiLevelQueue, "pop_best", "fila de prontos"),
+        (MultiLevelQueue, "age", "envelhecimento"),
+        (MultiLevelQueue, "_merge", "envelhecimento"),
+        (Policy, "arrive", "fila de prontos"),
+        (Policy, "steal", "fila de prontos"),
+        (NonPreemptive, "select", "fila de prontos"),
+        (Preemptive, "select", "fila de prontos"),
+        (RoundRobin, "arrive", "fila de prontos"),
+        (RoundRobin, "select", "fila de prontos"),
+        (RoundRobin, "steal", "fila de prontos"),
+        (RoundRobinAging, "select", "fila de prontos"),
+        (LoadIndex, "update", "balanceamento"),
+        (LoadIndex, "least_loaded", "balanceamento"),
+        (LoadIndex, "busiest", "balanceamento"),
+        (FastPath, "_by_completion", "caminho rápido"),
+        (FastPath, "_fcfs_numpy", "caminho rápido"),
+        (Utils, "chooseNext", "desempate"),
+        (Utils, "chooseNextSRTF", "desempate"),
+        (Utils, "chooseNextPriority", "desempate"),
+        (Utils, "choice", "desempate"),
+        (Timeline, "append", "timeline"),
+        (TimelineSummary, "append", "timeline"),
+        (Utils, "collectMetrics", "métricas"),
+    ]
+
+    def __init__(self):
+        self.counts = defaultdict(Counter) # algoritmo -> chamadas por método (e ticks ociosos)
+        self.times = defaultdict(lambda: defaultdict(float)) # algoritmo -> segundos por fase
+        self.algorithm = None # algoritmo em execução
+        self.stack = [] # tempo das chamadas medidas dentro da chamada atual
+        self.originals = [] # (classe, nome, atributo original)
+
+    def install(self):
+        if self.originals:
+            return
+        for owner, name, phase in self.TARGETS:
+            self._patch(owner, name, self._measure(owner, name, phase))
+        for timeline in (Timeline, TimelineSummary):
+            self._patch(timeline, "append", self._count_idle(timeline.__dict__["append"]))
+        self._patch(Scheduling, "run_algorithm", self._algorithm(Scheduling.__dict__["run_algorithm"]))
+
+    def uninstall(self):
+        for owner, name, original in reversed(self.originals):
+            setattr(owner, name, original)
+        self.originals = []
+
+    def _patch(self, owner, name, function):
+        original = owner.__dict__[name]
+        self.originals.append((owner, name, original))
+        setattr(owner, name, staticmethod(function) if isinstance(original, staticmethod) else function)
+
+    # Conta a chamada e soma o tempo exclusivo dela na fase
+    def _measure(self, owner, name, phase):
+        function = owner.__dict__[name]
+        if isinstance(function, staticmethod):
+            function = function.__func__
+        label = f"{owner.__name__}.{name}"
+        stack = self.stack
+
+        def wrapper(*args, **kwargs):
+            self.counts[self.algorithm][label] += 1
+            stack.append(0.0)
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                inner = stack.pop()
+                self.times[self.algorithm][phase] += elapsed - inner
+                if stack:
+                    stack[-1] += elapsed
+        return wrapper
+
+    # Conta os ticks (unidades de tempo) e os trechos ociosos adicionados à timeline
+    def _count_idle(self, append):
+        def wrapper(timeline, segment):
+            if segment[2] is None:
+                counts = self.counts[self.algorithm]
+                counts["ticks ociosos"] += segment[1] - segment[0]
+                counts["trechos ociosos"] += 1
+            return append(timeline, segment)
+        return wrapper
+
+    # Marca o algoritmo em execução e mede o tempo total dele
+    def _algorithm(self, run_algorithm):
+        stack = self.stack
+
+        def wrapper(scheduling, method):
+            self.algorithm = method
+            stack.append(0.0)
+            start = perf_counter()
+            try:
+                return run_algorithm(scheduling, method)
+            finally:
+                elapsed = perf_counter() - start
+                self.times[method]["simulação"] += elapsed - stack.pop()
+        return wrapper
+
+    def as_dict(self):
+        return {algorithm: {"counts": dict(self.counts[algorithm]), "seconds": dict(self.times[algorithm])}
+                for algorithm in self.times}
+
+    # Grava as contagens e os tempos em JSON
+    def dump(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.as_dict(), file, indent=2, ensure_ascii=False)
+
+    # Executa function sob o cProfile e grava as estatísticas (pstats) em path
+    @staticmethod
+    def cprofile(function, path):
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(function)
+        finally:
+            profile.dump_stats(path)
+            pstats.Stats(profile).sort_stats("cumulative").print_stats(15)
@@ -0,0 +1,399 @@
+import heapq
+import itertools
+from operator import attrgetter
+
+# Posições de inserção de uma OrderedBucket com uma árvore de Fenwick sobre as vivas: a
+# k-ésima viva é achada e removida em O(log n). As removidas viram None (lápides) e a
+# lista é compactada quando as lápides passam do dobro das vivas.
+class _Slots:
+    __slots__ = ('items', 'tree', 'live')
+
+    def __init__(self, items=()):
+        self.items = list(items)
+        self._build()
+
+    def _build(self):
+        n = len(self.items)
+        tree = [0] + [1] * n # tree[i]: vivas em (i - lowbit(i), i]
+        for i in range(1, n + 1):
+            j = i + (i & -i)
+            if j <= n:
+                tree[j] += tree[i]
+        self.tree = tree
+        self.live = n
+
+    # Acrescenta no fim e retorna a posição
+    def append(self, item):
+        items, tree = self.items, self.tree
+        items.append(item)
+        i = len(items)
+        total = 1
+        j = i - 1
+        low = i - (i & -i)
+        while j > low: # soma dos filhos de i na árvore
+            total += tree[j]
+            j -= j & -j
+        tree.append(total)
+        self.live += 1
+        return i - 1
+
+    def delete(self, slot):
+        items, tree = self.items, self.tree
+        items[slot] = None
+        n = len(items)
+        i = slot + 1
+        while i <= n:
+            tree[i] -= 1
+            i += i & -i
+        self.live -= 1
+
+    # Posição da k-ésima viva (a partir de 0)
+    def find(self, k):
+        tree = self.tree
+        n = len(self.items)
+        pos = 0
+        step = 1 << (n.bit_length() - 1) if n else 0
+        while step:
+            nxt = pos + step
+            if nxt <= n and tree[nxt] <= k:
+                pos = nxt
+                k -= tree[nxt]
+            step >>= 1
+        return pos
+
+    # Tira as lápides; retorna as vivas na ordem (para refazer as posições)
+    def compact(self):
+        self.items = [item for item in self.items if item is not None]
+        self._build()
+        return self.items
+
+
+# Lista na ordem de inserção com acesso e remoção pela posição em O(log n), para os baldes
+# de empatados (ReadyQueue e FastPath). O desempate sorteia uma posição entre as vivas
+# (random.choice usa len e o índice, então o random avança igual ao sorteio numa lista) e
+# só o escolhido sai, sem deslocar os outros. appendleft põe na frente de todos (push_front).
+# Os itens precisam ser únicos e hasháveis (processos ou posições).
+class OrderedBucket:
+    __slots__ = ('front', 'back', 'where')
+
+    def __init__(self, items=()):
+        self.front = _Slots() # inseridos no início, do mais antigo para o mais novo
+        self.back = _Slots(items)
+        self.where = {item: (False, slot) for slot, item in enumerate(self.back.items)}
+
+    def __len__(self):
+        return self.front.live + self.back.live
+
+    def __iter__(self):
+        for item in reversed(self.front.items):
+            if item is not None:
+                yield item
+        for item in self.back.items:
+            if item is not None:
+                yield item
+
+    def append(self, item):
+        self.where[item] = (False, self.back.append(item))
+
+    def appendleft(self, item):
+        self.where[item] = (True, self.front.append(item))
+
+    def _locate(self, k):
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError("posição fora do balde")
+        ahead = self.front.live
+        if k < ahead:
+            return True, self.front.find(ahead - 1 - k)
+        return False, self.back.find(k - ahead)
+
+    def __getitem__(self, k):
+        in_front, slot = self._locate(k)
+        return (self.front if in_front else self.back).items[slot]
+
+    # Remove e retorna o item da posição k
+    def pop(self, k):
+        in_front, slot = self._locate(k)
+        item = (self.front if in_front else self.back).items[slot]
+        self._delete(item, in_front, slot)
+        return item
+
+    def remove(self, item):
+        in_front, slot = self.where[item]
+        self._delete(item, in_front, slot)
+
+    def _delete(self, item, in_front, slot):
+        del self.where[item]
+        part = self.front if in_front else self.back
+        part.delete(slot)
+        if len(part.items) > 2 * part.live + 32:
+            for slot, live in enumerate(part.compact()):
+                self.where[live] = (in_front, slot)
+
+
+# Fila de prontos indexada por heap (fila de prioridade)
+# key: função que dá a chave de ordenação do processo (menor chave sai primeiro),
+#      ex: burst, tempo restante ou (-prioridade, tempo restante)
+# Os processos ficam em baldes por chave (OrderedBucket, na ordem de inserção) e um heap guarda
+# as chaves distintas (como no FastPath). Os empatados de um balde estão na mesma ordem em que
+# estariam numa deque, então o desempate aleatório (Utils.choice) sorteia a mesma posição,
+# e escolher tira só o escolhido do balde em O(log n) (nada volta para o heap).
+# A chave de um balde esvaziado é descartada do heap quando chega ao topo.
+class ReadyQueue:
+    def __init__(self, key):
+        self.key = key
+        self.keys = [] # heap das chaves distintas
+        self.queued = set() # chaves que estão no heap
+        self.buckets = {} # chave -> processos com a chave, na ordem de inserção
+        self.entries = {} # processo -> (chave, ordem de inserção)
+        self.counter = itertools.count() # ordem de inserção
+        self.front = itertools.count(-1, -1) # ordem de inserção no início (push_front)
+
+    def __len__(self):
+        return len(self.entries)
+
+    # Estado para o pickle (checkpoint): os baldes não vazios e a posição dos contadores de ordem
+    def __getstate__(self):
+        buckets = {key: bucket for key, bucket in self.buckets.items() if bucket}
+        return self.key, buckets, self.entries, next(self.counter), next(self.front)
+
+    def __setstate__(self, state):
+        self.key, self.buckets, self.entries, counter, front = state
+        self.keys = list(self.buckets)
+        heapq.heapify(self.keys)
+        self.queued = set(self.keys)
+        self.counter = itertools.count(counter)
+        self.front = itertools.count(front, -1)
+
+    def __contains__(self, process):
+        return process in self.entries
+
+    def __iter__(self): # processos na fila, sem ordem definida
+        return iter(self.entries)
+
+    def _bucket(self, key):
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = OrderedBucket()
+            if key not in self.queued:
+                self.queued.add(key)
+                heapq.heappush(self.keys, key)
+        return bucket
+
+    # Adiciona um processo (se já estiver na fila, a chave é atualizada)
+    def push(self, process):
+        self.discard(process)
+        key = self.key(process)
+        self.entries[process] = (key, next(self.counter))
+        self._bucket(key).append(process)
+
+    # Adiciona um processo antes de todos os já inseridos (desempata na frente deles)
+    def push_front(self, process):
+        self.discard(process)
+        key = self.key(process)
+        self.entries[process] = (key, next(self.front))
+        self._bucket(key).appendleft(process)
+
+    # Processos na ordem de inserção (como estariam numa deque)
+    def ordered(self):
+        return [process for process, _ in sorted(self.entries.items(), key=lambda item: item[1][1])]
+
+    # Remove um processo do seu balde
+    def discard(self, process):
+        entry = self.entries.pop(process, None)
+        if entry is not None:
+            bucket = self.buckets[entry[0]]
+            bucket.remove(process)
+            if not bucket:
+                del self.buckets[entry[0]]
+
+    # Descarta as chaves sem balde que estão no topo do heap
+    def _prune(self):
+        keys, buckets = self.keys, self.buckets
+        while keys and keys[0] not in buckets:
+            self.queued.discard(heapq.heappop(keys))
+
+    # Retorna a menor chave da fila ou None se estiver vazia
+    def peek_key(self):
+        self._prune()
+        return self.keys[0] if self.keys else None
+
+    # Retorna o processo com a menor chave (o primeiro inserido entre os empatados) sem remover
+    def peek(self):
+        self._prune()
+        return self.buckets[self.keys[0]][0] if self.keys else None
+
+    # Remove e retorna o processo escolhido entre os que têm a menor chave
+    # tie_break: função que recebe o balde dos empatados (OrderedBucket em ordem de inserção,
+    # sem alterá-lo: len e acesso por posição) e escolhe um
+    def pop_best(self, tie_break):
+        self._prune()
+        if not self.keys:
+            return None
+        # durante o desempate a chave está fora do heap (peek_key vê a próxima chave)
+        best_key = heapq.heappop(self.keys)
+        bucket = self.buckets[best_key]
+        chosen = tie_break(bucket)
+        bucket.remove(chosen)
+        del self.entries[chosen]
+        if bucket:
+            heapq.heappush(self.keys, best_key)
+        else:
+            del self.buckets[best_key]
+            self.queued.discard(best_key)
+        return chosen
+
+
+# Nível de prioridade da MultiLevelQueue: fila de prontos indexada pelo tempo restante
+# (o tempo restante de um processo não muda enquanto ele espera), na ordem de chegada ao nível
+class _Level:
+    __slots__ = ('items', 'key', 'seq', 'alive', 'queued')
+
+    def __init__(self, key, seq):
+        self.items = ReadyQueue(key=attrgetter('remaining'))
+        self.key = key # chave invariante (None no piso)
+        self.seq = seq # posição do nível na ordem das chaves do dict original
+        self.alive = True # False depois de removido ou fundido no piso
+        self.queued = False # está no heap de níveis
+
+
+# Fila de prontos multinível com envelhecimento preguiçoso (RoundRobinPriorityAging),
+# no lugar do defaultdict(deque) reconstruído a cada envelhecimento e achatado a cada escolha.
+# Em vez de subtrair aging de cada processo pronto, cada envelhecimento só incrementa a época
+# global. Um processo que entra com prioridade dinâmica d na época e fica no nível de chave
+# invariante d + aging * e, e a sua prioridade efetiva na época E é d - aging * (E - e),
+# presa em 1. Processos com a mesma prioridade efetiva estão no mesmo nível, como no dict.
+# O nível de prioridade efetiva 1 é o piso: no envelhecimento os níveis que chegam a 1 ou menos
+# são fundidos nele na ordem das chaves do dict original (ordem de criação dos níveis, sem os que
+# ficaram vazios), então a ordem dos candidatos do desempate é a mesma das deques.
+# Cada processo é copiado no máximo uma vez para o piso, então o envelhecimento custa O(1)
+# amortizado. A escolha pega o nível não vazio de menor prioridade efetiva (heap de níveis) e,
+# dentro dele, os de menor tempo restante (ReadyQueue), em O(log n) fora os empatados.
+class MultiLevelQueue:
+    def __init__(self, aging):
+        self.aging = aging
+        self.epoch = 0 # envelhecimentos até agora
+        self.levels = {} # chave invariante -> nível (menos o piso)
+        self.floor = None # nível de prioridade efetiva 1
+        self.heap = [] # (chave, seq, nível) dos níveis fora o piso, menor chave = mais prioritário
+        self.seq = itertools.count() # ordem de criação dos níveis
+        self.empties = [] # níveis esvaziados desde o último envelhecimento
+        self.count = 0 # processos prontos
+
+    def __len__(self):
+        return self.count
+
+    # Estado para o pickle (checkpoint), com a posição do contador de níveis
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['seq'] = next(self.seq)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.seq = itertools.count(state['seq'])
+
+    # Adiciona um processo no nível da sua prioridade dinâmica atual
+    def push(self, process):
+        priority = process.dynamic_priority
+        if priority == 1:
+            level = self.floor
+            if level is None:
+                level = self.floor = _Level(None, next(self.seq))
+        else:
+            key = priority + self.aging * self.epoch
+            level = self.levels.get(key)
+            if level is None:
+                level = self.levels[key] = _Level(key, next(self.seq))
+            if not level.queued:
+                heapq.heappush(self.heap, (key, level.seq, level))
+                level.queued = True
+        level.items.push(process)
+        self.count += 1
+
+    # Envelhece todos os processos prontos (prioridade efetiva - aging, no mínimo 1)
+    def age(self):
+        self.epoch += 1
+        # níveis vazios somem, como as chaves vazias do dict reconstruído
+        for level in self.empties:
+            if level.alive and not level.items:
+                self._drop(level)
+        self.empties = []
+
+        # níveis que chegaram a prioridade efetiva <= 1 vão para o piso
+        limit = 1 + self.aging * self.epoch
+        merged = []
+        heap = self.heap
+        while heap and heap[0][0] <= limit:
+            level = heapq.heappop(heap)[2]
+            level.queued = False
+            if level.alive:
+                del self.levels[level.key]
+                merged.append(level)
+        if merged:
+            self._merge(merged)
+
+    # Funde os níveis no piso respeitando a ordem de criação (seq)
+    def _merge(self, merged):
+        merged.sort(key=lambda level: level.seq)
+        floor = self.floor
+        if floor is None:
+            floor = self.floor = merged.pop(0)
+            floor.key = None
+            before, after = [], merged
+        else:
+            before = [level for level in merged if level.seq < floor.seq]
+            after = [level for level in merged if level.seq > floor.seq]
+        for level in reversed(before):
+            for process in reversed(level.items.ordered()):
+                floor.items.push_front(process)
+        for level in after:
+            for process in level.items.ordered():
+                floor.items.push(process)
+        if before:
+            floor.seq = before[0].seq # o piso fica na posição do primeiro nível fundido
+        for level in before + after:
+            level.alive = False
+
+    def _drop(self, level):
+        if level is self.floor:
+            self.floor = None
+        else:
+            del self.levels[level.key]
+        level.alive = False
+
+    # Retorna (nível, prioridade efetiva) do nível não vazio mais prioritário
+    def _best(self):
+        heap = self.heap
+        while heap and not (heap[0][2].alive and heap[0][2].items):
+            heapq.heappop(heap)[2].queued = False
+        floor = self.floor
+        if heap:
+            priority = heap[0][0] - self.aging * self.epoch
+            if floor is None or not floor.items or priority < 1:
+                return heap[0][2], priority
+        if floor is not None and floor.items:
+            return floor, 1
+        return None, None
+
+    # Remove e retorna o processo escolhido no nível mais prioritário
+    # prefer: processo escolhido se estiver nesse nível (o que acabou de sair da CPU)
+    # tie_break: senão, função que recebe os de menor tempo restante do nível (na ordem do
+    #            nível) e escolhe um
+    # A prioridade dinâmica do escolhido passa a ser a efetiva
+    def pop_best(self, tie_break, prefer=None):
+        level, priority = self._best()
+        if level is None:
+            return None
+        items = level.items
+        if prefer is not None and prefer in items:
+            chosen = prefer
+            items.discard(prefer)
+        else:
+            chosen = items.pop_best(tie_break)
+        self.count -= 1
+        if not items:
+            self.empties.append(level)
+        chosen.dynamic_priority = priority
+        return chosen
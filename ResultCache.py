@@ -0,0 +1,96 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import zlib
+
+# Cache em disco dos resultados das simulações, endereçado pelo conteúdo
+# A chave é o hash da carga, do algoritmo, do quantum, do aging, da semente e do modo das
+# métricas, então a mesma carga com a mesma configuração reaproveita o resultado sem simular
+# de novo (e as métricas aproximadas do streaming não servem para a execução exata).
+# Cada entrada é um arquivo <chave>.bin (pickle comprimido com zlib) com os trechos da
+# timeline, o número de trocas de contexto e as Metrics.
+# O tamanho total é limitado: ao passar de max_bytes as entradas usadas há mais tempo
+# são removidas (LRU pela data de modificação, atualizada a cada leitura).
+class ResultCache:
+    VERSION = 2 # muda quando o formato das entradas ou a simulação mudam
+    MAX_BYTES = 256 * 1024 * 1024
+
+    def __init__(self, directory, max_bytes=None):
+        self.directory = directory
+        self.max_bytes = max_bytes if max_bytes is not None else self.MAX_BYTES
+        os.makedirs(directory, exist_ok=True)
+
+    # Chave de uma execução (workload_digest: hash da carga, ver Scheduling.workload_digest)
+    # mode: como as métricas foram calculadas ("exact" com os processos guardados, "stream"
+    #       acumuladas com os percentis aproximados do sketch)
+    @staticmethod
+    def key(workload_digest, algorithm, quantum, aging, seed, mode="exact"):
+        text = f"{ResultCache.VERSION}|{workload_digest}|{algorithm}|{quantum}|{aging}|{seed}|{mode}"
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".bin")
+
+    # Retorna (trechos da timeline, cs, Metrics) ou None se não está no cache
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+            segments, cs, metrics = pickle.loads(zlib.decompress(data))
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self._remove(path) # entrada corrompida ou de outra versão
+            return None
+        try:
+            os.utime(path) # marca como usada recentemente
+        except OSError:
+            pass
+        return segments, cs, metrics
+
+    # Guarda o resultado de uma execução e remove as entradas antigas se passar do limite
+    def put(self, key, timeline, cs, metrics):
+        data = zlib.compress(pickle.dumps((list(timeline), cs, metrics), pickle.HIGHEST_PROTOCOL))
+        if len(data) > self.max_bytes:
+            return # maior que o cache inteiro
+        # grava num arquivo temporário e renomeia, então uma leitura nunca vê a entrada pela metade
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, 'wb') as file:
+            file.write(data)
+        os.replace(tmp, self._path(key))
+        self._evict()
+
+    # Remove as entradas usadas há mais tempo até o total caber em max_bytes
+    def _evict(self):
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".bin"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    # Remove todas as entradas
+    def clear(self):
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".bin"):
+                    self._remove(entry.path)
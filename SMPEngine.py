@@ -0,0 +1,331 @@
+from collections import deque
+import heapq
+from Policy import Policy
+
+# Um núcleo da simulação SMP: fila de prontos, processo em execução e timeline próprios
+class Core:
+    __slots__ = ('id', 'ready', 'timeline', 'current', 'run_start', 'expired',
+                 'old_process', 'idle_since', 'version', 'cs', 'busy_time', 'dispatches', 'steals')
+
+    def __init__(self, id, ready, timeline):
+        self.id = id
+        self.ready = ready # fila de prontos do núcleo (depende do algoritmo)
+        self.timeline = timeline # trechos (tempo_inicio, tempo_fim, pid) deste núcleo
+        self.current = None # processo em execução
+        self.run_start = 0 # início do trecho em execução
+        self.expired = False # o quantum acabou e o processo ainda não voltou para a fila
+        self.old_process = None # último processo que executou no núcleo
+        self.idle_since = 0 # início do trecho ocioso atual (None se ocupado)
+        self.version = 0 # invalida o evento agendado quando o núcleo é interrompido
+        self.cs = 0 # trocas de contexto
+        self.busy_time = 0
+        self.dispatches = 0 # processos colocados para executar
+        self.steals = 0 # processos roubados de outros núcleos
+
+    # Carga do núcleo: processos na fila mais o que está executando
+    def load(self):
+        return len(self.ready) + (self.current is not None)
+
+
+# Índice das cargas dos núcleos para a distribuição e o roubo de trabalho
+# Dois heaps com entradas preguiçosas (carga, núcleo): o de menor carga e o de maior fila.
+# Uma entrada vale se a carga ainda é a do núcleo; as outras são descartadas no topo.
+# Assim nenhuma decisão percorre todos os núcleos.
+class LoadIndex:
+    def __init__(self, cores):
+        self.cores = cores
+        self._rebuild()
+
+    def _rebuild(self):
+        self.least = [(core.load(), core.id) for core in self.cores]
+        self.most = [(-len(core.ready), core.id) for core in self.cores if core.ready]
+        heapq.heapify(self.least)
+        heapq.heapify(self.most)
+
+    # Registra a carga atual de um núcleo (chamado sempre que ela muda)
+    def update(self, core):
+        heapq.heappush(self.least, (core.load(), core.id))
+        if core.ready:
+            heapq.heappush(self.most, (-len(core.ready), core.id))
+        if len(self.least) + len(self.most) > 4 * len(self.cores) + 64:
+            self._rebuild() # limita as entradas velhas (custo amortizado O(1))
+
+    # Núcleo com a menor carga (menor id no empate)
+    def least_loaded(self):
+        heap = self.least
+        while heap:
+            load, i = heap[0]
+            if self.cores[i].load() == load:
+                return self.cores[i]
+            heapq.heappop(heap)
+        self._rebuild()
+        return self.least_loaded()
+
+    # Núcleo com a maior fila de prontos ou None se todas estão vazias
+    def busiest(self):
+        heap = self.most
+        while heap:
+            size, i = heap[0]
+            if len(self.cores[i].ready) == -size:
+                return self.cores[i]
+            heapq.heappop(heap)
+        return None
+
+
+# Índice de cargas de uma máquina com um núcleo: a distribuição sempre escolhe o único núcleo
+# e não há de quem roubar (quando ele fica ocioso a fila dele está vazia)
+class SingleCoreIndex:
+    def __init__(self, cores):
+        self.cores = cores
+
+    def update(self, core):
+        pass
+
+    def least_loaded(self):
+        return self.cores[0]
+
+    def busiest(self):
+        return None
+
+
+# Simulação de uma máquina com vários núcleos (SMP), orientada a eventos
+# Cada núcleo tem a sua fila de prontos e roda o algoritmo escolhido sobre ela, com as
+# mesmas regras de EventEngine (desempates, trocas de contexto, quantum, envelhecimento),
+# então com 1 núcleo o resultado é o mesmo do motor por eventos.
+# placement: para onde vai cada processo que chega
+#   least-loaded -> núcleo com menos processos (fila + em execução)
+#   round-robin  -> núcleos em rodízio
+# steal: um núcleo que fica sem nada para executar rouba o próximo processo da maior fila
+# O tempo salta entre eventos (chegadas, términos e fins de quantum) num heap de eventos
+# por núcleo, e só os núcleos afetados em cada instante são visitados.
+class SMPEngine:
+    PLACEMENTS = ("least-loaded", "round-robin")
+
+    def __init__(self, scheduling, cores, placement="least-loaded", steal=True):
+        if cores < 1:
+            raise ValueError("O número de núcleos deve ser pelo menos 1")
+        if placement not in self.PLACEMENTS:
+            raise ValueError(f"Distribuição desconhecida: {placement}")
+        self.scheduling = scheduling
+        self.n_cores = cores
+        self.placement = placement
+        self.steal = steal
+
+    # Cada algoritmo retorna (lista de Core, total de trocas de contexto)
+    def FCFS(self):
+        return self._simulate("FCFS")
+
+    def SJF(self):
+        return self._simulate("SJF")
+
+    def SRTF(self):
+        return self._simulate("SRTF")
+
+    def PriorityNonPreemptive(self):
+        return self._simulate("PriorityNonPreemptive")
+
+    def PriorityPreemptive(self):
+        return self._simulate("PriorityPreemptive")
+
+    def RoundRobin(self):
+        return self._simulate("RoundRobin")
+
+    def RoundRobinPriorityAging(self):
+        return self._simulate("RoundRobinPriorityAging")
+
+    # Executa uma política registrada pelo nome (Policy.register)
+    def run_policy(self, name):
+        return self._simulate(name)
+
+    def _simulate(self, method):
+        self.scheduling.reset_processes()
+        self.open(method, self.scheduling.arrivals())
+        self.run_until()
+        return self.close()
+
+    # Prepara a simulação de um algoritmo sobre as chegadas (cursor com head/pop, ex: ArrivalCursor)
+    # record: guarda as decisões em self.decisions, como (tempo, núcleo, "dispatch" ou "finish", pid)
+    def open(self, method, arrivals, record=False):
+        policy = Policy.create(method, self.scheduling.quantum, self.scheduling.aging)
+        self.method = method
+        self.policy = policy
+        self.arrivals = arrivals
+        self.cores = [Core(i, policy.new_queue(), self.scheduling.new_timeline()) for i in range(self.n_cores)]
+        self.events = [] # (tempo, núcleo, versão) do próximo término ou fim de quantum
+        self.index = LoadIndex(self.cores) if self.n_cores > 1 else SingleCoreIndex(self.cores)
+        # núcleos sem processo e com a fila vazia, na ordem em que ficaram ociosos (dict e não set:
+        # a ordem do roubo não depende do estado interno do set e sobrevive ao checkpoint)
+        self.idle = dict.fromkeys(range(self.n_cores))
+        self.next_core = 0 # rodízio da distribuição round-robin
+        self.now = -1 # último instante processado
+        self.decisions = deque() if record else None
+
+    # Processa os instantes até limit (None = até acabarem os eventos e as chegadas)
+    # max_steps: para depois de processar esse número de instantes
+    # Retorna True se acabaram os eventos e as chegadas
+    def run_until(self, limit=None, max_steps=None):
+        policy, cores, events, arrivals = self.policy, self.cores, self.events, self.arrivals
+        finished = False
+        steps = 0
+        while max_steps is None or steps < max_steps:
+            # próximo instante: o evento válido mais cedo ou a próxima chegada
+            while events and events[0][2] != cores[events[0][1]].version:
+                heapq.heappop(events)
+            if events and (arrivals.head is None or events[0][0] <= arrivals.head.arrival):
+                time = events[0][0]
+            elif arrivals.head is not None:
+                time = max(arrivals.head.arrival, 0) # a simulação começa em 0, como nos motores tick e event
+            else:
+                finished = True
+                break
+            if limit is not None and time > limit:
+                break
+
+            touched = {} # núcleos afetados neste instante (dict mantém a ordem)
+            # 1) términos e fins de quantum
+            while events and events[0][0] == time:
+                _, i, version = heapq.heappop(events)
+                core = cores[i]
+                if version == core.version:
+                    self.settle(core, time)
+                    self.index.update(core)
+                    touched[core] = None
+            # 2) chegadas
+            while arrivals.head is not None and arrivals.head.arrival <= time:
+                if self.placement == "least-loaded":
+                    core = self.index.least_loaded()
+                else:
+                    core = cores[self.next_core]
+                    self.next_core = (self.next_core + 1) % len(cores)
+                policy.arrive(core, arrivals.pop())
+                self.index.update(core)
+                touched[core] = None
+            # 3) decisões dos núcleos afetados
+            for core in touched:
+                self.decide(core, time)
+                self._refresh(core, time)
+            # 4) núcleos ociosos roubam das maiores filas
+            if self.steal:
+                while self.idle:
+                    victim = self.index.busiest()
+                    if victim is None:
+                        break
+                    i = next(iter(self.idle))
+                    del self.idle[i]
+                    thief = cores[i]
+                    process = policy.steal(victim)
+                    self.index.update(victim)
+                    thief.steals += 1
+                    self.run(thief, process, time)
+                    self._refresh(thief, time)
+            self.now = time
+            steps += 1
+        if limit is not None and limit > self.now:
+            self.now = limit
+        return finished
+
+    # Estado da simulação (o que muda de um instante para outro) para o checkpoint
+    def snapshot(self):
+        return {"method": self.method, "now": self.now, "cores": self.cores, "events": self.events,
+                "index": self.index, "idle": self.idle, "next_core": self.next_core,
+                "admitted": self.arrivals.idx}
+
+    # Continua a simulação de um snapshot
+    # arrivals: cursor novo desde o início da carga (os processos já admitidos são pulados)
+    def restore(self, state, arrivals):
+        self.open(state["method"], arrivals)
+        for _ in range(state["admitted"]):
+            arrivals.pop()
+        self.now = state["now"]
+        self.cores = state["cores"]
+        self.events = state["events"]
+        self.index = state["index"]
+        self.idle = state["idle"]
+        self.next_core = state["next_core"]
+
+    # Termina a simulação e retorna (lista de Core, total de trocas de contexto)
+    def close(self):
+        for core in self.cores:
+            core.ready = None # as filas vazias não são mais usadas
+        return self.cores, self.context_switches()
+
+    def context_switches(self):
+        return sum(core.cs for core in self.cores)
+
+    # Atualiza o índice de cargas e o conjunto de ociosos depois de uma decisão
+    def _refresh(self, core, time):
+        self.index.update(core)
+        if core.current is None and not core.ready:
+            self.idle.setdefault(core.id)
+            if core.idle_since is None:
+                core.idle_since = time
+        else:
+            self.idle.pop(core.id, None)
+
+    # Evento do núcleo: o processo atual terminou ou esgotou o quantum
+    def settle(self, core, time):
+        process = core.current
+        self.account(core, time)
+        if core.current is not None:
+            self.policy.on_quantum_expiry(core, process, time)
+
+    # Decide o que o núcleo executa depois dos eventos e das chegadas do instante
+    def decide(self, core, time):
+        policy = self.policy
+        if core.current is not None:
+            if policy.preemptive:
+                self.account(core, time) # interrompido pela chegada
+                core.version += 1
+            elif not core.expired:
+                return # sem preempção: continua até o próximo evento
+        process = policy.select(core, time)
+        if process is not None:
+            self.run(core, process, time)
+        elif core.current is None:
+            policy.on_tick(core, time)
+
+    # Executa um processo (escolhido ou roubado) no núcleo
+    def run(self, core, process, time):
+        self.close_idle(core, time) # a troca de contexto pela timeline vê o trecho ocioso
+        self.start(core, process, time, self.policy.dispatch(core, process, time))
+
+    # Coloca um processo para executar no núcleo por run unidades de tempo (agenda o evento)
+    def start(self, core, process, time, run):
+        if self.decisions is not None:
+            # só é uma decisão nova se o núcleo não estava executando esse mesmo processo
+            timeline = core.timeline
+            last = timeline[-1] if len(timeline) else None
+            if not (core.idle_since is None and last is not None and last[1] == time and last[2] == process.pid):
+                self.decisions.append((time, core.id, "dispatch", process.pid))
+        self.close_idle(core, time)
+        core.current = process
+        core.old_process = process
+        core.run_start = time
+        core.dispatches += 1
+        if process.start_time is None:
+            process.start_time = time
+        core.version += 1
+        heapq.heappush(self.events, (time + run, core.id, core.version))
+
+    # Fecha o trecho ocioso do núcleo (antes da contagem de trocas de contexto pela timeline)
+    def close_idle(self, core, time):
+        if core.idle_since is not None:
+            if time > core.idle_since:
+                core.timeline.append((core.idle_since, time, None))
+            core.idle_since = None
+
+    # Registra o que o processo atual executou desde o início do trecho
+    def account(self, core, time):
+        process = core.current
+        run = time - core.run_start
+        if run > 0:
+            core.timeline.append((core.run_start, time, process.pid))
+            process.remaining -= run
+            core.busy_time += run
+        core.run_start = time
+        if process.remaining == 0:
+            self.scheduling.finish_process(process, time)
+            core.current = None
+            if self.decisions is not None:
+                self.decisions.append((time, core.id, "finish", process.pid))
+        return run
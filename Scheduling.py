@@ -1,77 +1,663 @@
-from collections import defaultdict, deque
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import hashlib
+import os
+import time
 from utils import Utils
 import random
 from Process import Process
+from EventEngine import EventEngine
+from FastPath import FastPath
+from Checkpoint import Checkpoint
+from WhatIf import Snapshot, Baseline, WhatIfResult
+from SMPEngine import SMPEngine
+from Policy import Policy
+from ReadyQueue import ReadyQueue, MultiLevelQueue
+from Timeline import Timeline, TimelineSummary
+from TimelineExport import TimelineExporter
+from Workload import ArrivalCursor, ArrivalQueue
+from Metrics import Metrics, MetricsAccumulator, ReplicationSummary
 
 class Scheduling:
-    def __init__(self, quantum=2, aging=0):
+    ENGINES = ("tick", "event", "smp") # motores de simulação disponíveis
+
+    # Algoritmos na ordem em que são executados e impressos (nome, método)
+    ALGORITHMS = [
+        ("First Come, First Served", "FCFS"),
+        ("Shortest Job First", "SJF"),
+        ("Shortest Remaining Time First", "SRTF"),
+        ("Priority Sem Preempção", "PriorityNonPreemptive"),
+        ("Priority com preempção", "PriorityPreemptive"),
+        ("Round Robin", "RoundRobin"),
+        ("Round Robin com Prioridade e Envelhecimento", "RoundRobinPriorityAging")
+    ]
+
+    # Algoritmos da varredura de parâmetros (os únicos que usam quantum/aging)
+    SWEEP_ALGORITHMS = ("RoundRobin", "RoundRobinPriorityAging")
+
+    CHECKPOINT_STEPS = 10000 # instantes simulados entre as verificações do relógio do checkpoint
+    WHAT_IF_SNAPSHOTS = 64 # snapshots da execução de base quando o intervalo não é dado
+
+    SHARD_MIN = 10000 # processos mínimos por fatia de períodos ocupados (menos não compensa o pool)
+    SHARDS_PER_WORKER = 4 # fatias por processo do pool (equilibra períodos de tamanhos diferentes)
+    # Algoritmos que contam a troca de contexto pelo último processo que executou, mesmo
+    # depois de um trecho ocioso: cada fronteira entre fatias soma uma troca
+    SHARD_CS_ACROSS_IDLE = ("SRTF", "PriorityPreemptive", "RoundRobinPriorityAging")
+
+    _shared = None # escalonador compartilhado pelas tarefas da varredura/replicação em cada processo do pool
+
+    def __init__(self, quantum=2, aging=0, engine="tick", compact_timeline=False, seed=None,
+                 cores=1, placement="least-loaded", steal=True):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Motor desconhecido: {engine}")
         self.processes = []
         self.quantum = quantum
         self.aging = aging
+        self.engine = engine # "tick" avança de 1 em 1, "event" salta entre eventos, "smp" vários núcleos
+        self.cores = cores # núcleos no motor smp
+        self.placement = placement # distribuição dos processos entre os núcleos (ver SMPEngine)
+        self.steal = steal # roubo de trabalho entre os núcleos
+        self.compact_timeline = compact_timeline # timeline em arrays de inteiros
+        self.seed = seed # semente do desempate aleatório (None = não reinicia o random)
+        self.workload = None # carga em streaming (None = usa a lista de processos)
+        self.table = None # tabela de processos em colunas (None = usa a lista de processos)
+        self.state = None # estado de execução sobre a tabela
+        self.on_finish = None # chamado quando um processo termina
+        self.cache = None # ResultCache (None = sem cache)
+        self._digest = None # hash da carga (calculado sob demanda)
+        self.online = None # SMPEngine da simulação online (ver start_online)
+        self.checkpoint = None # caminho dos checkpoints ({algorithm} vira o método; None = sem checkpoint)
+        self.checkpoint_every = 60.0 # segundos entre checkpoints
+        self.resume = False # continua dos checkpoints existentes
+        self.sharded = False # simula os períodos ocupados em paralelo (ver run_sharded)
+        self.shard_workers = None # processos do pool das fatias (None = número de CPUs)
+        self.summary = False # modo resumo: sem timeline, métricas acumuladas (ver set_summary)
+        self.fast_path = True # usa o FastPath nos algoritmos sem preempção quando ele se aplica
+
+    # Cria a timeline (codificada por trechos) usada pelos algoritmos
+    # No modo resumo só o último trecho e os totais (TimelineSummary)
+    def new_timeline(self):
+        if self.summary:
+            return TimelineSummary()
+        return Timeline(compact=self.compact_timeline)
+
+    # Modo resumo: os algoritmos não guardam a timeline e as métricas são acumuladas conforme
+    # os processos terminam (MetricsAccumulator: médias, desvios e percentis aproximados),
+    # então com a carga em streaming a memória não depende do tamanho da carga
+    def set_summary(self, enabled=True):
+        self.summary = enabled
+
+    # Retorna o objeto que implementa os algoritmos no motor selecionado
+    # No motor smp os algoritmos retornam a lista de núcleos (Core) no lugar da timeline
+    def get_engine(self):
+        if self.engine == "event":
+            return EventEngine(self)
+        if self.engine == "smp":
+            return SMPEngine(self, self.cores, self.placement, self.steal)
+        return self
+
+    # Métricas (sem imprimir) do resultado de run_algorithm, com a utilização por núcleo no smp
+    def collect_metrics(self, procs, cs):
+        metrics = Utils.collectMetrics(procs, cs)
+        if self.engine == "smp":
+            metrics.set_cores(self.cores)
+        return metrics
+
+    # Executa um algoritmo pelo nome do método e retorna (processos, timeline, cs)
+    # Com semente, o random é reiniciado antes de cada algoritmo, então o resultado
+    # não depende da ordem de execução nem de rodar em paralelo
+    # Na carga em streaming e no modo resumo os resultados dos processos não são guardados:
+    # as métricas são acumuladas conforme eles terminam e o primeiro valor retornado é o
+    # MetricsAccumulator (no modo resumo a timeline é uma TimelineSummary)
+    def run_algorithm(self, method):
+        if self.checkpoint is not None:
+            return self.run_checkpointed(method, self.checkpoint.format(algorithm=method),
+                                         self.checkpoint_every, self.resume)
+        if self.sharded:
+            return self.run_sharded(method, self.shard_workers)
+        return self._run(method)
 
-    def run_all_algorithms(self):
-        algorithms = [
-            ("First Come, First Served", self.FCFS),
-            ("Shortest Job First", self.SJF),
-            ("Shortest Remaining Time First", self.SRTF),
-            ("Priority Sem Preempção", self.PriorityNonPreemptive),
-            ("Priority com preempção", self.PriorityPreemptive),
-            ("Round Robin", self.RoundRobin),
-            ("Round Robin com Prioridade e Envelhecimento", self.RoundRobinPriorityAging)
-        ]
-
-        for name, func in algorithms:
-            print("=" * 80)
-            print(f"Executando: {name}\n")
-            print("=" * 80)
-
-            # Reseta os processos antes de cada simulação
+    # Execução em série de um algoritmo (sem checkpoint e sem fatias)
+    def _run(self, method):
+        if self.workload is None:
+            self.reset_processes()
+        if self.workload is not None or self.summary:
+            procs = MetricsAccumulator()
+            self.on_finish = procs.add
+        else:
             procs = self.get_processes()
-            for p in procs:
-                p.reset()
-
-            # Executa o algoritmo
-            try:
-                timeline, cs = func()
-                # Recalcula métricas e imprime
-                Utils.compute_metrics(procs, timeline, cs)
-            except Exception as e:
-                print(f"Erro ao executar {name}: {e}")
-            print("\n" + "-" * 80 + "\n")
+        if self.seed is not None:
+            random.seed(self.seed)
+        if self.fast_path and FastPath.applies(self, method):
+            engine = FastPath(self) # mesmo resultado dos motores tick e event, sem simular o tempo
+        else:
+            engine = self.get_engine()
+        run = getattr(engine, method, None)
+        if run is None:
+            # política só registrada (Policy.register): executa no laço único do motor event/smp
+            if engine is self:
+                engine = EventEngine(self)
+            run = partial(engine.run_policy, method)
+        try:
+            timeline, cs = run()
+        finally:
+            self.on_finish = None
+        return procs, timeline, cs
+
+    # Liga os checkpoints em run_algorithm (path com {algorithm}; None desliga)
+    def set_checkpoint(self, path, every=60.0, resume=False):
+        self.checkpoint = path
+        self.checkpoint_every = every
+        self.resume = resume
+
+    # Executa um algoritmo gravando um checkpoint em path a cada `every` segundos e no final
+    # resume: continua do checkpoint em path, se existir, com o mesmo resultado da execução direta
+    # A simulação roda na sessão do SMPEngine (com 1 núcleo decide igual ao motor event), que
+    # pode ser interrompida entre dois instantes; nos motores tick e event o estado fica em
+    # variáveis locais dos laços. Retorna o mesmo que run_algorithm
+    def run_checkpointed(self, method, path, every=60.0, resume=False):
+        engine = SMPEngine(self, self.cores, self.placement, self.steal)
+        if resume and os.path.exists(path):
+            procs, finished = Checkpoint.load(path, self, engine, method)
+        else:
+            if self.workload is not None:
+                procs = MetricsAccumulator()
+            else:
+                self.reset_processes()
+                procs = self.get_processes()
+            if self.seed is not None:
+                random.seed(self.seed)
+            engine.open(method, self.arrivals())
+            finished = False
+        if self.workload is not None:
+            self.on_finish = procs.add
+        try:
+            last = time.perf_counter()
+            while not finished:
+                finished = engine.run_until(max_steps=self.CHECKPOINT_STEPS)
+                if finished or time.perf_counter() - last >= every:
+                    Checkpoint.save(path, self, engine, procs, finished)
+                    last = time.perf_counter()
+        finally:
+            self.on_finish = None
+        cores, cs = engine.close()
+        return procs, cores if self.engine == "smp" else cores[0].timeline, cs
+
+    # Execução de base para a re-simulação incremental (ver WhatIf.py e run_what_if)
+    # Roda o algoritmo na sessão do SMPEngine (1 núcleo nos motores tick e event, mesmo
+    # resultado) guardando um Snapshot a cada `every` unidades de tempo simulado (None divide
+    # o intervalo das chegadas em WHAT_IF_SNAPSHOTS). Os processos da lista ficam com o
+    # resultado, como em run_algorithm. Só para a lista de processos
+    def run_baseline(self, method, every=None):
+        if self.workload is not None or self.table is not None or self.summary:
+            raise ValueError("A re-simulação incremental só funciona com a lista de processos")
+        self.reset_processes()
+        order = sorted(self.processes, key=lambda p: p.arrival)
+        if every is None:
+            span = order[-1].arrival - order[0].arrival if order else 0
+            every = max(1, span // self.WHAT_IF_SNAPSHOTS)
+        if self.seed is not None:
+            random.seed(self.seed)
+        ties = Utils.ties
+        engine = self._what_if_engine()
+        engine.open(method, ArrivalCursor(order))
+        positions = {id(p): k for k, p in enumerate(order)}
+        snapshots = []
+        mark = order[0].arrival if order else 0
+        while not engine.run_until(limit=mark):
+            snapshots.append(Snapshot.take(engine, positions, Utils.ties - ties))
+            mark += every
+        cores, cs = engine.close()
+        metrics = self.collect_metrics(self.processes, cs)
+        return Baseline(method, self._what_if_params(), order, [list(core.timeline) for core in cores],
+                        cs, metrics, snapshots)
+
+    # Simula o algoritmo da base sobre processes (a carga editada: processos novos, removidos
+    # ou alterados) continuando do último snapshot antes da primeira chegada alterada, com o
+    # mesmo resultado de run_algorithm sobre a carga editada. Os processos de processes ficam
+    # com o resultado. Retorna um WhatIfResult com as métricas e as timelines comparadas à base
+    def run_what_if(self, baseline, processes):
+        if self._what_if_params() != baseline.params:
+            raise ValueError("A re-simulação precisa da mesma configuração da execução de base")
+        order = sorted(processes, key=lambda p: p.arrival)
+        for p in order:
+            p.reset()
+        change = baseline.first_change(order)
+        changed_at = change[1] if change is not None else None
+        snapshot = baseline.snapshots[-1] if change is None and baseline.snapshots else None
+        if change is not None:
+            snapshot = baseline.before(changed_at)
+
+        engine = self._what_if_engine()
+        arrivals = ArrivalCursor(order)
+        if snapshot is None:
+            if self.seed is not None:
+                random.seed(self.seed)
+            engine.open(baseline.method, arrivals)
+        else:
+            state = snapshot.load(order, baseline, self.new_timeline)
+            baseline.restore_finished(order, snapshot)
+            engine.restore(state["engine"], arrivals)
+            random.setstate(state["random"])
+            Utils.ties += state["ties"]
+        engine.run_until()
+        cores, cs = engine.close()
+        metrics = self.collect_metrics(processes, cs)
+        return WhatIfResult(baseline.method, processes, cores if self.engine == "smp" else cores[0].timeline,
+                            cs, metrics, baseline, changed_at, snapshot, [core.timeline for core in cores])
+
+    def _what_if_engine(self):
+        return SMPEngine(self, self.cores if self.engine == "smp" else 1, self.placement, self.steal)
+
+    def _what_if_params(self):
+        return {"quantum": self.quantum, "aging": self.aging, "engine": self.engine, "cores": self.cores,
+                "placement": self.placement, "steal": self.steal, "seed": self.seed,
+                "compact_timeline": self.compact_timeline}
+
+    # Usa um ResultCache para reaproveitar resultados (None desativa)
+    # Só é usado com semente: sem ela o desempate aleatório não é reproduzível
+    def set_cache(self, cache):
+        self.cache = cache
+
+    # Hash da carga: uma linha "pid chegada execução prioridade" por processo, na ordem da
+    # entrada (ou do arquivo da carga em streaming, que tem o mesmo formato)
+    def workload_digest(self):
+        if self._digest is None:
+            digest = hashlib.sha256()
+            if self.workload is not None:
+                with open(self.workload.path, 'rb') as file:
+                    for chunk in iter(lambda: file.read(1 << 20), b''):
+                        digest.update(chunk)
+            else:
+                if self.table is not None:
+                    t = self.table
+                    rows = ((t.pid(i), t.arrival[i], t.burst[i], t.priority[i]) for i in range(len(t)))
+                else:
+                    rows = ((p.pid, p.arrival, p.burst, p.priority) for p in self.processes)
+                batch = []
+                for row in rows:
+                    batch.append("%s %d %d %d\n" % row)
+                    if len(batch) >= 4096:
+                        digest.update(''.join(batch).encode())
+                        batch = []
+                digest.update(''.join(batch).encode())
+            self._digest = digest.hexdigest()
+        return self._digest
+
+    # Chave do cache de um algoritmo com a configuração atual
+    def cache_key(self, method):
+        mode = "stream" if self.workload is not None else "exact" # streaming: percentis do sketch
+        return self.cache.key(self.workload_digest(), method, self.quantum, self.aging, self.seed, mode)
+
+    # parallel: executa cada algoritmo em um processo separado (ProcessPoolExecutor)
+    # workers: número de processos (None = número de CPUs)
+    # Os resultados são impressos sempre na ordem de ALGORITHMS
+    # export: caminho para exportar a timeline de cada algoritmo, com "{algorithm}" no lugar
+    #         do nome do método (ex: "saida/{algorithm}.csv.gz"); ver TimelineExporter
+    # Com cache (set_cache) e semente, os algoritmos já simulados com a mesma carga e
+    # configuração não são executados de novo: o resultado vem do cache
+    # Retorna {método: Metrics} dos algoritmos que executaram sem erro
+    def run_all_algorithms(self, parallel=False, workers=None, export=None):
+        # o cache guarda a timeline para imprimir, que o modo resumo não tem
+        cache = self.cache if self.seed is not None and self.engine != "smp" and not self.summary else None
+        cached = {} # método -> (trechos da timeline, cs, Metrics)
+        if cache is not None:
+            for _, method in self.ALGORITHMS:
+                entry = cache.get(self.cache_key(method))
+                if entry is not None:
+                    cached[method] = entry
+        pending = [method for _, method in self.ALGORITHMS if method not in cached]
+
+        if parallel and pending:
+            # cada tarefa recebe uma cópia independente do escalonador e dos processos (pickle),
+            # então os algoritmos não compartilham os objetos Process
+            pool = ProcessPoolExecutor(max_workers=workers)
+            runs = {method: pool.submit(self.run_algorithm, method).result for method in pending}
+        else:
+            pool = None
+            runs = {method: partial(self.run_algorithm, method) for method in pending}
+
+        results = {}
+        try:
+            for name, method in self.ALGORITHMS:
+                print("=" * 80)
+                print(f"Executando: {name}\n")
+                print("=" * 80)
+
+                try:
+                    if method in cached:
+                        segments, cs, metrics = cached[method]
+                        timeline = self.new_timeline()
+                        for segment in segments:
+                            timeline.append(segment)
+                        results[method] = metrics
+                        Utils.printMetrics(metrics)
+                        print("\nTimeline: ")
+                        Utils.printTimeline(None, timeline)
+                    elif self.engine == "smp":
+                        procs, cores, cs = runs[method]()
+                        results[method] = Utils.compute_metrics_smp(procs, cores, cs)
+                        if export:
+                            # uma timeline por núcleo, com "{core}" no lugar do número do núcleo
+                            for core in cores:
+                                TimelineExporter.export(export.format(algorithm=method, core=core.id), core.timeline)
+                        timeline = None
+                    else:
+                        # Executa o algoritmo (ou espera o resultado do processo paralelo)
+                        procs, timeline, cs = runs[method]()
+                        # Recalcula métricas e imprime
+                        results[method] = Utils.compute_metrics(procs, timeline, cs)
+                        if cache is not None:
+                            cache.put(self.cache_key(method), timeline, cs, results[method])
+                    if export and timeline is not None:
+                        TimelineExporter.export(export.format(algorithm=method), timeline)
+                except Exception as e:
+                    print(f"Erro ao executar {name}: {e}")
+                print("\n" + "-" * 80 + "\n")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return results
+
+    # Varredura de parâmetros: executa RoundRobin e RoundRobinPriorityAging para cada
+    # combinação de quantum e aging num pool de processos (workers = None usa o número de CPUs)
+    # O escalonador (com a carga já lida) é enviado uma vez para cada processo do pool,
+    # no inicializador, e as tarefas só recebem (método, quantum, aging) e devolvem as Metrics
+    # O RoundRobin não usa aging, então roda uma vez por quantum (aging None no resultado)
+    # Retorna [(método, quantum, aging, Metrics)] na ordem: método, quantum, aging
+    def run_sweep(self, quantums, agings, workers=None, methods=SWEEP_ALGORITHMS):
+        tasks = []
+        for method in methods:
+            for quantum in quantums:
+                if method == "RoundRobinPriorityAging":
+                    tasks.extend((method, quantum, aging) for aging in agings)
+                else:
+                    tasks.append((method, quantum, None))
+        with ProcessPoolExecutor(max_workers=workers, initializer=Scheduling._share,
+                                 initargs=(self,)) as pool:
+            futures = [pool.submit(Scheduling._run_shared, *task) for task in tasks]
+            return [task + (future.result(),) for task, future in zip(tasks, futures)]
+
+    @staticmethod
+    def _share(scheduling):
+        Scheduling._shared = scheduling
+
+    # Tarefa da varredura: roda um algoritmo no escalonador compartilhado do processo
+    @staticmethod
+    def _run_shared(method, quantum, aging):
+        scheduling = Scheduling._shared
+        scheduling.quantum = quantum
+        scheduling.aging = aging if aging is not None else 0
+        procs, _, cs = scheduling.run_algorithm(method)
+        return scheduling.collect_metrics(procs, cs)
+
+    # Replicação de Monte Carlo do desempate aleatório: executa cada algoritmo n vezes, cada
+    # uma com uma semente independente (derivadas de base_seed), num pool de processos
+    # A primeira replicação de cada algoritmo conta os desempates aleatórios (Utils.ties):
+    # sem nenhum o resultado não depende da semente e as outras n - 1 não são executadas
+    # Retorna {método: ReplicationSummary} na ordem de ALGORITHMS
+    def run_replications(self, n, workers=None, base_seed=0, confidence=0.95, methods=None):
+        methods = methods or [method for _, method in self.ALGORITHMS]
+        seeds = [random.Random(base_seed).getrandbits(64)]
+        rng = random.Random(seeds[0])
+        seeds += [rng.getrandbits(64) for _ in range(n - 1)]
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=Scheduling._share,
+                                 initargs=(self,)) as pool:
+            first = {method: pool.submit(Scheduling._run_replica, method, seeds[0]) for method in methods}
+            samples = {method: [future.result()] for method, future in first.items()}
+            # só os algoritmos com desempates aleatórios continuam
+            rest = {method: [pool.submit(Scheduling._run_replica, method, seed) for seed in seeds[1:]]
+                    for method in methods if samples[method][0][-1] > 0}
+            for method, futures in rest.items():
+                samples[method].extend(future.result() for future in futures)
+
+        return {method: ReplicationSummary([sample[:-1] for sample in samples[method]], confidence,
+                                           ties=samples[method][0][-1])
+                for method in methods}
+
+    # Tarefa da replicação: roda um algoritmo com a semente dada no escalonador compartilhado
+    # Retorna os valores de ReplicationSummary.FIELDS e o número de desempates aleatórios
+    @staticmethod
+    def _run_replica(method, seed):
+        scheduling = Scheduling._shared
+        scheduling.seed = seed
+        Utils.ties = 0
+        procs, _, cs = scheduling.run_algorithm(method)
+        metrics = scheduling.collect_metrics(procs, cs)
+        return (metrics.avg_turnaround, metrics.avg_waiting, metrics.cs, Utils.ties)
+
+    # Liga a simulação por períodos ocupados em run_algorithm (workers None = número de CPUs)
+    def set_sharding(self, enabled=True, workers=None):
+        self.sharded = enabled
+        self.shard_workers = workers
+
+    # Períodos ocupados da carga: quando a CPU fica ociosa sem nenhum processo pronto, o
+    # escalonador volta ao estado inicial, então cada período ocupado pode ser simulado sozinho
+    # Recebe as chegadas e as execuções em ordem de chegada e retorna as fatias (início, fim)
+    # de índices, juntando períodos seguidos até terem pelo menos size processos
+    @staticmethod
+    def busy_periods(arrivals, bursts, size):
+        shards = []
+        start = 0
+        end = None # fim do período ocupado atual se nada mais chegar
+        for i, (arrival, burst) in enumerate(zip(arrivals, bursts)):
+            if end is not None and arrival > end and i - start >= size:
+                shards.append((start, i))
+                start = i
+            end = max(arrival, 0 if end is None else end) + burst # a simulação começa em 0
+        if len(arrivals):
+            shards.append((start, len(arrivals)))
+        return shards
+
+    # Simula um algoritmo dividindo a carga nos períodos ocupados (ver busy_periods), com as
+    # fatias em paralelo num pool de processos, e junta as timelines, os processos e as trocas
+    # de contexto. O resultado é o mesmo de run_algorithm em série:
+    #  - entre duas fatias a timeline ganha o trecho ocioso até a primeira chegada da seguinte
+    #  - SRTF, Prioridade com preempção e RRPA contam uma troca de contexto a mais em cada
+    #    fronteira (SHARD_CS_ACROSS_IDLE), as outras não contam troca depois de trecho ocioso
+    #  - com semente, cada fatia começa com o random no estado em que a execução em série o
+    #    deixaria: a primeira usa a semente e devolve o estado final do random, as outras
+    #    devolvem quantos random.choice fizeram (Utils.draws). Uma fatia sem desempates de fato
+    #    (Utils.ties) não depende do estado e só avança o random com o mesmo número de escolhas
+    #    de uma opção; uma com desempates é simulada de novo aqui, em ordem
+    #  - limitação: com semente, as fatias com desempates de fato rodam em série no processo
+    #    principal (o resultado do pool é descartado), então uma carga com muitos empates quase
+    #    não ganha com o paralelismo. Um random independente por fatia tiraria essa parte em
+    #    série, mas os sorteios deixariam de ser os da execução em série e o resultado mudaria;
+    #    sem semente as fatias não são simuladas de novo
+    # Só para a lista de processos e a tabela nos motores tick e event
+    def run_sharded(self, method, workers=None):
+        if self.workload is not None or self.engine == "smp" or self.summary:
+            raise ValueError("A simulação por períodos ocupados não aceita carga em streaming, "
+                             "o motor smp nem o modo resumo")
+        if self.table is not None:
+            table = self.table
+            order = table.arrival_order()
+            records = [(table.pid(i), int(table.arrival[i]), int(table.burst[i]), int(table.priority[i]))
+                       for i in order]
+        else:
+            order = sorted(self.processes, key=lambda p: p.arrival)
+            records = [(p.pid, p.arrival, p.burst, p.priority) for p in order]
+        workers = workers or os.cpu_count() or 1
+        size = max(self.SHARD_MIN, -(-len(records) // (workers * self.SHARDS_PER_WORKER)))
+        shards = self.busy_periods([r[1] for r in records], [r[2] for r in records], size)
+        if len(shards) <= 1:
+            return self._run(method)
+
+        self.reset_processes()
+        procs = self.get_processes()
+        config = (method, self.quantum, self.aging, self.engine, self.compact_timeline)
+        state = None
+        if self.seed is not None:
+            random.seed(self.seed)
+            state = random.getstate()
+        timeline = self.new_timeline()
+        cs = len(shards) - 1 if method in self.SHARD_CS_ACROSS_IDLE else 0
+        ties = 0
+        single = [None] # random.choice com uma opção só avança o random
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(Scheduling._run_shard, config, records[lo:hi], state if k == 0 else None)
+                       for k, (lo, hi) in enumerate(shards)]
+            for k, ((lo, hi), future) in enumerate(zip(shards, futures)):
+                segments, shard_cs, results, shard_ties, draws, final = future.result()
+                if state is not None:
+                    if k == 0:
+                        random.setstate(final)
+                    elif shard_ties:
+                        segments, shard_cs, results, shard_ties, draws, _ = \
+                            Scheduling._run_shard(config, records[lo:hi], random.getstate())
+                    else:
+                        for _ in range(draws):
+                            random.choice(single)
+                ties += shard_ties
+                cs += shard_cs
+                if k > 0:
+                    # a fatia começa ociosa no tempo 0: o trecho ocioso vem do fim da anterior
+                    first = records[lo][1]
+                    if first > timeline[-1][1]:
+                        timeline.append((timeline[-1][1], first, None))
+                    segments = [segment for segment in segments if segment[2] is not None or segment[1] > first]
+                for segment in segments:
+                    timeline.append(segment)
+                for j, (start_time, finish_time, dynamic_priority) in zip(range(lo, hi), results):
+                    p = self.state.view(order[j]) if self.table is not None else order[j]
+                    p.remaining = 0
+                    p.start_time = start_time
+                    p.finish_time = finish_time
+                    p.dynamic_priority = dynamic_priority
+        Utils.ties += ties
+        return procs, timeline, cs
+
+    # Tarefa de uma fatia: simula os processos (pid, chegada, execução, prioridade) num
+    # escalonador novo, com o random no estado dado (None = como estiver no processo)
+    # Retorna (trechos da timeline, cs, [(início, término, prioridade dinâmica)] na ordem dos
+    # registros, desempates com mais de uma opção, chamadas de random.choice, estado final
+    # do random se o inicial foi dado)
+    @staticmethod
+    def _run_shard(config, records, state):
+        method, quantum, aging, engine, compact = config
+        scheduling = Scheduling(quantum, aging, engine=engine, compact_timeline=compact)
+        for record in records:
+            scheduling.add_process(Process(*record))
+        if state is not None:
+            random.setstate(state)
+        ties, draws = Utils.ties, Utils.draws
+        procs, timeline, cs = scheduling._run(method)
+        results = [(p.start_time, p.finish_time, p.dynamic_priority) for p in procs]
+        return (list(timeline), cs, results, Utils.ties - ties, Utils.draws - draws,
+                random.getstate() if state is not None else None)
+
+    # API online: o escalonador como componente de decisão ao vivo
+    # Os processos chegam com submit, o tempo avança com advance e as decisões saem com
+    # next_decision. Usa o motor smp com self.cores núcleos (1 núcleo decide igual ao motor event)
+    def start_online(self, method):
+        if method not in Policy.registry:
+            raise ValueError(f"Algoritmo desconhecido: {method}")
+        if self.seed is not None:
+            random.seed(self.seed)
+        self.online_method = method
+        self.online_stats = MetricsAccumulator()
+        self.on_finish = self.online_stats.add
+        self.online = SMPEngine(self, self.cores, self.placement, self.steal)
+        self.online.open(method, ArrivalQueue(), record=True)
+
+    def _online(self):
+        if self.online is None:
+            raise RuntimeError("Simulação online não iniciada (use start_online)")
+        return self.online
+
+    # Adiciona um processo que chega no futuro (depois do último instante processado)
+    def submit(self, process):
+        engine = self._online()
+        if process.arrival <= engine.now:
+            raise ValueError(f"Chegada {process.arrival} do processo {process.pid} "
+                             f"não é posterior ao tempo atual {engine.now}")
+        engine.arrivals.push(process)
+
+    # Processa todos os instantes até to_time (inclusive); None processa até acabar o que foi enviado
+    def advance(self, to_time=None):
+        engine = self._online()
+        if to_time is not None and to_time < engine.now:
+            raise ValueError(f"O tempo não volta: {to_time} < {engine.now}")
+        engine.run_until(to_time)
+
+    # Próxima decisão ainda não lida: (tempo, núcleo, "dispatch" ou "finish", pid), ou None
+    def next_decision(self):
+        decisions = self._online().decisions
+        return decisions.popleft() if decisions else None
+
+    # Métricas dos processos já terminados na simulação online
+    def online_metrics(self):
+        engine = self._online()
+        return Metrics.from_accumulator(self.online_stats, engine.context_switches()).set_cores(self.cores)
 
-    
     def add_process(self, process):
         self.processes.append(process)
+        self._digest = None
+    # Na tabela em colunas retorna o RunState (percorrê-lo gera visões dos processos)
     def get_processes(self):
+        if self.table is not None:
+            return self.state
         return self.processes
 
+    # Usa uma ProcessTable no lugar da lista de processos
+    # Os algoritmos rodam direto sobre as colunas, sem criar um Process por processo
+    def set_table(self, table):
+        self.table = table
+        self.state = table.new_run()
+        self._digest = None
+
+    # Reseta o estado de execução de todos os processos antes de uma simulação
+    def reset_processes(self):
+        if self.state is not None:
+            self.state.reset()
+        for p in self.processes:
+            p.reset()
+
+    # Usa uma carga em streaming (ex: StreamWorkload) no lugar da lista de processos
+    # A carga deve poder ser percorrida várias vezes e já estar em ordem de chegada
+    def set_workload(self, workload):
+        self.workload = workload
+        self._digest = None
+
+    # Cursor sobre os processos em ordem de chegada
+    # Na carga em streaming os processos são lidos sob demanda; na tabela segue os índices
+    # ordenados por chegada; senão ordena a lista
+    def arrivals(self):
+        if self.workload is not None:
+            return ArrivalCursor(self.workload)
+        if self.table is not None:
+            # cria a visão de cada processo só quando ele chega
+            return ArrivalCursor(self.state.view(i) for i in self.table.arrival_order())
+        return ArrivalCursor(sorted(self.processes, key=lambda p: p.arrival)) # Ordena por tempo de chegada
+
+    # Marca o término de um processo e avisa o acumulador de métricas (carga em streaming)
+    def finish_process(self, process, time):
+        process.finish_time = time
+        if self.on_finish is not None:
+            self.on_finish(process)
+
     # FCFS (First Come, First Served)
     def FCFS(self):
-        procs = self.get_processes()
-        for p in procs:
-            p.reset()
+        self.reset_processes()
         time = 0 # Tempo atual
-        timeline = [] # Lista de tuplas (tempo_inicio, tempo_fim, pid)
-        ready = deque() # Fila de prontos
-        process_by_arrival = sorted(procs, key=lambda p: p.arrival) # Ordena por tempo de chegada
-        idx = 0 # Indice para processos ordenados por chegada
+        timeline = self.new_timeline() # Trechos (tempo_inicio, tempo_fim, pid)
+        ready = ReadyQueue(key=lambda p: (p.arrival, p.remaining)) # Fila de prontos por tempo de chegada
+        arrivals = self.arrivals() # Processos em ordem de chegada (cursor com o indice idx)
         current_process = None # Processo em execução
         cs = 0 # Contador de trocas de contexto
 
         while True:
             # Adiciona processos que chegaram ao tempo atual na fila de prontos
-            while idx < len(process_by_arrival) and process_by_arrival[idx].arrival <= time:
-                ready.append(process_by_arrival[idx])
-                idx += 1
+            while arrivals.head is not None and arrivals.head.arrival <= time:
+                ready.push(arrivals.pop())
             
             # Se não há processo em execução, pega o próximo da fila
             if current_process is None and ready:
-                min_arrival = min(p.arrival for p in ready)
-                candidates = [p for p in ready if p.arrival == min_arrival] # processos com o menor tempo de chegada se tiver apenas um já é o escolhido
-                next_p = Utils.breakTie(candidates, None) # desempata entre os de menor tempo de chegada seguindo a 3 regra de desempate 
-                ready.remove(next_p)
-                
-                # next_p = ready.popleft()
+                # processos com o menor tempo de chegada (e menor tempo restante) saem juntos do heap
+                next_p = ready.pop_best(Utils.choice) # desempata seguindo a 3 regra de desempate (a chave já inclui o tempo restante)
                 
                 # Faz a troca de contexto se necessario
                 if timeline and timeline[-1][2] is not None and timeline[-1][2] != next_p.pid:
@@ -86,44 +672,36 @@ class Scheduling:
                 timeline.append((time, time + 1, current_process.pid))
                 current_process.remaining -= 1
                 if current_process.remaining == 0: # Processo terminou
-                    current_process.finish_time = time + 1
+                    self.finish_process(current_process, time + 1)
                     current_process = None
             else:
                 timeline.append((time, time + 1, None)) # CPU ociosa
                 
             time += 1 # Incrementa o tempo
-            if current_process is None and idx >= len(process_by_arrival) and not ready:
+            if current_process is None and arrivals.exhausted() and not ready:
                 break # Sai se não há mais processos para executar
-        # Retorna uma lista de tuplas representando a timeline(tempo_inicio, tempo_fim, pid) e o número de trocas de contexto
+        # Retorna a timeline em trechos (tempo_inicio, tempo_fim, pid) e o número de trocas de contexto
         return timeline, cs
 
     # Shortest Job First (SJF) - Não preemptivo
     def SJF(self):
-        procs = self.get_processes()
-        for p in procs:
-            p.reset()
+        self.reset_processes()
         time = 0 # Tempo atual
-        timeline = [] # Lista de tuplas (tempo_inicio, tempo_fim, pid)
-        ready = deque() # Fila de prontos
-        process_by_arrival = sorted(procs, key=lambda p: p.arrival) # Ordena por tempo de chegada
-        idx = 0 # Indice para processos ordenados por chegada
+        timeline = self.new_timeline() # Trechos (tempo_inicio, tempo_fim, pid)
+        ready = ReadyQueue(key=lambda p: p.burst) # Fila de prontos por burst time
+        arrivals = self.arrivals() # Processos em ordem de chegada (cursor com o indice idx)
         current_process = None # Processo em execução
         cs = 0 # Contador de trocas de contexto
         
         while True: # percorre o tempo
             
             # Adiciona processos que chegaram ao tempo atual na fila de prontos
-            while idx < len(process_by_arrival) and process_by_arrival[idx].arrival <= time:
-                ready.append(process_by_arrival[idx])
-                idx += 1
+            while arrivals.head is not None and arrivals.head.arrival <= time:
+                ready.push(arrivals.pop())
                 
             if current_process is None and ready:
                 # Seleciona o processo com o menor tempo de execução
-                
-                min_burst = min(p.burst for p in ready)
-                candidates = [p for p in ready if p.burst == min_burst] # processos com o menor burst time se tiver apenas um já é o escolhido
-                next_p = random.choice(candidates) # desempata aleatoriamente entre os de menor burst time seguindo a 3 regra de desempate
-                ready.remove(next_p)
+                next_p = ready.pop_best(Utils.choice) # desempata aleatoriamente entre os de menor burst time seguindo a 3 regra de desempate
                 # Faz a troca de contexto se necessario
                 if timeline and timeline[-1][2] is not None and timeline[-1][2] != next_p.pid:
                     cs += 1
@@ -136,26 +714,23 @@ class Scheduling:
                 timeline.append((time, time + 1, current_process.pid))
                 current_process.remaining -= 1
                 if current_process.remaining == 0: # Processo terminou
-                    current_process.finish_time = time + 1
+                    self.finish_process(current_process, time + 1)
                     current_process = None
             else:
                 timeline.append((time, time + 1, None)) # CPU ociosa
             time += 1
-            if current_process is None and idx >= len(process_by_arrival) and not ready:
+            if current_process is None and arrivals.exhausted() and not ready:
                 # Sai se não há mais processos para executar
                 break
         return timeline, cs
     
     # Shortest Remaning Time First - Shortest Job First Preemptivo
     def SRTF(self):
-        procs = self.get_processes()
-        for p in procs:
-            p.reset()
+        self.reset_processes()
         time = 0 # Tempo atual
-        timeline = [] # Lista de tuplas (tempo_inicio, tempo_fim, pid)
-        ready = deque() # Fila de prontos
-        process_by_arrival = sorted(procs, key=lambda p: p.arrival) # Ordena por tempo de chegada
-        idx = 0 # Indice para processos ordenados por chegada
+        timeline = self.new_timeline() # Trechos (tempo_inicio, tempo_fim, pid)
+        ready = ReadyQueue(key=lambda p: p.remaining) # Fila de prontos por tempo restante
+        arrivals = self.arrivals() # Processos em ordem de chegada (cursor com o indice idx)
         current_process = None # Processo em execução
         cs = 0 # Contador de trocas de contexto
         old_process = None # guarda o processo que estava em execução no ciclo anterior
@@ -163,27 +738,18 @@ class Scheduling:
         while True: # percorre o tempo
             
             # Adiciona processos que chegaram ao tempo atual na fila de prontos
-            while idx < len(process_by_arrival) and process_by_arrival[idx].arrival <= time:
-                ready.append(process_by_arrival[idx])
-                idx += 1
+            while arrivals.head is not None and arrivals.head.arrival <= time:
+                ready.push(arrivals.pop())
                 
             if current_process or ready:
-                # Seleciona o processo com o menor tempo de execução
-                
-                candidates = ready.copy()
-                if current_process:
-                    candidates.append(current_process)
-
-                next_p = Utils.breakTieSRTF(candidates, current_process) # desempata
+                # Seleciona o processo com o menor tempo de execução (o escolhido sai da fila de prontos)
+                next_p = Utils.chooseNextSRTF(ready, current_process) # desempata
                 
                 if old_process and next_p and old_process.pid != next_p.pid: # o proximo processo é diferente do atual
                     if old_process.remaining > 0:
-                        ready.append(old_process)
+                        ready.push(old_process)
                     cs+=1 # troca de contexto
                     
-                # se trocou de contexto tirar o proximo processo da lista de prontos
-                if next_p in ready:
-                    ready.remove(next_p)
                 current_process = next_p
                 if current_process and current_process.start_time is None:
                     current_process.start_time = time
@@ -194,42 +760,35 @@ class Scheduling:
                 old_process = current_process # guarda o processo atual antes de possivelmente ficar nulo
                 current_process.remaining -= 1
                 if current_process.remaining == 0: # Processo terminou
-                    current_process.finish_time = time + 1
+                    self.finish_process(current_process, time + 1)
                     current_process = None
             else:
                 timeline.append((time, time + 1, None)) # CPU ociosa
             time += 1
-            if current_process is None and idx >= len(process_by_arrival) and not ready:
+            if current_process is None and arrivals.exhausted() and not ready:
                 # Sai se não há mais processos para executar
                 break
         return timeline, cs
 
     # Por Prioridade (PS) - Cooperativo - Sem Preempção
     def PriorityNonPreemptive(self):
-        procs = self.get_processes()
-        for p in procs:
-            p.reset()
+        self.reset_processes()
         time = 0 # Tempo atual
-        timeline = [] # Lista de tuplas (tempo_inicio, tempo_fim, pid)
-        ready = deque() # Fila de prontos
-        process_by_arrival = sorted(procs, key=lambda p: p.arrival) # Ordena por tempo de chegada
-        idx = 0 # Indice para processos ordenados por chegada
+        timeline = self.new_timeline() # Trechos (tempo_inicio, tempo_fim, pid)
+        ready = ReadyQueue(key=lambda p: (-p.priority, p.remaining)) # Fila de prontos por prioridade
+        arrivals = self.arrivals() # Processos em ordem de chegada (cursor com o indice idx)
         current_process = None # Processo em execução
         cs = 0 # Contador de trocas de contexto
         
         while True:
             # Adiciona processos que chegaram ao tempo atual na fila de prontos
-            while idx < len(process_by_arrival) and process_by_arrival[idx].arrival <= time:
-                ready.append(process_by_arrival[idx])
-                idx += 1
+            while arrivals.head is not None and arrivals.head.arrival <= time:
+                ready.push(arrivals.pop())
             
             # Se não há processo em execução, pega o próximo da fila
             if current_process is None and ready:
-                # Seleciona o processo com a maior prioridade (maior valor numérico)
-                max_priority = max(p.priority for p in ready)
-                candidates = [p for p in ready if p.priority == max_priority] # processos com a maior prioridade se tiver apenas um já é o escolhido
-                next_p = Utils.breakTie(candidates, None) # desempata caso tenha mais de um com a mesma prioridade
-                ready.remove(next_p)
+                # Seleciona o processo com a maior prioridade (maior valor numérico) e menor tempo restante
+                next_p = ready.pop_best(Utils.choice) # desempata caso tenha mais de um com a mesma prioridade (e o mesmo tempo restante)
                 
                 # Faz a troca de contexto se necessario
                 if timeline and timeline[-1][2] is not None and timeline[-1][2] != next_p.pid:
@@ -246,27 +805,24 @@ class Scheduling:
                 timeline.append((time, time + 1, current_process.pid))
                 current_process.remaining -= 1
                 if current_process.remaining == 0: # Processo terminou
-                    current_process.finish_time = time + 1
+                    self.finish_process(current_process, time + 1)
                     current_process = None
             else:
                 timeline.append((time, time + 1, None)) # CPU ociosa
                 
             time += 1 # Incrementa o tempo
-            if current_process is None and idx >= len(process_by_arrival) and not ready:
+            if current_process is None and arrivals.exhausted() and not ready:
                 break # Sai se não há mais processos para executar
-        # Retorna uma lista de tuplas representando a timeline(tempo_inicio, tempo_fim, pid) e o número de trocas de contexto
+        # Retorna a timeline em trechos (tempo_inicio, tempo_fim, pid) e o número de trocas de contexto
         return timeline, cs
             
     # Por Prioridade (PS) - Preemptivo
     def PriorityPreemptive(self):
-        procs = self.get_processes()
-        for p in procs:
-            p.reset()
+        self.reset_processes()
         time = 0 # Tempo atual
-        timeline = [] # Lista de tuplas (tempo_inicio, tempo_fim, pid)
-        ready = deque() # Fila de prontos
-        process_by_arrival = sorted(procs, key=lambda p: p.arrival) # Ordena por tempo de chegada
-        idx = 0 # Indice para processos ordenados por chegada
+        timeline = self.new_timeline() # Trechos (tempo_inicio, tempo_fim, pid)
+        ready = ReadyQueue(key=lambda p: (-p.priority, p.remaining)) # Fila de prontos por prioridade
+        arrivals = self.arrivals() # Processos em ordem de chegada (cursor com o indice idx)
         current_process = None # Processo em execução
         cs = 0 # Contador de trocas de contexto
         old_process = None # guarda o processo que estava em execução no ciclo anterior
@@ -274,33 +830,18 @@ class Scheduling:
         while True: # percorre o tempo
             
             # Adiciona processos que chegaram ao tempo atual na fila de prontos
-            while idx < len(process_by_arrival) and process_by_arrival[idx].arrival <= time:
-                ready.append(process_by_arrival[idx])
-                idx += 1
+            while arrivals.head is not None and arrivals.head.arrival <= time:
+                ready.push(arrivals.pop())
                 
             if current_process or ready:
-                candidates = ready.copy()
-                
-                if current_process:
-                    candidates.append(current_process)
-
-                highest_priority = max(p.priority for p in candidates) # maior valor de prioridade
-                tied = [p for p in candidates if p.priority == highest_priority] # processos com a maior prioridade se só tiver um já é o escolhido
-
-                if len(tied) == 1: # apenas um processo, para evitar chamada desnecessária do breakTie
-                    next_p = tied[0]
-                else:
-                    next_p = Utils.breakTie(tied, current_process) # desempata caso tenha mais de um com a mesma prioridade
-
+                # Seleciona o processo com a maior prioridade (o escolhido sai da fila de prontos)
+                next_p = Utils.chooseNextPriority(ready, current_process) # desempata caso tenha mais de um com a mesma prioridade
 
                 if old_process and next_p and old_process.pid != next_p.pid: # o proximo processo é diferente do atual
                     if old_process.remaining > 0:
-                        ready.append(old_process)
+                        ready.push(old_process)
                     cs+=1 # troca de contexto
                     
-                # se trocou de contexto tirar o proximo processo da lista de prontos
-                if next_p in ready:
-                    ready.remove(next_p)
                 current_process = next_p
                 if current_process and current_process.start_time is None:
                     current_process.start_time = time
@@ -311,26 +852,23 @@ class Scheduling:
                 old_process = current_process # guarda o processo atual antes de possivelmente ficar nulo
                 current_process.remaining -= 1
                 if current_process.remaining == 0: # Processo terminou
-                    current_process.finish_time = time + 1
+                    self.finish_process(current_process, time + 1)
                     current_process = None
             else:
                 timeline.append((time, time + 1, None)) # CPU ociosa
             time += 1
-            if current_process is None and idx >= len(process_by_arrival) and not ready:
+            if current_process is None and arrivals.exhausted() and not ready:
                 # Sai se não há mais processos para executar
                 break
         return timeline, cs
     
     # Round Robin (RR) - Preemptivo com Quantum e sem Prioridade
     def RoundRobin(self):
-        procs = self.get_processes()
-        for p in procs:
-            p.reset()
+        self.reset_processes()
         time = 0 # Tempo atual
-        timeline = [] # Lista de tuplas (tempo_inicio, tempo_fim, pid)
+        timeline = self.new_timeline() # Trechos (tempo_inicio, tempo_fim, pid)
         ready = deque() # Fila de prontos
-        process_by_arrival = sorted(procs, key=lambda p: p.arrival) # Ordena por tempo de chegada
-        idx = 0 # Indice para processos ordenados por chegada
+        arrivals = self.arrivals() # Processos em ordem de chegada (cursor com o indice idx)
         current_process = None # Processo em execução
         cs = 0 # Contador de trocas de contexto
         
@@ -340,9 +878,8 @@ class Scheduling:
         while True: # percorre o tempo
             
             # Adiciona processos que chegaram ao tempo atual na fila de prontos
-            while idx < len(process_by_arrival) and process_by_arrival[idx].arrival <= time:
-                ready.append(process_by_arrival[idx])
-                idx += 1
+            while arrivals.head is not None and arrivals.head.arrival <= time:
+                ready.append(arrivals.pop())
                 
             if current_process is None and ready:
                 current_process = ready.popleft()
@@ -360,7 +897,7 @@ class Scheduling:
                 current_process.remaining -= 1
                 timeslice -= 1
                 if current_process.remaining == 0: # Processo terminou
-                    current_process.finish_time = time + 1
+                    self.finish_process(current_process, time + 1)
                     current_process = None
                     timeslice = 0
                 elif timeslice == 0: # Quantum esgotado, preempção
@@ -369,35 +906,31 @@ class Scheduling:
             else:
                 timeline.append((time, time + 1, None)) # CPU ociosa
             time += 1
-            if current_process is None and idx >= len(process_by_arrival) and not ready:
+            if current_process is None and arrivals.exhausted() and not ready:
                 # Sai se não há mais processos para executar
                 break
         return timeline, cs   
     
     # Round Robin (RR) - Com prioridade e envelhecimento
     def RoundRobinPriorityAging(self):
-        procs = self.get_processes()
-        for p in procs:
-            p.reset()
+        self.reset_processes()
         time = 0 # Tempo atual
-        timeline = [] # Lista de tuplas (tempo_inicio, tempo_fim, pid)
-        process_by_arrival = sorted(procs, key=lambda p: p.arrival) # Ordena por tempo de chegada
-        idx = 0 # Indice para processos ordenados por chegada
+        timeline = self.new_timeline() # Trechos (tempo_inicio, tempo_fim, pid)
+        arrivals = self.arrivals() # Processos em ordem de chegada (cursor com o indice idx)
         current_process = None # Processo em execução
         cs = 0 # Contador de trocas de contexto
         
         timeslice = 0 # Contador do tempo do quantum para o processo atual
-        prio_levels = defaultdict(deque) # filas de prontos por nível de prioridade
+        prio_levels = MultiLevelQueue(self.aging) # filas de prontos por nível de prioridade (envelhecimento preguiçoso)
         old_process = None # guarda o processo que estava em execução no ciclo anterior
         
         
         while True: # percorre o tempo
             # Adiciona processos que chegaram ao tempo atual na fila
-            while idx < len(process_by_arrival) and process_by_arrival[idx].arrival <= time:
-                p = process_by_arrival[idx]
+            while arrivals.head is not None and arrivals.head.arrival <= time:
+                p = arrivals.pop()
                 # Adiciona o processo à fila de prontos de acordo com sua prioridade dinâmica
-                prio_levels[p.dynamic_priority].append(p)
-                idx += 1
+                prio_levels.push(p)
 
             prefer_candidate = None # candidato preferencial para desempate
 
@@ -407,17 +940,12 @@ class Scheduling:
                 if timeslice == 0 and current_process and current_process.remaining > 0: # apenas se o processo atual não terminou
                     
                     # envelhece os processos na fila de prontos antes de re-enfileirar o processo atual
+                    # (O(1): só avança a época do envelhecimento)
                     if self.aging > 0:
-                        all_ready_procs = []
-                        for prio in list(prio_levels.keys()):
-                            all_ready_procs.extend(prio_levels.pop(prio))
-                            
-                        for p in all_ready_procs:
-                            p.dynamic_priority = max(1, p.dynamic_priority - self.aging)
-                            prio_levels[p.dynamic_priority].append(p)
+                        prio_levels.age()
 
                     # o processo atual volta para a fila de prontos
-                    prio_levels[current_process.dynamic_priority].append(current_process)
+                    prio_levels.push(current_process)
                     prefer_candidate = current_process 
                     current_process = None # CPU fica livre para a re-seleção
 
@@ -442,22 +970,16 @@ class Scheduling:
                 old_process = current_process # guarda o processo atual antes de possivelmente ficar nulo
 
                 if current_process.remaining == 0:
-                    current_process.finish_time = time + 1
+                    self.finish_process(current_process, time + 1)
                     current_process = None
                     timeslice = 0
             else:
                 timeline.append((time, time + 1, None))
                 # Aplica envelhecimento aos processos em espera
                 if self.aging > 0:
-                    all_ready_procs = []
-                    for prio in list(prio_levels.keys()):
-                        all_ready_procs.extend(prio_levels.pop(prio))
-                        
-                    for p in all_ready_procs:
-                        p.dynamic_priority = max(1, p.dynamic_priority - self.aging)
-                        prio_levels[p.dynamic_priority].append(p)
+                    prio_levels.age()
             time += 1
-            if current_process is None and idx >= len(process_by_arrival) and not any(len(q) for q in prio_levels.values()):
+            if current_process is None and arrivals.exhausted() and not prio_levels:
                 break
         return timeline, cs
     
\ No newline at end of file
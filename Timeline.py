@@ -0,0 +1,136 @@
+from array import array
+
+# Timeline compacta codificada por segmentos (run-length)
+# Guarda trechos contíguos (tempo_inicio, tempo_fim, pid) em vez de uma tupla por unidade de tempo:
+# ao adicionar um trecho do mesmo pid que começa onde o último terminou, o último é estendido.
+# Assim a memória cresce com o número de trocas de contexto e não com o tempo simulado.
+# Se comporta como uma lista de tuplas (len, iteração, timeline[-1][2], ...), então
+# Utils.compute_metrics, Utils.printTimeline e a contagem de trocas de contexto a usam direto.
+# compact=True guarda os trechos em arrays de inteiros (pid como índice numa tabela de nomes).
+class Timeline:
+    IDLE = -1 # índice do pid da CPU ociosa no modo compacto
+
+    def __init__(self, compact=False):
+        self.compact = compact
+        if compact:
+            self.starts = array('q')
+            self.ends = array('q')
+            self.pids = array('q') # índice em pid_names ou IDLE
+            self.pid_names = [] # índice -> pid
+            self.pid_index = {} # pid -> índice
+        else:
+            self.segments = [] # lista de tuplas (tempo_inicio, tempo_fim, pid)
+
+    def __len__(self):
+        return len(self.starts) if self.compact else len(self.segments)
+
+    def __getitem__(self, i):
+        if not self.compact:
+            return self.segments[i]
+        pid = self.pids[i]
+        return (self.starts[i], self.ends[i], None if pid == Timeline.IDLE else self.pid_names[pid])
+
+    def __iter__(self):
+        if not self.compact:
+            return iter(self.segments)
+        return (self[i] for i in range(len(self.starts)))
+
+    def __eq__(self, other):
+        if isinstance(other, (Timeline, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Timeline({list(self)!r})"
+
+    # Adiciona um trecho (tempo_inicio, tempo_fim, pid), juntando com o último se for contínuo
+    def append(self, segment):
+        start, end, pid = segment
+        if self.compact:
+            code = Timeline.IDLE if pid is None else self._code(pid)
+            n = len(self.starts)
+            if n and self.pids[n - 1] == code and self.ends[n - 1] == start:
+                self.ends[n - 1] = end
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+                self.pids.append(code)
+        else:
+            segments = self.segments
+            if segments and segments[-1][2] == pid and segments[-1][1] == start:
+                segments[-1] = (segments[-1][0], end, pid)
+            else:
+                segments.append((start, end, pid))
+
+    # Adiciona trechos já juntados (ex: o começo de outra timeline): só o primeiro pode
+    # juntar com o último trecho desta, os outros são copiados direto
+    def extend(self, segments):
+        iterator = iter(segments)
+        first = next(iterator, None)
+        if first is None:
+            return
+        self.append(first)
+        if self.compact:
+            for segment in iterator:
+                self.append(segment)
+        else:
+            self.segments.extend(iterator)
+
+    # Índice do pid na tabela de nomes (modo compacto)
+    def _code(self, pid):
+        code = self.pid_index.get(pid)
+        if code is None:
+            code = len(self.pid_names)
+            self.pid_index[pid] = code
+            self.pid_names.append(pid)
+        return code
+
+    # Expande a timeline em uma tupla por unidade de tempo (formato antigo)
+    def ticks(self):
+        for start, end, pid in self:
+            for t in range(start, end):
+                yield (t, t + 1, pid)
+
+
+# Timeline do modo resumo (Scheduling.set_summary): não guarda os trechos
+# Os algoritmos só leem o último trecho (troca de contexto pela timeline), então ela guarda
+# esse trecho e os totais, com memória constante. len conta os trechos (como na Timeline,
+# juntando os contínuos do mesmo pid) e a iteração não tem nada para percorrer.
+class TimelineSummary:
+    def __init__(self):
+        self.last = None # último trecho (tempo_inicio, tempo_fim, pid)
+        self.count = 0 # trechos
+        self.busy_time = 0 # tempo com algum processo executando
+        self.idle_time = 0 # tempo ocioso
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if self.count and i in (-1, self.count - 1):
+            return self.last
+        raise IndexError("A timeline do modo resumo só guarda o último trecho")
+
+    def __iter__(self):
+        return iter(())
+
+    def __repr__(self):
+        return f"TimelineSummary(count={self.count}, busy_time={self.busy_time}, idle_time={self.idle_time})"
+
+    def append(self, segment):
+        start, end, pid = segment
+        if pid is None:
+            self.idle_time += end - start
+        else:
+            self.busy_time += end - start
+        last = self.last
+        if last is not None and last[2] == pid and last[1] == start:
+            self.last = (last[0], end, pid)
+        else:
+            self.last = segment
+            self.count += 1
+
+    # Fim do último trecho (tempo total simulado)
+    @property
+    def end(self):
+        return self.last[1] if self.last is not None else 0
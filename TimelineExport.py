@@ -0,0 +1,179 @@
+import gzip
+import json
+
+# Exportação da timeline em trechos (tempo_inicio, tempo_fim, pid)
+# Escreve um trecho por registro (e não uma linha por unidade de tempo e coluna por processo
+# como Utils.printTimeline), com escrita bufferizada e gzip opcional.
+# Formatos:
+#   csv   -> cabeçalho "start,end,pid" e uma linha por trecho (pid vazio = CPU ociosa)
+#   jsonl -> um objeto {"start", "end", "pid"} por linha (pid null = CPU ociosa)
+#   bin   -> binário compacto (ver BINARY_* abaixo), lido de volta por read_binary
+class TimelineExporter:
+    FORMATS = ("csv", "jsonl", "bin")
+    BUFFER_SIZE = 1 << 20 # tamanho do buffer de escrita
+    BATCH = 4096 # trechos formatados por escrita no buffer
+
+    # Binário: cabeçalho MAGIC + versão (uint8), depois uma sequência de inteiros varint (LEB128).
+    # Cada registro começa com um código:
+    #   0     -> definição de pid: tamanho + nome utf-8 (recebe o próximo índice, a partir de 0)
+    #   1     -> trecho ocioso
+    #   i + 2 -> trecho do pid de índice i
+    # e os trechos seguem com o intervalo desde o fim do trecho anterior (zigzag, normalmente 0)
+    # e a duração. Os pids são definidos na primeira vez que aparecem, então o arquivo é escrito
+    # em streaming e um trecho costuma ocupar 3 ou 4 bytes.
+    BINARY_MAGIC = b"PSTL"
+    BINARY_VERSION = 1
+
+    # path: arquivo de saída; ".gz" no final ativa o gzip
+    # fmt: csv, jsonl ou bin (None = deduz pela extensão)
+    def __init__(self, path, fmt=None, compress=None):
+        name = path[:-3] if path.endswith(".gz") else path
+        self.fmt = fmt or name.rsplit(".", 1)[-1]
+        if self.fmt not in self.FORMATS:
+            raise ValueError(f"Formato de exportação desconhecido: {self.fmt}")
+        self.compress = path.endswith(".gz") if compress is None else compress
+        if self.compress:
+            self.file = gzip.open(path, 'wb', compresslevel=6)
+        else:
+            self.file = open(path, 'wb', buffering=self.BUFFER_SIZE)
+        self.codes = {} # pid -> código (binário)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.file.close()
+
+    # Escreve todos os trechos da timeline
+    def write(self, timeline):
+        if self.fmt == "csv":
+            self.file.write(b"start,end,pid\n")
+            self._write_lines(f"{start},{end},{'' if pid is None else pid}\n" for start, end, pid in timeline)
+        elif self.fmt == "jsonl":
+            dumps = json.dumps
+            self._write_lines(f'{{"start": {start}, "end": {end}, "pid": {dumps(pid)}}}\n'
+                              for start, end, pid in timeline)
+        else:
+            self._write_binary(timeline)
+
+    # Junta as linhas em lotes para reduzir o número de escritas
+    def _write_lines(self, lines):
+        batch = []
+        for line in lines:
+            batch.append(line)
+            if len(batch) >= self.BATCH:
+                self.file.write(''.join(batch).encode())
+                batch = []
+        if batch:
+            self.file.write(''.join(batch).encode())
+
+    def _write_binary(self, timeline):
+        varint = TimelineExporter._varint
+        codes = self.codes
+        self.file.write(self.BINARY_MAGIC + bytes([self.BINARY_VERSION]))
+        batch = bytearray()
+        previous_end = 0
+        for start, end, pid in timeline:
+            if pid is None:
+                code = 1
+            else:
+                code = codes.get(pid)
+                if code is None: # primeira vez que o pid aparece
+                    code = codes[pid] = len(codes) + 2
+                    name = pid.encode()
+                    batch += b'\x00' + varint(len(name)) + name
+            gap = start - previous_end
+            batch += varint(code) + varint(gap * 2 if gap >= 0 else -gap * 2 - 1) + varint(end - start)
+            previous_end = end
+            if len(batch) >= self.BUFFER_SIZE:
+                self.file.write(batch)
+                batch = bytearray()
+        self.file.write(batch)
+
+    # Codifica um inteiro não negativo em varint (7 bits por byte)
+    @staticmethod
+    def _varint(value):
+        if value < 0x80:
+            return bytes((value,))
+        out = bytearray()
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+        return bytes(out)
+
+    # Exporta uma timeline para um arquivo
+    @staticmethod
+    def export(path, timeline, fmt=None):
+        with TimelineExporter(path, fmt) as exporter:
+            exporter.write(timeline)
+
+    # Lê um arquivo binário (com ou sem gzip) gerando os trechos (tempo_inicio, tempo_fim, pid)
+    # O arquivo é lido em blocos de BUFFER_SIZE, então a memória não cresce com a timeline
+    @staticmethod
+    def read_binary(path):
+        opener = gzip.open if path.endswith(".gz") else open
+        magic = TimelineExporter.BINARY_MAGIC
+        with opener(path, 'rb') as file:
+            header = file.read(len(magic) + 1)
+            if header[:len(magic)] != magic:
+                raise ValueError(f"Arquivo de timeline inválido: {path}")
+            if len(header) <= len(magic) or header[len(magic)] != TimelineExporter.BINARY_VERSION:
+                version = header[len(magic)] if len(header) > len(magic) else None
+                raise ValueError(f"Versão de timeline binária não suportada: {version}")
+            data = b""
+            pos = 0
+            eof = False
+
+            # junta o que sobrou do bloco anterior (registro incompleto) com o próximo bloco
+            def refill():
+                nonlocal data, pos, eof
+                chunk = file.read(TimelineExporter.BUFFER_SIZE)
+                eof = not chunk
+                data = data[pos:] + chunk
+                pos = 0
+
+            def varint():
+                nonlocal pos
+                value = shift = 0
+                while True:
+                    byte = data[pos] # IndexError: o registro continua no próximo bloco
+                    pos += 1
+                    value |= (byte & 0x7F) << shift
+                    if byte < 0x80:
+                        return value
+                    shift += 7
+
+            names = [None] # índice 0 (código 1) = ocioso
+            previous_end = 0
+            while True:
+                if pos >= len(data):
+                    if eof:
+                        break
+                    refill()
+                    continue
+                record = pos
+                try:
+                    code = varint()
+                    if code == 0: # definição de pid
+                        size = varint()
+                        if pos + size > len(data):
+                            raise IndexError
+                        names.append(data[pos:pos + size].decode())
+                        pos += size
+                        continue
+                    gap = varint()
+                    duration = varint()
+                except IndexError:
+                    pos = record
+                    if eof:
+                        raise ValueError(f"Arquivo de timeline truncado: {path}")
+                    refill()
+                    continue
+                start = previous_end + (gap >> 1 if gap % 2 == 0 else -((gap + 1) >> 1))
+                end = start + duration
+                previous_end = end
+                yield (start, end, names[code - 1])
@@ -0,0 +1,256 @@
+import argparse
+import heapq
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from BinaryWorkload import BinaryWorkload
+
+# Importador de traces reais do escalonador do Linux (texto de `perf sched script` /
+# `perf script` ou do ftrace: /sys/kernel/tracing/trace, `trace-cmd report`)
+# Lê os eventos sched_switch e sched_wakeup/sched_wakeup_new, nos dois formatos de campos:
+#   prev_comm=bash prev_pid=12 prev_prio=120 prev_state=S ==> next_comm=sh next_pid=34 next_prio=120
+#   bash:12 [120] S ==> sh:34 [120]                         (perf antigo)
+#   comm=sh pid=34 prio=120 target_cpu=001  /  sh:34 [120] success=1 CPU:001
+# e converte em processos no formato da carga (chegada, execução, prioridade):
+#  - um processo é um trecho executável de uma tarefa: começa quando ela acorda (ou quando
+#    aparece executando ou preemptada sem ter acordado no trace) e termina quando ela sai da
+#    CPU dormindo (prev_state diferente de R/R+); as preempções (R, R+) não terminam o processo
+#  - execução: tempo na CPU durante o trecho; chegada: instante do início; os dois em `unit`
+#    nanossegundos desde o primeiro evento, arredondados (execução mínima 1)
+#  - prioridade: MAX_PRIO - prio do kernel (nice 0 = 120 -> 20), maior = mais prioritário,
+#    como nos algoritmos com prioridade
+#  - a tarefa ociosa (pid 0) é ignorada; trechos ainda abertos no fim do trace entram com o
+#    tempo executado até o último evento (os que não executaram nada são descartados)
+# A conversão é incremental: só as tarefas com trecho aberto ficam na memória, e os processos
+# saem em ordem de chegada por um buffer de reordenação (um trecho termina depois de outros
+# que começaram antes dele). Se mais de max_pending processos ficarem esperando um trecho
+# muito longo, esse trecho é cortado (o que executou vira um processo e o resto continua como
+# um processo novo chegando no instante do corte), então a memória fica limitada.
+# Com workers > 1 o arquivo é dividido em blocos de chunk_size bytes (nas quebras de linha) e
+# o parsing dos blocos, que é a parte cara, roda num pool de processos; os eventos voltam na
+# ordem do arquivo com no máximo 2 blocos por processo em andamento.
+class TraceImporter:
+    MAX_PRIO = 140
+    CHUNK_SIZE = 8 << 20 # bytes por bloco no parsing paralelo
+    MAX_PENDING = 1000000 # processos terminados esperando a ordem de chegada
+
+    TIMESTAMP = re.compile(r"\s(\d+)\.(\d+):\s")
+    EVENT = re.compile(r"\b(sched_switch|sched_wakeup_new|sched_wakeup):\s*(.*)$")
+    SWITCH_FIELDS = re.compile(r"prev_pid=(-?\d+) prev_prio=(-?\d+) prev_state=(\S+) ==> .*"
+                               r"next_pid=(-?\d+) next_prio=(-?\d+)")
+    SWITCH_COMPACT = re.compile(r":(-?\d+) \[(-?\d+)\] (\S+) ==> .*:(-?\d+) \[(-?\d+)\]")
+    WAKEUP_FIELDS = re.compile(r"\bpid=(-?\d+) prio=(-?\d+)")
+    WAKEUP_COMPACT = re.compile(r":(-?\d+) \[(-?\d+)\]")
+
+    def __init__(self, unit=1000, max_pending=None):
+        if unit < 1:
+            raise ValueError("A unidade de tempo deve ser de pelo menos 1 ns")
+        self.unit = unit
+        self.max_pending = max_pending or self.MAX_PENDING
+
+    # Evento de uma linha do trace ou None se a linha não é sched_switch/sched_wakeup
+    #   ("switch", ns, prev_pid, prev_prio, prev_state, next_pid, next_prio)
+    #   ("wakeup", ns, pid, prio)
+    @staticmethod
+    def parse_line(line):
+        match = TraceImporter.EVENT.search(line)
+        if match is None:
+            return None
+        stamp = TraceImporter.TIMESTAMP.search(line, 0, match.start() + 1)
+        if stamp is None:
+            return None
+        seconds, fraction = stamp.groups()
+        ns = int(seconds) * 1000000000 + int(fraction[:9].ljust(9, "0"))
+        name, fields = match.groups()
+        if name == "sched_switch":
+            found = TraceImporter.SWITCH_FIELDS.search(fields) or TraceImporter.SWITCH_COMPACT.search(fields)
+            if found is None:
+                return None
+            prev_pid, prev_prio, state, next_pid, next_prio = found.groups()
+            return ("switch", ns, int(prev_pid), int(prev_prio), state, int(next_pid), int(next_prio))
+        found = TraceImporter.WAKEUP_FIELDS.search(fields) or TraceImporter.WAKEUP_COMPACT.search(fields)
+        if found is None:
+            return None
+        return ("wakeup", ns, int(found.group(1)), int(found.group(2)))
+
+    # Eventos de um iterável de linhas, na ordem
+    @staticmethod
+    def events(lines):
+        parse = TraceImporter.parse_line
+        for line in lines:
+            event = parse(line)
+            if event is not None:
+                yield event
+
+    # Eventos de um arquivo de trace; workers > 1 faz o parsing em blocos num pool de processos
+    @staticmethod
+    def file_events(path, workers=None, chunk_size=None):
+        if not workers or workers <= 1:
+            with open(path, 'r', errors='replace') as file:
+                yield from TraceImporter.events(file)
+            return
+        chunk_size = chunk_size or TraceImporter.CHUNK_SIZE
+        size = os.path.getsize(path)
+        bounds = [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = []
+            for start, end in bounds:
+                pending.append(pool.submit(TraceImporter._parse_chunk, path, start, end))
+                if len(pending) >= 2 * workers:
+                    yield from pending.pop(0).result()
+            for future in pending:
+                yield from future.result()
+
+    # Tarefa do parsing paralelo: as linhas que começam em [start, end)
+    # A linha cortada no início do bloco pertence ao bloco anterior
+    @staticmethod
+    def _parse_chunk(path, start, end):
+        events = []
+        parse = TraceImporter.parse_line
+        with open(path, 'rb') as file:
+            if start > 0:
+                file.seek(start - 1)
+                file.readline() # termina a linha do bloco anterior
+            while file.tell() < end:
+                line = file.readline()
+                if not line:
+                    break
+                event = parse(line.decode('utf-8', 'replace'))
+                if event is not None:
+                    events.append(event)
+        return events
+
+    # Converte os eventos em registros (pid, chegada, execução, prioridade) em ordem de chegada
+    # Os pids seguem a ordem de chegada (P1, P2, ...), como na entrada de texto
+    def records(self, events):
+        self.start = None # primeiro instante do trace (ns)
+        self.open = {} # pid -> trecho aberto [chegada, executado, em execução desde, prioridade, ordem]
+        self.starts = [] # heap (chegada, ordem, pid) dos trechos abertos
+        self.closed = set() # ordens dos trechos fechados ainda no heap starts
+        self.done = [] # heap (chegada, ordem, executado, prioridade) dos trechos terminados
+        self.seq = 0
+        self.count = 0
+        last = None
+        for event in events:
+            ns = event[1]
+            if self.start is None:
+                self.start = ns
+            last = ns
+            if event[0] == "wakeup":
+                _, _, pid, prio = event
+                if pid != 0 and pid not in self.open:
+                    self._begin(pid, ns, prio)
+            else:
+                _, _, prev_pid, prev_prio, state, next_pid, next_prio = event
+                if prev_pid != 0:
+                    job = self.open.get(prev_pid)
+                    runnable = state.startswith("R") or state == "0"
+                    if job is None and runnable:
+                        job = self._begin(prev_pid, ns, prev_prio) # preemptada sem ter acordado no trace
+                    if job is not None:
+                        if job[2] is not None:
+                            job[1] += ns - job[2]
+                            job[2] = None
+                        job[3] = prev_prio
+                        if not runnable:
+                            self._end(prev_pid)
+                if next_pid != 0:
+                    job = self.open.get(next_pid) or self._begin(next_pid, ns, next_prio)
+                    job[2] = ns
+                    job[3] = next_prio
+            yield from self._release()
+            while len(self.done) > self.max_pending:
+                yield from self._cut(ns)
+
+        # fim do trace: fecha os trechos abertos com o que executaram até o último evento
+        for pid in list(self.open):
+            job = self.open[pid]
+            if job[2] is not None:
+                job[1] += last - job[2]
+            self._end(pid)
+        yield from self._release()
+
+    def _begin(self, pid, ns, prio):
+        job = [ns, 0, None, prio, self.seq]
+        self.seq += 1
+        self.open[pid] = job
+        heapq.heappush(self.starts, (ns, job[4], pid))
+        return job
+
+    def _end(self, pid):
+        arrival, run, _, prio, seq = self.open.pop(pid)
+        self.closed.add(seq)
+        if run > 0:
+            heapq.heappush(self.done, (arrival, seq, run, prio))
+
+    # Início do trecho aberto mais antigo (chegada, ordem, pid) ou None
+    def _oldest(self):
+        starts, closed = self.starts, self.closed
+        while starts and starts[0][1] in closed:
+            closed.discard(heapq.heappop(starts)[1]) # trecho já fechado
+        return starts[0] if starts else None
+
+    # Trechos terminados que começaram antes de todos os abertos
+    def _release(self):
+        done = self.done
+        oldest = self._oldest()
+        while done and (oldest is None or done[0][:2] < oldest[:2]):
+            arrival, _, run, prio = heapq.heappop(done)
+            yield self._record(arrival, run, prio)
+
+    # Buffer cheio: corta o trecho aberto mais antigo no instante ns
+    def _cut(self, ns):
+        oldest = self._oldest()[2]
+        job = self.open[oldest]
+        running = job[2] is not None
+        if running:
+            job[1] += ns - job[2]
+        self._end(oldest)
+        job = self._begin(oldest, ns, job[3])
+        if running:
+            job[2] = ns
+        yield from self._release()
+
+    def _record(self, arrival, run, prio):
+        self.count += 1
+        unit = self.unit
+        return (f"P{self.count}", (arrival - self.start + unit // 2) // unit,
+                max(1, (run + unit // 2) // unit), self.MAX_PRIO - prio)
+
+    # Linhas no formato de processos.txt ([chegada] [execução] [prioridade])
+    @staticmethod
+    def lines(records):
+        for _, arrival, burst, priority in records:
+            yield f"{arrival} {burst} {priority}\n"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Converte um trace do escalonador do Linux (perf sched / ftrace "
+                                                 "sched_switch e sched_wakeup) para o formato da carga")
+    parser.add_argument("trace", help="arquivo de texto do trace ('-' lê do stdin)")
+    parser.add_argument("-o", "--output", default=None,
+                        help="arquivo de saída: .pswl grava no formato binário (BinaryWorkload), "
+                             "senão linhas de processos.txt (padrão: stdout)")
+    parser.add_argument("--unit", type=int, default=1000,
+                        help="nanossegundos por unidade de tempo da carga (padrão: 1000 = microssegundos)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processos do parsing paralelo em blocos (padrão: sequencial)")
+    args = parser.parse_args()
+
+    importer = TraceImporter(unit=args.unit)
+    if args.trace == "-":
+        events = TraceImporter.events(sys.stdin)
+    else:
+        events = TraceImporter.file_events(args.trace, workers=args.workers)
+    records = importer.records(events)
+    if args.output and args.output.endswith(".pswl"):
+        count = BinaryWorkload.write(records, args.output)
+        print(f"{count} processos gravados em {args.output}")
+    else:
+        out = open(args.output, 'w') if args.output else sys.stdout
+        try:
+            out.writelines(TraceImporter.lines(records))
+        finally:
+            if out is not sys.stdout:
+                out.close()
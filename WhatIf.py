@@ -0,0 +1,164 @@
+import io
+import pickle
+import random
+from Process import Process
+from Timeline import Timeline
+
+# Re-simulação incremental ("e se?") de uma carga editada (ver Scheduling.run_baseline e
+# Scheduling.run_what_if)
+# A execução de base roda na sessão do SMPEngine (com 1 núcleo decide igual aos motores tick e
+# event) e guarda snapshots leves a cada `every` unidades de tempo simulado. Nada antes da
+# primeira chegada alterada muda, então a carga editada continua do último snapshot antes dela
+# e só o resto é simulado de novo.
+# Um snapshot não copia a carga nem as timelines:
+#  - os processos viram a posição na ordem de chegada (persistent id) e só os que aparecem no
+#    estado do motor (filas, em execução) guardam o estado (restante, início, término,
+#    prioridade dinâmica); os que já terminaram saem do resultado final da base
+#  - cada timeline vira o número de trechos e o último trecho (os anteriores não mudam mais)
+# O resto é o estado do motor (eventos, filas, índice de cargas), o do random e os desempates.
+class Snapshot:
+    __slots__ = ('now', 'admitted', 'data', 'states', 'marks')
+
+    def __init__(self, now, admitted, data, states, marks):
+        self.now = now # último instante processado
+        self.admitted = admitted # processos já admitidos (prefixo da ordem de chegada)
+        self.data = data # pickle do estado do motor e do random
+        self.states = states # posição -> (restante, início, término, prioridade dinâmica)
+        self.marks = marks # por núcleo: (trechos na timeline, último trecho)
+
+    # Tira o snapshot da sessão aberta do engine (SMPEngine)
+    # positions: id(processo) -> posição na ordem de chegada
+    @staticmethod
+    def take(engine, positions, ties):
+        buffer = io.BytesIO()
+        pickler = _SnapshotPickler(buffer, pickle.HIGHEST_PROTOCOL)
+        pickler.positions = positions
+        pickler.timelines = {id(core.timeline): core.id for core in engine.cores}
+        pickler.states = {}
+        state = engine.snapshot()
+        pickler.dump({"engine": state, "random": random.getstate(), "ties": ties})
+        marks = [(len(core.timeline), core.timeline[-1] if len(core.timeline) else None) for core in engine.cores]
+        return Snapshot(state["now"], state["admitted"], buffer.getvalue(), pickler.states, marks)
+
+    # Estado do motor sobre os processos de order (carga editada, com o mesmo prefixo até
+    # admitted) e as timelines da base até o snapshot
+    def load(self, order, baseline, new_timeline):
+        unpickler = _SnapshotUnpickler(io.BytesIO(self.data))
+        unpickler.order = order
+        unpickler.states = self.states
+        unpickler.timelines = [Snapshot._timeline(segments, mark, new_timeline)
+                               for segments, mark in zip(baseline.timelines, self.marks)]
+        return unpickler.load()
+
+    @staticmethod
+    def _timeline(segments, mark, new_timeline):
+        timeline = new_timeline()
+        count, last = mark
+        timeline.extend(segments[:max(count - 1, 0)])
+        if last is not None:
+            timeline.append(last)
+        return timeline
+
+
+class _SnapshotPickler(pickle.Pickler):
+    def persistent_id(self, obj):
+        if isinstance(obj, Process):
+            position = self.positions[id(obj)]
+            self.states[position] = (obj.remaining, obj.start_time, obj.finish_time, obj.dynamic_priority)
+            return ("process", position)
+        if isinstance(obj, Timeline):
+            return ("timeline", self.timelines[id(obj)])
+        return None
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def persistent_load(self, pid):
+        kind, index = pid
+        if kind == "process":
+            p = self.order[index]
+            p.remaining, p.start_time, p.finish_time, p.dynamic_priority = self.states[index]
+            return p
+        if kind == "timeline":
+            return self.timelines[index]
+        raise pickle.UnpicklingError(f"Referência desconhecida no snapshot: {pid}")
+
+
+# Execução de base de um algoritmo com os snapshots (Scheduling.run_baseline)
+class Baseline:
+    def __init__(self, method, params, order, timelines, cs, metrics, snapshots):
+        self.method = method
+        self.params = params # configuração do escalonador (a re-simulação deve usar a mesma)
+        self.records = [(p.pid, p.arrival, p.burst, p.priority) for p in order] # em ordem de chegada
+        self.results = [(p.start_time, p.finish_time, p.dynamic_priority) for p in order]
+        self.timelines = timelines # trechos de cada núcleo (1 nos motores tick e event)
+        self.cs = cs
+        self.metrics = metrics
+        self.snapshots = snapshots # em ordem de tempo
+
+    # Primeira diferença entre a carga da base e order (em ordem de chegada): retorna
+    # (posição, tempo da primeira chegada alterada) ou None se as cargas são iguais
+    def first_change(self, order):
+        for k, (record, p) in enumerate(zip(self.records, order)):
+            if record != (p.pid, p.arrival, p.burst, p.priority):
+                return k, min(record[1], p.arrival)
+        if len(order) != len(self.records):
+            k = min(len(order), len(self.records))
+            return k, order[k].arrival if k < len(order) else self.records[k][1]
+        return None
+
+    # Último snapshot que ainda não viu nenhuma chegada a partir de time (None = desde o início)
+    def before(self, time):
+        chosen = None
+        for snapshot in self.snapshots:
+            if snapshot.now >= time:
+                break
+            chosen = snapshot
+        return chosen
+
+    # Marca os processos que terminaram antes do snapshot e não estão no estado do motor
+    # com o resultado da base
+    def restore_finished(self, order, snapshot):
+        for k in range(snapshot.admitted):
+            if k not in snapshot.states:
+                p = order[k]
+                p.start_time, p.finish_time, p.dynamic_priority = self.results[k]
+                p.remaining = 0
+
+
+# Resultado de Scheduling.run_what_if: a execução da carga editada e a diferença para a base
+#   changed_at: tempo da primeira chegada alterada (None se a carga não mudou)
+#   resumed_from: instante do snapshot de onde a simulação continuou (None = do início)
+#   metrics_diff: {campo: (base, nova, diferença)} para FIELDS
+#   timeline_diff: por núcleo, {"core", "from", "removed", "added"}: os trechos da base e os
+#                  novos entre o prefixo e o sufixo em comum ("from" = início do primeiro diferente)
+class WhatIfResult:
+    FIELDS = ("avg_turnaround", "avg_waiting", "avg_response", "cs", "makespan", "cpu_utilization", "throughput")
+
+    # snapshot: de onde a simulação continuou (None = do início); os trechos antes do último
+    # trecho dele são os mesmos da base e não são comparados
+    def __init__(self, method, procs, timeline, cs, metrics, baseline, changed_at, snapshot, timelines):
+        self.method = method
+        self.procs = procs
+        self.timeline = timeline # Timeline ou, no motor smp, a lista de Core
+        self.cs = cs
+        self.metrics = metrics
+        self.changed_at = changed_at
+        self.resumed_from = snapshot.now if snapshot is not None else None
+        self.metrics_diff = {field: (getattr(baseline.metrics, field), getattr(metrics, field),
+                                     getattr(metrics, field) - getattr(baseline.metrics, field))
+                             for field in self.FIELDS}
+        skip = [max(count - 1, 0) for count, _ in snapshot.marks] if snapshot is not None else [0] * len(timelines)
+        self.timeline_diff = [WhatIfResult._diff(core, old, list(new), lo)
+                              for core, (old, new, lo) in enumerate(zip(baseline.timelines, timelines, skip))]
+
+    @staticmethod
+    def _diff(core, old, new, lo):
+        while lo < len(old) and lo < len(new) and old[lo] == new[lo]:
+            lo += 1
+        old_hi, new_hi = len(old), len(new)
+        while old_hi > lo and new_hi > lo and old[old_hi - 1] == new[new_hi - 1]:
+            old_hi -= 1
+            new_hi -= 1
+        starts = [segments[lo][0] for segments, hi in ((old, old_hi), (new, new_hi)) if lo < hi]
+        start = min(starts) if starts else None
+        return {"core": core, "from": start, "removed": old[lo:old_hi], "added": new[lo:new_hi]}
@@ -0,0 +1,151 @@
+import atexit
+import heapq
+import os
+import tempfile
+from Process import Process
+from utils import Utils
+
+# Cursor sobre os processos em ordem de chegada
+# Substitui a lista ordenada + índice (process_by_arrival[idx]) dos algoritmos:
+# os processos são puxados sob demanda da fonte, então uma carga em streaming
+# nunca fica inteira na memória.
+class ArrivalCursor:
+    def __init__(self, processes):
+        self.iterator = iter(processes)
+        self.idx = 0 # quantos processos já foram admitidos
+        self.head = next(self.iterator, None) # próximo processo a chegar (None se acabou)
+
+    # Retorna o próximo processo e avança o cursor
+    def pop(self):
+        p = self.head
+        self.head = next(self.iterator, None)
+        self.idx += 1
+        return p
+
+    def exhausted(self):
+        return self.head is None
+
+
+# Fila de chegadas da simulação online (Scheduling.submit)
+# Mesma interface do ArrivalCursor, mas os processos são adicionados durante a simulação,
+# em qualquer ordem; saem por tempo de chegada e, entre chegadas iguais, na ordem de envio.
+class ArrivalQueue:
+    def __init__(self):
+        self.heap = [] # (chegada, ordem de envio, processo)
+        self.seq = 0
+        self.idx = 0 # quantos processos já foram admitidos
+
+    @property
+    def head(self):
+        return self.heap[0][2] if self.heap else None
+
+    def push(self, process):
+        heapq.heappush(self.heap, (process.arrival, self.seq, process))
+        self.seq += 1
+
+    def pop(self):
+        self.idx += 1
+        return heapq.heappop(self.heap)[2]
+
+    def exhausted(self):
+        return not self.heap
+
+
+# Carga de trabalho em streaming
+# Os processos ficam num arquivo temporário (um por linha: pid chegada burst prioridade),
+# já em ordem de chegada, e cada iteração relê o arquivo criando Process novos sob demanda.
+# Assim cada algoritmo pode percorrer a carga de novo sem guardá-la inteira na memória.
+class StreamWorkload:
+    CHUNK_SIZE = 1000000 # processos por trecho na ordenação externa
+
+    def __init__(self, path, count):
+        self.path = path # arquivo com os processos em ordem de chegada
+        self.count = count # número de processos
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        with open(self.path, 'r') as file:
+            for line in file:
+                pid, arrival, burst, priority = line.split()
+                yield Process(pid, int(arrival), int(burst), int(priority))
+
+    # Cria a carga a partir de linhas no formato [tempo de chegada] [tempo de execução] [prioridade]
+    # Os PIDs seguem a ordem das linhas (P1, P2, ...), como em Utils.readProcessesStdin
+    # sort_unordered: se a entrada não estiver em ordem de chegada, ordena em disco
+    #                 (ordenação externa por trechos); senão lança ValueError
+    @staticmethod
+    def from_lines(lines, sort_unordered=False, chunk_size=None):
+        chunk_size = chunk_size or StreamWorkload.CHUNK_SIZE
+        path, out = StreamWorkload._spool()
+        runs = None # trechos ordenados (arquivos) quando a entrada está fora de ordem
+        buffer = []
+        last_arrival = None
+        count = 0
+
+        try:
+            for record in Utils.iterProcesses(lines):
+                count += 1
+                if runs is None:
+                    if last_arrival is None or record[1] >= last_arrival:
+                        StreamWorkload._write(out, record)
+                        last_arrival = record[1]
+                        continue
+                    if not sort_unordered:
+                        raise ValueError(f"Entrada fora de ordem de chegada no processo {record[0]} "
+                                         f"(chegada {record[1]} < {last_arrival})")
+                    # o que já foi gravado está ordenado e vira o primeiro trecho
+                    out.close()
+                    runs = [path]
+                buffer.append(record)
+                if len(buffer) >= chunk_size:
+                    runs.append(StreamWorkload._write_run(buffer))
+                    buffer = []
+        finally:
+            out.close()
+
+        if runs is None:
+            return StreamWorkload(path, count)
+
+        if buffer:
+            runs.append(StreamWorkload._write_run(buffer))
+        # junta os trechos ordenados; heapq.merge mantém a ordem de entrada entre chegadas iguais
+        path, out = StreamWorkload._spool()
+        readers = [StreamWorkload._read_run(run) for run in runs]
+        with out:
+            for record in heapq.merge(*readers, key=lambda r: r[1]):
+                StreamWorkload._write(out, record)
+        for run in runs:
+            os.remove(run)
+        return StreamWorkload(path, count)
+
+    # Cria um arquivo temporário removido ao final do programa
+    @staticmethod
+    def _spool():
+        fd, path = tempfile.mkstemp(prefix="workload-", suffix=".txt")
+        owner = os.getpid()
+        # só o processo que criou o arquivo remove (não os processos filhos do modo paralelo)
+        atexit.register(lambda: os.getpid() == owner and os.path.exists(path) and os.remove(path))
+        return path, os.fdopen(fd, 'w')
+
+    @staticmethod
+    def _write(out, record):
+        out.write(f"{record[0]} {record[1]} {record[2]} {record[3]}\n")
+
+    # Ordena um trecho na memória (sort estável) e grava em um arquivo temporário
+    @staticmethod
+    def _write_run(buffer):
+        buffer.sort(key=lambda r: r[1])
+        path, out = StreamWorkload._spool()
+        with out:
+            for record in buffer:
+                StreamWorkload._write(out, record)
+        return path
+
+    @staticmethod
+    def _read_run(path):
+        with open(path, 'r') as file:
+            for line in file:
+                pid, arrival, burst, priority = line.split()
+                yield (pid, int(arrival), int(burst), int(priority))
@@ -0,0 +1,107 @@
+import argparse
+import math
+import random
+import sys
+from ProcessTable import ProcessTable
+
+# Gerador de cargas sintéticas reproduzíveis (semente própria, não usa o random global)
+# arrival: "poisson" (intervalos exponenciais) ou "bursty" (rajadas de chegadas quase juntas)
+# burst: "exponential" ou "pareto" (cauda pesada, alpha > 1)
+# mean_burst: média do tempo de execução
+# load: utilização média da CPU (taxa de chegada = load / mean_burst), se rate não for dado
+# priorities: prioridades sorteadas uniformemente entre 1 e priorities
+# Gera tuplas (pid, chegada, execução, prioridade) em ordem de chegada, com tempos inteiros
+class WorkloadGenerator:
+    ARRIVALS = ("poisson", "bursty")
+    BURSTS = ("exponential", "pareto")
+
+    def __init__(self, seed=None, arrival="poisson", burst="exponential", mean_burst=10.0,
+                 load=0.9, rate=None, alpha=1.5, cluster_size=20, priorities=5):
+        if arrival not in self.ARRIVALS:
+            raise ValueError(f"Distribuição de chegada desconhecida: {arrival}")
+        if burst not in self.BURSTS:
+            raise ValueError(f"Distribuição de execução desconhecida: {burst}")
+        if burst == "pareto" and alpha <= 1:
+            raise ValueError("A distribuição de Pareto precisa de alpha > 1 para ter média finita")
+        self.seed = seed
+        self.arrival = arrival
+        self.burst = burst
+        self.mean_burst = mean_burst
+        self.rate = rate if rate is not None else load / mean_burst # chegadas por unidade de tempo
+        self.alpha = alpha # forma da Pareto
+        self.cluster_size = cluster_size # tamanho médio das rajadas (bursty)
+        self.priorities = priorities
+
+    # Gera n processos sob demanda
+    def generate(self, n):
+        rng = random.Random(self.seed)
+        arrivals = self._arrivals(rng)
+        for i in range(n):
+            yield (f"P{i + 1}", next(arrivals), self._burst(rng), rng.randint(1, self.priorities))
+
+    def _arrivals(self, rng):
+        time = 0.0
+        if self.arrival == "poisson":
+            while True:
+                yield int(time)
+                time += rng.expovariate(self.rate)
+        else:
+            # rajadas: o início de cada rajada é Poisson (taxa / tamanho médio, mantendo a taxa média)
+            # e os processos da rajada chegam com intervalos de média 1
+            p = 1 / self.cluster_size
+            while True:
+                size = 1 + int(math.log(1 - rng.random()) / math.log(1 - p)) if p < 1 else 1 # geométrica
+                jitter = time
+                for _ in range(size):
+                    yield int(jitter)
+                    jitter += rng.expovariate(1.0)
+                time = max(time + rng.expovariate(self.rate / self.cluster_size), jitter)
+
+    def _burst(self, rng):
+        if self.burst == "exponential":
+            value = rng.expovariate(1 / self.mean_burst)
+        else:
+            scale = self.mean_burst * (self.alpha - 1) / self.alpha # média = scale * alpha / (alpha - 1)
+            value = scale * rng.paretovariate(self.alpha)
+        return max(1, math.ceil(value))
+
+    # Escreve n processos no formato de entrada ([tempo de chegada] [tempo de execução] [prioridade])
+    def write(self, n, file):
+        batch = []
+        for _, arrival, burst, priority in self.generate(n):
+            batch.append(f"{arrival} {burst} {priority}\n")
+            if len(batch) >= 4096:
+                file.write(''.join(batch))
+                batch = []
+        file.write(''.join(batch))
+
+    # Gera n processos direto numa ProcessTable
+    def table(self, n):
+        return ProcessTable.from_records(self.generate(n))
+
+    # Argumentos de linha de comando do gerador (usados também pelo benchmark)
+    @staticmethod
+    def add_arguments(parser):
+        parser.add_argument("--gen-seed", type=int, default=1, help="semente do gerador")
+        parser.add_argument("--arrival", choices=WorkloadGenerator.ARRIVALS, default="poisson")
+        parser.add_argument("--burst", choices=WorkloadGenerator.BURSTS, default="exponential")
+        parser.add_argument("--mean-burst", type=float, default=10.0)
+        parser.add_argument("--load", type=float, default=0.9, help="utilização média da CPU")
+        parser.add_argument("--alpha", type=float, default=1.5, help="forma da Pareto (cauda pesada)")
+        parser.add_argument("--cluster-size", type=float, default=20, help="tamanho médio das rajadas")
+        parser.add_argument("--priorities", type=int, default=5, help="prioridades entre 1 e N")
+
+    @staticmethod
+    def from_args(args):
+        return WorkloadGenerator(seed=args.gen_seed, arrival=args.arrival, burst=args.burst,
+                                 mean_burst=args.mean_burst, load=args.load, alpha=args.alpha,
+                                 cluster_size=args.cluster_size, priorities=args.priorities)
+
+
+# Ex: python WorkloadGenerator.py -n 100000 --burst pareto > carga.txt
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera uma carga sintética no formato de processos.txt")
+    parser.add_argument("-n", type=int, default=1000, help="número de processos")
+    WorkloadGenerator.add_arguments(parser)
+    args = parser.parse_args()
+    WorkloadGenerator.from_args(args).write(args.n, sys.stdout)
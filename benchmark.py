@@ -0,0 +1,157 @@
+from concurrent.futures import ProcessPoolExecutor
+from Scheduling import Scheduling
+from Process import Process
+from Metrics import Metrics
+from WorkloadGenerator import WorkloadGenerator
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# Benchmark dos algoritmos sobre cargas sintéticas (WorkloadGenerator)
+# Cada medição roda num processo novo, então a memória de uma não contamina a outra.
+# Resultados em JSON lines (um objeto por algoritmo e tamanho), para comparar versões:
+#   python benchmark.py --output antes.jsonl
+#   (muda o código)
+#   python benchmark.py --output depois.jsonl
+#   python benchmark.py --compare antes.jsonl depois.jsonl
+
+SIZES = [100, 1000, 10000, 100000, 1000000]
+
+def parseArgs():
+    parser = argparse.ArgumentParser(description="Benchmark dos algoritmos de escalonamento")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)),
+                        help="números de processos, separados por vírgula")
+    parser.add_argument("--algorithms", default=None,
+                        help="métodos separados por vírgula (padrão: todos)")
+    parser.add_argument("--engine", choices=Scheduling.ENGINES, default="event")
+    parser.add_argument("--table", action="store_true", help="carga numa ProcessTable em vez de Process")
+    parser.add_argument("--quantum", type=int, default=2)
+    parser.add_argument("--aging", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=1, help="semente do desempate aleatório")
+    parser.add_argument("--max-seconds", type=float, default=60,
+                        help="pula os tamanhos maiores de um algoritmo quando a estimativa passa disso")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="não mede o pico de memória com tracemalloc (segunda execução)")
+    parser.add_argument("--output", default=None, help="arquivo JSON lines (padrão: stdout)")
+    parser.add_argument("--label", default=None, help="rótulo da versão (padrão: commit do git)")
+    parser.add_argument("--compare", nargs=2, metavar=("ANTES", "DEPOIS"), default=None,
+                        help="compara dois arquivos de resultados em vez de medir")
+    WorkloadGenerator.add_arguments(parser)
+    return parser.parse_args()
+
+# Uma medição (roda no processo filho): gera a carga, executa o algoritmo cronometrado
+# e, opcionalmente, executa de novo com tracemalloc para o pico de memória
+def measure(args, method, n):
+    generator = WorkloadGenerator.from_args(args)
+    scheduling = Scheduling(quantum=args.quantum, aging=args.aging, engine=args.engine, seed=args.seed)
+    if args.table:
+        scheduling.set_table(generator.table(n))
+    else:
+        for record in generator.generate(n):
+            scheduling.add_process(Process(*record))
+    workload_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    procs, timeline, cs = scheduling.run_algorithm(method)
+    wall = time.perf_counter() - start
+    # cada trecho da timeline é uma decisão de despacho (no motor smp, somando os núcleos)
+    if args.engine == "smp":
+        decisions = sum(len(core.timeline) for core in timeline)
+    else:
+        decisions = len(timeline)
+    if args.table:
+        metrics = Metrics.from_run_state(procs, cs)
+    else:
+        metrics = Metrics.from_processes(procs, cs)
+    result = {
+        "wall_s": wall,
+        "decisions": decisions,
+        "per_decision_us": wall / decisions * 1e6 if decisions else 0,
+        "workload_rss_kb": workload_rss,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "cs": cs,
+        "avg_turnaround": metrics.avg_turnaround,
+        "avg_waiting": metrics.avg_waiting,
+    }
+    del procs, timeline
+
+    if not args.no_memory:
+        tracemalloc.start()
+        scheduling.run_algorithm(method)
+        result["peak_traced_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+    return result
+
+def gitLabel():
+    # commit do repositório do benchmark, não da pasta de onde ele foi chamado
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(args):
+    sizes = [int(float(s)) for s in args.sizes.split(",")]
+    methods = args.algorithms.split(",") if args.algorithms else [m for _, m in Scheduling.ALGORITHMS]
+    common = {
+        "label": args.label or gitLabel(),
+        "python": platform.python_version(),
+        "engine": args.engine,
+        "mode": "table" if args.table else "list",
+        "quantum": args.quantum, "aging": args.aging, "seed": args.seed,
+        "workload": {"seed": args.gen_seed, "arrival": args.arrival, "burst": args.burst,
+                     "mean_burst": args.mean_burst, "load": args.load, "alpha": args.alpha,
+                     "cluster_size": args.cluster_size, "priorities": args.priorities},
+    }
+    out = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        for method in methods:
+            estimate = 0 # segundos por processo da última medição
+            for n in sorted(sizes):
+                record = dict(common, algorithm=method, n=n)
+                if estimate * n > args.max_seconds:
+                    record["skipped"] = True
+                else:
+                    # um processo novo por medição (max_tasks_per_child=1)
+                    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as pool:
+                        record.update(pool.submit(measure, args, method, n).result())
+                    estimate = record["wall_s"] / n
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+                if args.output:
+                    status = "pulado" if record.get("skipped") else f"{record['wall_s']:.3f}s"
+                    print(f"{method:<24} n={n:<8} {status}")
+    finally:
+        if args.output:
+            out.close()
+
+# Tabela com o tempo antes/depois de cada algoritmo e tamanho
+def compare(before_path, after_path):
+    def load(path):
+        with open(path) as file:
+            records = (json.loads(line) for line in file if line.strip())
+            return {(r["algorithm"], r["n"]): r for r in records if not r.get("skipped")}
+
+    before, after = load(before_path), load(after_path)
+    print(f"{'Algoritmo':<24} {'n':>8} {'antes (s)':>10} {'depois (s)':>10} {'speedup':>8}")
+    for key in sorted(before.keys() & after.keys(), key=lambda k: (k[0], k[1])):
+        old, new = before[key]["wall_s"], after[key]["wall_s"]
+        speedup = old / new if new > 0 else float("inf")
+        print(f"{key[0]:<24} {key[1]:>8} {old:>10.3f} {new:>10.3f} {speedup:>7.2f}x")
+
+def main():
+    args = parseArgs()
+    if args.compare:
+        compare(*args.compare)
+    else:
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,277 @@
 from utils import Utils
 from Scheduling import Scheduling
 from Process import Process
+from Workload import StreamWorkload
+from ProcessTable import ProcessTable
+from BinaryWorkload import BinaryWorkload
+from ResultCache import ResultCache
+from SMPEngine import SMPEngine
+from Profiler import Profiler
+from TraceImporter import TraceImporter
+import argparse
 import sys
 
+def parseArgs():
+    parser = argparse.ArgumentParser(description="Simulador de escalonamento de processos")
+    parser.add_argument("--engine", choices=Scheduling.ENGINES, default="tick",
+                        help="motor de simulação: tick (de 1 em 1) ou event (salta entre eventos)")
+    parser.add_argument("--cores", type=int, default=None,
+                        help="simula uma máquina com N núcleos, cada um com a sua fila de prontos (motor smp)")
+    parser.add_argument("--placement", choices=SMPEngine.PLACEMENTS, default="least-loaded",
+                        help="distribuição dos processos entre os núcleos")
+    parser.add_argument("--no-steal", action="store_true",
+                        help="desliga o roubo de trabalho entre os núcleos")
+    parser.add_argument("--no-fast-path", action="store_true",
+                        help="simula FCFS, SJF e Prioridade sem preempção no motor em vez do caminho rápido por términos")
+    parser.add_argument("--compact-timeline", action="store_true",
+                        help="guarda a timeline em arrays de inteiros")
+    parser.add_argument("--stream", action="store_true",
+                        help="lê os processos em streaming (a carga não fica inteira na memória)")
+    parser.add_argument("--sort-input", action="store_true",
+                        help="no modo streaming, ordena em disco a entrada fora de ordem de chegada")
+    parser.add_argument("--workload", default=None,
+                        help="lê a carga de um arquivo binário (ver BinaryWorkload.py) em vez do stdin; "
+                             "com --stream percorre o arquivo em streaming, senão usa a tabela em colunas")
+    parser.add_argument("--trace", default=None,
+                        help="lê a carga de um trace do escalonador do Linux (texto de perf sched / ftrace com "
+                             "sched_switch e sched_wakeup) em vez do stdin, convertendo durante a leitura")
+    parser.add_argument("--trace-unit", type=int, default=1000,
+                        help="nanossegundos por unidade de tempo da carga lida de --trace (padrão: microssegundos)")
+    parser.add_argument("--trace-workers", type=int, default=None,
+                        help="processos do parsing paralelo em blocos de --trace (padrão: sequencial)")
+    parser.add_argument("--summary", action="store_true",
+                        help="modo resumo: não guarda nem imprime a timeline; acumula as métricas conforme os "
+                             "processos terminam (percentis aproximados, memória constante com --stream)")
+    parser.add_argument("--table", action="store_true",
+                        help="guarda os processos numa tabela em colunas (menos memória por processo)")
+    parser.add_argument("--export", default=None,
+                        help="exporta a timeline de cada algoritmo; {algorithm} vira o nome do método "
+                             "e a extensão define o formato: .csv, .jsonl ou .bin (+ .gz para gzip)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="semente do desempate aleatório (reiniciada antes de cada algoritmo)")
+    parser.add_argument("--parallel", action="store_true",
+                        help="executa os algoritmos em paralelo, um processo por algoritmo")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="número de processos no modo paralelo (padrão: número de CPUs)")
+    parser.add_argument("--shard", action="store_true",
+                        help="divide a carga nos períodos ocupados (CPU ociosa sem nenhum pronto) e simula "
+                             "cada algoritmo com as fatias em paralelo (--workers processos); desliga --parallel. "
+                             "Com --seed, as fatias com desempates aleatórios são simuladas de novo em série "
+                             "para dar o mesmo resultado da execução sem --shard")
+    parser.add_argument("--cache-dir", default=".cache",
+                        help="pasta do cache de resultados (usado só com --seed)")
+    parser.add_argument("--cache-size", type=int, default=256,
+                        help="tamanho máximo do cache em MB (remove os resultados usados há mais tempo)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="ignora o cache e simula tudo de novo")
+    parser.add_argument("--checkpoint", default=None,
+                        help="grava checkpoints da simulação de cada algoritmo ({algorithm} vira o nome do método)")
+    parser.add_argument("--checkpoint-every", type=float, default=60.0,
+                        help="segundos entre os checkpoints")
+    parser.add_argument("--resume", action="store_true",
+                        help="continua dos checkpoints de --checkpoint (a carga e a configuração devem ser as mesmas). "
+                             "Os checkpoints são pickle: carregar um arquivo executa código, então só continue "
+                             "de checkpoints gravados por você")
+    parser.add_argument("--profile", action="store_true",
+                        help="conta as operações das filas, desempates, ticks ociosos e envelhecimentos e mede "
+                             "o tempo de cada fase por algoritmo (desliga --parallel)")
+    parser.add_argument("--profile-output", default=None,
+                        help="grava o perfil de --profile em JSON")
+    parser.add_argument("--cprofile", default=None,
+                        help="executa os algoritmos sob o cProfile e grava as estatísticas (pstats) no arquivo")
+    parser.add_argument("--replications", type=int, default=None,
+                        help="replicação de Monte Carlo: executa cada algoritmo N vezes com sementes "
+                             "independentes (derivadas de --seed) e mostra médias e intervalos de confiança")
+    parser.add_argument("--confidence", type=float, default=0.95,
+                        help="nível de confiança dos intervalos da replicação")
+    parser.add_argument("--what-if", default=None,
+                        help="re-simulação incremental: roda cada algoritmo na carga do stdin guardando snapshots, "
+                             "continua do último snapshot antes da primeira mudança na carga editada deste arquivo "
+                             "(mesmo formato) e mostra a diferença das métricas e da timeline")
+    parser.add_argument("--what-if-every", type=int, default=None,
+                        help="unidades de tempo simulado entre os snapshots de --what-if (padrão: 1/64 do intervalo das chegadas)")
+    parser.add_argument("--sweep-quantum", default=None,
+                        help="varredura: valores de quantum (ex: 1,2,4 ou 1:8 ou 1:16:3)")
+    parser.add_argument("--sweep-aging", default=None,
+                        help="varredura: valores de aging (mesmo formato de --sweep-quantum)")
+    return parser.parse_args()
+
 def main():
-    
+    args = parseArgs()
+
     print("Iniciando o simulador")
     quantum, aging = Utils.readConfig()
     print(f"Quantum: {quantum}, Aging: {aging}")
-    
-    processes = Utils.readProcessesStdin()
-    if not processes:
-        print("Nenhum processo lido. Forneça processos no stdin no formato: [tempo de chegada] [tempo de execução] [prioridade]")
+
+    engine = "smp" if args.cores else args.engine
+    scheduling = Scheduling(quantum=quantum, aging=aging, engine=engine,
+                            compact_timeline=args.compact_timeline, seed=args.seed,
+                            cores=args.cores or 1, placement=args.placement, steal=not args.no_steal)
+    scheduling.fast_path = not args.no_fast_path
+    if args.summary:
+        if args.export or args.shard:
+            print("--summary não funciona com --export nem --shard (não há timeline)")
+            sys.exit(1)
+        scheduling.set_summary()
+
+    if args.trace:
+        if args.workload:
+            print("--trace não funciona com --workload")
+            sys.exit(1)
+        # os eventos viram processos em ordem de chegada conforme o trace é lido
+        try:
+            records = TraceImporter(unit=args.trace_unit).records(
+                TraceImporter.file_events(args.trace, workers=args.trace_workers))
+            if args.stream:
+                workload = StreamWorkload.from_lines(TraceImporter.lines(records))
+                count = len(workload)
+                scheduling.set_workload(workload)
+            elif args.table:
+                table = ProcessTable.from_records(records)
+                count = len(table)
+                scheduling.set_table(table)
+            else:
+                count = 0
+                for record in records:
+                    scheduling.add_process(Process(*record))
+                    count += 1
+        except (OSError, ValueError) as e:
+            print(e)
+            sys.exit(1)
+        if not count:
+            print(f"Nenhum processo no trace {args.trace} (são usados os eventos sched_switch e sched_wakeup)")
+            sys.exit(1)
+        print(f"  {count} processos lidos do trace {args.trace}")
+    elif args.workload:
+        # colunas mapeadas do arquivo (mmap), sem ler nem converter a carga
+        try:
+            workload = BinaryWorkload(args.workload)
+        except (OSError, ValueError) as e:
+            print(e)
+            sys.exit(1)
+        if not len(workload):
+            print("Nenhum processo no arquivo de carga.")
+            sys.exit(1)
+        print(f"  {len(workload)} processos mapeados de {args.workload}")
+        if args.stream:
+            scheduling.set_workload(workload)
+        else:
+            scheduling.set_table(workload.table())
+    elif args.stream:
+        # guarda a entrada em disco (em ordem de chegada) e os algoritmos a leem sob demanda
+        try:
+            workload = StreamWorkload.from_lines(sys.stdin, sort_unordered=args.sort_input)
+        except ValueError as e:
+            print(f"{e}. Use --sort-input para ordenar a entrada.")
+            sys.exit(1)
+        if not len(workload):
+            print("Nenhum processo lido. Forneça processos no stdin no formato: [tempo de chegada] [tempo de execução] [prioridade]")
+            sys.exit(1)
+        print(f"  {len(workload)} processos lidos em streaming")
+        scheduling.set_workload(workload)
+    elif args.table:
+        table = ProcessTable.from_records(Utils.iterProcesses(sys.stdin))
+        if not len(table):
+            print("Nenhum processo lido. Forneça processos no stdin no formato: [tempo de chegada] [tempo de execução] [prioridade]")
+            sys.exit(1)
+        print(f"  {len(table)} processos lidos na tabela")
+        scheduling.set_table(table)
+    else:
+        processes = Utils.readProcessesStdin()
+        if not processes:
+            print("Nenhum processo lido. Forneça processos no stdin no formato: [tempo de chegada] [tempo de execução] [prioridade]")
+            sys.exit(1)
+        for proc in processes:
+            print(f"  {proc}")
+
+        for proc in processes: # adiciona os processos no escalonador
+            scheduling.add_process(Process(proc[0], proc[1], proc[2], proc[3]))
+
+    if args.sweep_quantum or args.sweep_aging:
+        # varredura de RoundRobin e RoundRobinPriorityAging (o que não for dado vem do config)
+        try:
+            quantums = Utils.parseGrid(args.sweep_quantum) if args.sweep_quantum else [quantum]
+            agings = Utils.parseGrid(args.sweep_aging) if args.sweep_aging else [aging]
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+        print(f"Varredura: quantum {quantums}, aging {agings}\n")
+        Utils.printSweep(scheduling.run_sweep(quantums, agings, workers=args.workers))
+        return
+
+    if args.replications:
+        print(f"Replicações: {args.replications}, confiança {args.confidence:.0%}\n")
+        results = scheduling.run_replications(args.replications, workers=args.workers,
+                                              base_seed=args.seed or 0, confidence=args.confidence)
+        Utils.printReplications(results)
+        return
+
+    if args.what_if:
+        if args.stream or args.table or args.workload:
+            print("--what-if só funciona com a lista de processos (sem --stream, --table e --workload)")
+            sys.exit(1)
+        with open(args.what_if) as file:
+            edited = [Process(*proc) for proc in Utils.iterProcesses(file)]
+        for name, method in Scheduling.ALGORITHMS:
+            print("=" * 80)
+            print(f"E se: {name}\n")
+            baseline = scheduling.run_baseline(method, every=args.what_if_every)
+            Utils.printWhatIf(scheduling.run_what_if(baseline, edited))
+            print("\n" + "-" * 80 + "\n")
+        return
+
+    if args.seed is not None and not args.no_cache:
+        scheduling.set_cache(ResultCache(args.cache_dir, args.cache_size * 1024 * 1024))
+
+    if args.checkpoint:
+        checkpoint = args.checkpoint
+        if "{algorithm}" not in checkpoint:
+            checkpoint = Utils.suffixPath(checkpoint, "-{algorithm}", default_ext=".ckpt")
+        scheduling.set_checkpoint(checkpoint, every=args.checkpoint_every, resume=args.resume)
+    elif args.resume:
+        print("--resume precisa de --checkpoint")
         sys.exit(1)
-    for proc in processes:
-        print(f"  {proc}")
-    
-    scheduling = Scheduling(quantum=quantum, aging=aging)
 
-    for proc in processes: # adiciona os processos no escalonador
-        scheduling.add_process(Process(proc[0], proc[1], proc[2], proc[3]))
+    parallel = args.parallel
+    if args.shard:
+        if engine == "smp" or args.stream or args.checkpoint:
+            print("--shard não funciona com --cores, --stream nem --checkpoint")
+            sys.exit(1)
+        scheduling.set_sharding(workers=args.workers)
+        parallel = False # as fatias já usam o pool
 
     # Executa os algoritmos de escalonamento
-    scheduling.run_all_algorithms()
+    export = args.export
+    if export and "{algorithm}" not in export:
+        # sem o marcador, acrescenta o nome do método antes da extensão
+        export = Utils.suffixPath(export, "-{algorithm}")
+    if export and engine == "smp" and "{core}" not in export:
+        export = Utils.suffixPath(export, "-core{core}")
+    profiler = None
+    if args.profile or args.profile_output or args.cprofile:
+        parallel = False # os processos do pool não seriam instrumentados
+        if args.profile or args.profile_output:
+            profiler = Profiler()
+            profiler.install()
+
+    def run():
+        scheduling.run_all_algorithms(parallel=parallel, workers=args.workers, export=export)
+
+    try:
+        if args.cprofile:
+            Profiler.cprofile(run, args.cprofile)
+        else:
+            run()
+    finally:
+        if profiler is not None:
+            profiler.uninstall()
+    if profiler is not None:
+        print("=" * 80)
+        print("Perfil\n")
+        Utils.printProfile(profiler.as_dict())
+        if args.profile_output:
+            profiler.dump(args.profile_output)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,96 @@
+import pickle
+import random
+import pytest
+import BinaryWorkload as binary_workload
+from BinaryWorkload import BinaryWorkload
+from Process import Process
+from ProcessTable import ProcessTable
+from Scheduling import Scheduling
+from utils import Utils
+
+# Carga binária (PSWL): a conversão da entrada de texto, aberta por mmap, dá a mesma tabela de
+# processos da entrada de texto, com e sem NumPy, e os arquivos inválidos são recusados
+
+
+def lines(sort):
+    rng = random.Random(5)
+    rows = [(rng.randint(-10, 10**12 if i == 3 else 500), rng.randint(1, 20), rng.randint(-3, 9)) for i in range(300)]
+    if sort:
+        rows.sort(key=lambda row: row[0])
+    return [f"{a} {b} {p}\n" for a, b, p in rows] + ["linha inválida\n", "\n"]
+
+
+def rows(table):
+    return [(table.pid(i), int(table.arrival[i]), int(table.burst[i]), int(table.priority[i]))
+            for i in range(len(table))]
+
+
+@pytest.fixture(params=["numpy", "memoryview"])
+def numpy_mode(request, monkeypatch):
+    if request.param == "numpy" and binary_workload.np is None:
+        pytest.skip("NumPy não instalado")
+    if request.param == "memoryview":
+        monkeypatch.setattr(binary_workload, "np", None)
+    monkeypatch.setattr(BinaryWorkload, "CHUNK", 64) # vários blocos na conversão e na iteração
+    return request.param
+
+
+@pytest.mark.parametrize("sort", [False, True])
+def test_converted_table_equals_text_workload(tmp_path, numpy_mode, sort):
+    text = lines(sort)
+    path = str(tmp_path / "carga.pswl")
+    assert BinaryWorkload.convert(text, path) == 300
+    assert BinaryWorkload.is_binary(path)
+    workload = BinaryWorkload(path)
+    assert workload.sorted == sort
+    expected = ProcessTable.from_records(Utils.iterProcesses(text))
+    table = workload.table()
+    assert rows(table) == rows(expected)
+    assert list(table.arrival_order()) == list(expected.arrival_order())
+    # streaming: processos em ordem de chegada
+    streamed = [(p.pid, p.arrival, p.burst, p.priority) for p in workload]
+    assert streamed == [rows(expected)[i] for i in expected.arrival_order()]
+    # pickle (modo paralelo) leva só o caminho e mapeia de novo
+    assert rows(pickle.loads(pickle.dumps(table))) == rows(expected)
+
+
+def test_simulation_on_binary_table_equals_text(tmp_path):
+    text = lines(False)[:40]
+    path = str(tmp_path / "carga.pswl")
+    BinaryWorkload.convert(text, path)
+    for method in ("SRTF", "RoundRobinPriorityAging"):
+        results = []
+        for source in ("binary", "text"):
+            scheduling = Scheduling(quantum=2, aging=1, engine="event", seed=1)
+            if source == "binary":
+                scheduling.set_table(BinaryWorkload(path).table())
+            else:
+                for record in Utils.iterProcesses(text):
+                    scheduling.add_process(Process(*record))
+            procs, timeline, cs = scheduling.run_algorithm(method)
+            results.append((list(timeline), cs, sorted((p.pid, p.start_time, p.finish_time) for p in procs)))
+        assert results[0] == results[1], method
+
+
+def test_empty_workload(tmp_path, numpy_mode):
+    path = str(tmp_path / "vazia.pswl")
+    assert BinaryWorkload.convert([], path) == 0
+    workload = BinaryWorkload(path)
+    assert len(workload) == 0 and list(workload) == [] and len(workload.table()) == 0
+
+
+def test_invalid_files_are_rejected(tmp_path):
+    path = str(tmp_path / "carga.pswl")
+    BinaryWorkload.convert(lines(True)[:10], path)
+    with open(path, 'rb') as file:
+        data = file.read()
+    bad = tmp_path / "ruim.pswl"
+    cases = [(b"XXXX" + data[4:], "inválido"), (data[:10], "inválido"),
+             (data[:4] + bytes([BinaryWorkload.VERSION + 1]) + data[5:], "Versão"),
+             (data[:-8], "truncado")]
+    for content, message in cases:
+        bad.write_bytes(content)
+        with pytest.raises(ValueError, match=message):
+            BinaryWorkload(str(bad))
+    bad.write_bytes(b"0 5 1\n")
+    assert not BinaryWorkload.is_binary(str(bad))
@@ -0,0 +1,179 @@
+import os
+import random
+import shutil
+import pytest
+from Checkpoint import Checkpoint
+from Process import Process
+from ProcessTable import ProcessTable
+from Scheduling import Scheduling
+from Workload import StreamWorkload
+from utils import Utils
+
+# Teste diferencial: cada motor e modo de execução tem que reproduzir exatamente a simulação
+# por ticks (Scheduling._run sem o caminho rápido) em cargas aleatórias com semente, com
+# chegadas negativas e quantum 0, nos 7 algoritmos: mesma timeline, trocas de contexto,
+# início, término e prioridade dinâmica de cada processo e o random no mesmo estado no final.
+
+ALGORITHMS = [method for _, method in Scheduling.ALGORITHMS]
+TRIALS = 25
+
+
+def workloads():
+    for trial in range(TRIALS):
+        rng = random.Random(trial)
+        n = rng.randint(1, 30)
+        spec = [(f"P{i + 1}", rng.randint(-5, 60), rng.randint(1, 6), rng.randint(0, 4)) for i in range(n)]
+        quantum = 0 if trial % 4 == 0 else rng.randint(1, 4)
+        yield trial, spec, quantum, rng.randint(0, 3)
+
+
+def scheduler(spec, quantum, aging, seed, engine="tick", mode="list", **options):
+    scheduling = Scheduling(quantum=quantum, aging=aging, engine=engine, seed=seed, **options)
+    if mode == "table":
+        scheduling.set_table(ProcessTable.from_records(spec))
+    elif mode == "stream":
+        ordered = sorted(spec, key=lambda record: record[1])
+        scheduling.set_workload(StreamWorkload.from_lines(f"{a} {b} {p}" for _, a, b, p in ordered))
+    else:
+        for record in spec:
+            scheduling.add_process(Process(*record))
+    return scheduling
+
+
+# Resultado comparável de uma execução: (trechos, cs, processos, próximo random)
+def outcome(procs, timeline, cs):
+    if isinstance(timeline, list): # motor smp: lista de núcleos
+        timeline = timeline[0].timeline
+    processes = sorted((p.pid, p.start_time, p.finish_time, p.dynamic_priority) for p in procs)
+    return list(timeline), cs, processes, random.random()
+
+
+def reference(spec, quantum, aging, seed, method):
+    scheduling = scheduler(spec, quantum, aging, seed)
+    scheduling.fast_path = False
+    return outcome(*scheduling._run(method))
+
+
+def run_engine(engine, fast_path=True, mode="list"):
+    def run(spec, quantum, aging, seed, method):
+        scheduling = scheduler(spec, quantum, aging, seed, engine=engine, mode=mode)
+        scheduling.fast_path = fast_path
+        return outcome(*scheduling.run_algorithm(method))
+    return run
+
+
+def run_smp(spec, quantum, aging, seed, method):
+    scheduling = scheduler(spec, quantum, aging, seed, engine="smp", cores=1)
+    return outcome(*scheduling.run_algorithm(method))
+
+
+def run_sharded(spec, quantum, aging, seed, method, monkeypatch):
+    monkeypatch.setattr(Scheduling, "SHARD_MIN", 1)
+    scheduling = scheduler(spec, quantum, aging, seed, engine="event")
+    scheduling.set_sharding(workers=2)
+    return outcome(*scheduling.run_algorithm(method))
+
+
+def run_what_if(spec, quantum, aging, seed, method):
+    # base com a carga sem o último processo, re-simulada com a carga inteira
+    scheduling = scheduler(spec[:-1] or spec, quantum, aging, seed, engine="event")
+    baseline = scheduling.run_baseline(method, every=3)
+    processes = [Process(*record) for record in spec]
+    result = scheduling.run_what_if(baseline, processes)
+    return outcome(processes, result.timeline, result.cs)
+
+
+MODES = {
+    "event": run_engine("event", fast_path=False),
+    "tick-fast": run_engine("tick"),
+    "event-fast": run_engine("event"),
+    "tick-table": run_engine("tick", fast_path=False, mode="table"),
+    "event-table": run_engine("event", mode="table"),
+    "smp-1": run_smp,
+    "what-if": run_what_if,
+}
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_matches_tick_simulation(mode):
+    for trial, spec, quantum, aging in workloads():
+        for method in ALGORITHMS:
+            expected = reference(spec, quantum, aging, trial, method)
+            assert MODES[mode](spec, quantum, aging, trial, method) == expected, (trial, method, quantum, aging)
+
+
+def test_sharded_matches_tick_simulation(monkeypatch):
+    for trial, spec, quantum, aging in workloads():
+        for method in ALGORITHMS:
+            expected = reference(spec, quantum, aging, trial, method)
+            got = run_sharded(spec, quantum, aging, trial, method, monkeypatch)
+            assert got == expected, (trial, method, quantum, aging)
+
+
+# Fatias com desempates de fato: 8 períodos ocupados de 6 processos iguais chegando juntos
+def test_sharded_with_ties_matches_serial(monkeypatch):
+    spec = [(f"P{6 * k + i + 1}", 100 * k, 3, k % 2) for k in range(8) for i in range(6)]
+    for seed in range(3):
+        for method in ALGORITHMS:
+            expected = reference(spec, 2, 1, seed, method)
+            serial = scheduler(spec, 2, 1, seed, engine="event")
+            assert outcome(*serial.run_algorithm(method)) == expected, (seed, method)
+            Utils.ties = 0
+            assert run_sharded(spec, 2, 1, seed, method, monkeypatch) == expected, (seed, method)
+            assert Utils.ties > 0 or method == "RoundRobin", method # RR não sorteia
+
+
+# Checkpoint: a execução com checkpoints e a continuação de cada checkpoint intermediário
+def test_checkpoint_and_resume_match_tick_simulation(monkeypatch, tmp_path):
+    saved = []
+    save = Checkpoint.save
+
+    def keep(path, *args):
+        save(path, *args)
+        copy = f"{path}.{len(saved)}"
+        shutil.copy(path, copy)
+        saved.append(copy)
+
+    monkeypatch.setattr(Checkpoint, "save", staticmethod(keep))
+    monkeypatch.setattr(Scheduling, "CHECKPOINT_STEPS", 3)
+    path = str(tmp_path / "run.ckpt")
+    for trial, spec, quantum, aging in workloads():
+        for method in ALGORITHMS:
+            expected = reference(spec, quantum, aging, trial, method)
+            saved.clear()
+            scheduling = scheduler(spec, quantum, aging, trial, engine="event")
+            scheduling.set_checkpoint(path, every=0)
+            assert outcome(*scheduling.run_algorithm(method)) == expected, (trial, method)
+            for snapshot in saved[:-1]:
+                scheduling = scheduler(spec, quantum, aging, trial, engine="event")
+                random.seed(12345) # a continuação tem que restaurar o random do checkpoint
+                shutil.copy(snapshot, path)
+                scheduling.set_checkpoint(path, every=1e9, resume=True)
+                assert outcome(*scheduling.run_algorithm(method)) == expected, (trial, method, snapshot)
+            for snapshot in saved:
+                os.remove(snapshot)
+
+
+# Streaming e modo resumo não guardam os processos: mesmas trocas de contexto e médias
+@pytest.mark.parametrize("mode", ["stream", "summary"])
+def test_accumulated_metrics_match_tick_simulation(mode):
+    for trial, spec, quantum, aging in workloads():
+        for method in ALGORITHMS:
+            scheduling = scheduler(spec, quantum, aging, trial)
+            scheduling.fast_path = False
+            procs, timeline, cs = scheduling._run(method)
+            expected = Utils.collectMetrics(procs, cs)
+            scheduling = scheduler(spec, quantum, aging, trial, engine="event",
+                                   mode="stream" if mode == "stream" else "list")
+            if mode == "summary":
+                scheduling.set_summary()
+            procs, summary, cs = scheduling.run_algorithm(method)
+            got = Utils.collectMetrics(procs, cs)
+            if mode == "stream":
+                # no streaming os pids seguem a ordem de chegada (P1, P2, ...)
+                ordered = sorted(spec, key=lambda record: record[1])
+                pids = {f"P{i + 1}": record[0] for i, record in enumerate(ordered)}
+                segments = [(start, end, pids.get(pid)) for start, end, pid in summary]
+                assert segments == list(timeline), (trial, method)
+            for field in ("cs", "avg_turnaround", "avg_waiting", "avg_response", "makespan"):
+                assert getattr(got, field) == pytest.approx(getattr(expected, field)), (trial, method, field)
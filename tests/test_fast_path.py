@@ -0,0 +1,36 @@
+import time
+import pytest
+import FastPath as fast_path
+from FastPath import FastPath
+from Process import Process
+from Scheduling import Scheduling
+
+# O caminho rápido sorteia entre os empatados do mesmo jeito que a ReadyQueue; com todos
+# empatados o grupo tem a carga inteira e cada despacho tem que custar O(log n), não O(n)
+
+
+def tied_run_time(method, n):
+    scheduling = Scheduling(quantum=2, aging=1, engine="event", seed=1)
+    for i in range(n):
+        scheduling.add_process(Process(f"P{i + 1}", 0, 5, 1))
+    assert FastPath.applies(scheduling, method)
+    start = time.perf_counter()
+    procs, _, _ = scheduling.run_algorithm(method)
+    elapsed = time.perf_counter() - start
+    assert all(p.finish_time is not None for p in procs)
+    return elapsed
+
+
+# FCFS com NumPy (_fcfs_numpy) e sem NumPy (_by_completion), SJF e Prioridade (_by_completion)
+@pytest.mark.parametrize("method,numpy", [("FCFS", True), ("FCFS", False), ("SJF", True),
+                                          ("PriorityNonPreemptive", True)])
+def test_all_tied_dispatch_scales_near_linearly(monkeypatch, method, numpy):
+    if numpy and fast_path.np is None:
+        pytest.skip("NumPy não instalado")
+    if not numpy:
+        monkeypatch.setattr(fast_path, "np", None)
+    tied_run_time(method, 5000) # aquece
+    small = min(tied_run_time(method, 20000) for _ in range(2))
+    large = min(tied_run_time(method, 80000) for _ in range(2))
+    # 4x mais processos: quadrático daria ~16x
+    assert large < 8 * small, (small, large)
@@ -0,0 +1,107 @@
+import math
+import random
+import statistics
+import pytest
+import Metrics as metrics_module
+from Metrics import Metrics, QuantileSketch, RunningStats
+from utils import Utils
+
+np = pytest.importorskip("numpy")
+
+# Métricas: percentis iguais aos do numpy.percentile (com e sem NumPy), esboço de quantis
+# dentro do erro relativo e estatísticas acumuladas iguais às do módulo statistics
+
+
+def sample(n=997, seed=11):
+    rng = random.Random(seed)
+    arrival = [rng.randint(0, 5000) for _ in range(n)]
+    burst = [rng.randint(1, 50) for _ in range(n)]
+    start = [a + rng.randint(0, 300) for a in arrival]
+    finish = [s + b + rng.choice([0, 0, rng.randint(1, 2000)]) for s, b in zip(start, burst)]
+    return arrival, burst, start, finish
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_percentile_columns_match_numpy(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(metrics_module, "np", None)
+    arrival, burst, start, finish = sample()
+    metrics = Metrics.from_columns(arrival, burst, start, finish, cs=3)
+    turnaround = np.array(finish) - np.array(arrival)
+    columns = {"turnaround": turnaround, "waiting": turnaround - np.array(burst),
+               "response": np.array(start) - np.array(arrival)}
+    for name, values in columns.items():
+        distribution = getattr(metrics, name)
+        expected = np.percentile(values, Metrics.PERCENTILES)
+        for q, value in zip(Metrics.PERCENTILES, expected):
+            assert distribution[f"p{q}"] == pytest.approx(float(value), rel=1e-12, abs=1e-9), (name, q)
+        assert distribution["max"] == int(values.max())
+        assert getattr(metrics, f"avg_{name}") == pytest.approx(float(values.mean()))
+    assert metrics.busy_time == sum(burst) and metrics.makespan == max(finish)
+
+
+def test_single_process_distribution():
+    metrics = Metrics.from_columns([2], [3], [4], [9], cs=0)
+    assert metrics.turnaround == {"p50": 7.0, "p95": 7.0, "p99": 7.0, "max": 7}
+
+
+@pytest.mark.parametrize("accuracy", [0.01, 0.05])
+def test_quantile_sketch_within_relative_error(accuracy):
+    rng = random.Random(4)
+    values = [rng.lognormvariate(3, 2) for _ in range(5000)] + [0] * 50 + [rng.randint(1, 10) for _ in range(500)]
+    sketch = QuantileSketch(accuracy)
+    for value in values:
+        sketch.add(value)
+    for q in (0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99, 0.999, 1):
+        exact = float(np.percentile(values, q * 100))
+        assert abs(sketch.quantile(q) - exact) <= accuracy * exact + 1e-9, q
+    # juntar esboços é o mesmo que adicionar tudo num só
+    left, right = QuantileSketch(accuracy), QuantileSketch(accuracy)
+    for i, value in enumerate(values):
+        (left if i % 3 else right).add(value)
+    left.merge(right)
+    assert [left.quantile(q) for q in (0.5, 0.99)] == [sketch.quantile(q) for q in (0.5, 0.99)]
+    with pytest.raises(ValueError):
+        left.merge(QuantileSketch(accuracy * 2))
+
+
+def test_running_stats_match_statistics():
+    rng = random.Random(8)
+    values = [rng.randint(-50, 10**6) for _ in range(3000)]
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+    assert stats.mean == pytest.approx(statistics.mean(values), rel=1e-12)
+    assert stats.stddev ** 2 == pytest.approx(statistics.pvariance(values), rel=1e-9) # populacional
+    assert stats.m2 / (stats.count - 1) == pytest.approx(statistics.variance(values), rel=1e-9)
+    assert stats.max == max(values)
+    # merge (Chan) em partes de tamanhos diferentes
+    merged = RunningStats()
+    for lo, hi in ((0, 1), (1, 700), (700, 3000)):
+        part = RunningStats()
+        for value in values[lo:hi]:
+            part.add(value)
+        merged.merge(part)
+    merged.merge(RunningStats())
+    assert merged.count == len(values) and merged.max == max(values)
+    assert merged.mean == pytest.approx(statistics.mean(values), rel=1e-12)
+    assert merged.stddev == pytest.approx(math.sqrt(statistics.pvariance(values)), rel=1e-9)
+    # percentis do esboço limitados pelo máximo exato
+    distribution = stats.distribution()
+    assert distribution["max"] == max(values) and all(distribution[f"p{q}"] <= max(values)
+                                                      for q in Metrics.PERCENTILES)
+
+
+# A tabela impressa tem uma coluna por percentil, separadas mesmo com valores grandes
+def test_printed_percentile_columns(capsys):
+    arrival, burst, start, finish = sample()
+    finish[0] += 10**9 # máximo com muitos dígitos
+    metrics = Metrics.from_columns(arrival, burst, start, finish, cs=0)
+    Utils.printMetrics(metrics)
+    lines = capsys.readouterr().out.splitlines()
+    header = next(line for line in lines if "p50" in line).split()
+    assert header == [f"p{q}" for q in Metrics.PERCENTILES] + ["max"]
+    turnaround = np.array(finish) - np.array(arrival)
+    row = next(line for line in lines if line.startswith("Turnaround")).split()[1:]
+    expected = list(np.percentile(turnaround, Metrics.PERCENTILES)) + [turnaround.max()]
+    assert row == [f"{value:.2f}" for value in expected]
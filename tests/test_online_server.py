@@ -0,0 +1,101 @@
+import asyncio
+import random
+import pytest
+from OnlineServer import OnlineServer, OnlineClient
+from Process import Process
+from Scheduling import Scheduling
+from utils import Utils
+
+# O servidor online, alimentado pelo cliente como no replay (envia as chegadas de cada
+# instante e avança até ele), toma as mesmas decisões da simulação smp em lote com 1 núcleo
+
+ALGORITHMS = [method for _, method in Scheduling.ALGORITHMS]
+
+
+def workload(seed):
+    rng = random.Random(seed)
+    return sorted(((f"P{i + 1}", rng.randint(0, 30), rng.randint(1, 5), rng.randint(0, 3)) for i in range(20)),
+                  key=lambda record: record[1])
+
+
+def new_scheduling(seed):
+    return Scheduling(quantum=2, aging=1, engine="smp", seed=seed, cores=1)
+
+
+# Decisões (tempo, núcleo, ação, pid) de uma execução em lote: um despacho no início de cada
+# trecho de outro processo (trechos seguidos do mesmo processo não são despacho novo) e os términos
+def batch_decisions(records, seed, method):
+    scheduling = new_scheduling(seed)
+    for record in records:
+        scheduling.add_process(Process(*record))
+    procs, cores, cs = scheduling.run_algorithm(method)
+    decisions = []
+    last = None
+    for start, end, pid in cores[0].timeline:
+        if pid is not None and not (last is not None and last[2] == pid and last[1] == start):
+            decisions.append((start, 0, "dispatch", pid))
+        last = (start, end, pid)
+    decisions += [(p.finish_time, 0, "finish", p.pid) for p in procs]
+    decisions.sort(key=lambda d: (d[0], d[2] == "dispatch")) # no mesmo instante o término vem antes
+    return decisions, Utils.collectMetrics(procs, cs)
+
+
+async def start_server(seed, method):
+    server = OnlineServer(new_scheduling(seed), method)
+    tcp = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    port = tcp.sockets[0].getsockname()[1]
+    return tcp, await OnlineClient.connect("127.0.0.1", port)
+
+
+async def online_decisions(records, seed, method):
+    tcp, client = await start_server(seed, method)
+    try:
+        decisions = []
+        i = 0
+        while i < len(records):
+            arrival = records[i][1]
+            while i < len(records) and records[i][1] == arrival:
+                await client.submit(*records[i])
+                i += 1
+            decisions += await client.advance(arrival)
+        decisions += await client.advance()
+        assert await client.next_decision() is None
+        return [tuple(d) for d in decisions], await client.metrics()
+    finally:
+        await client.close()
+        tcp.close()
+        await tcp.wait_closed()
+
+
+@pytest.mark.parametrize("method", ALGORITHMS)
+def test_online_decisions_match_batch_smp(method):
+    for seed in range(5):
+        records = workload(seed)
+        expected, metrics = batch_decisions(records, seed, method)
+        decisions, online_metrics = asyncio.run(online_decisions(records, seed, method))
+        assert decisions == expected, (seed, method)
+        for field in ("cs", "avg_turnaround", "avg_waiting", "avg_response", "makespan"):
+            assert online_metrics[field] == pytest.approx(getattr(metrics, field)), (seed, method, field)
+
+
+# Uma chegada no instante atual ou antes dele é recusada; a conexão continua utilizável
+def test_rejects_arrival_not_after_now():
+    async def scenario():
+        tcp, client = await start_server(1, "FCFS")
+        try:
+            await client.submit("P1", 5, 3, 0)
+            await client.advance(5)
+            for arrival in (5, 2):
+                with pytest.raises(ValueError, match="não é posterior"):
+                    await client.submit("P2", arrival, 1, 0)
+            with pytest.raises(ValueError, match="O tempo não volta"):
+                await client.advance(4)
+            await client.submit("P2", 6, 1, 0)
+            return await client.advance()
+        finally:
+            await client.close()
+            tcp.close()
+            await tcp.wait_closed()
+
+    assert [tuple(d) for d in asyncio.run(scenario())] == [
+        (8, 0, "finish", "P1"), (8, 0, "dispatch", "P2"), (9, 0, "finish", "P2")]
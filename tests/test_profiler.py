@@ -0,0 +1,85 @@
+import random
+import pytest
+import FastPath as fast_path
+from FastPath import FastPath
+from Process import Process
+from Profiler import Profiler
+from ReadyQueue import ReadyQueue
+from Scheduling import Scheduling
+from Timeline import TimelineSummary
+from Workload import StreamWorkload
+
+# Cada motor e modo passa pelos métodos instrumentados: contagens não nulas na fila de prontos
+# (ou no caminho rápido), na timeline e nas partes próprias do motor
+
+ALGORITHMS = [method for _, method in Scheduling.ALGORITHMS]
+POLICY_SELECT = {"FCFS": "NonPreemptive.select", "SJF": "NonPreemptive.select",
+                 "SRTF": "Preemptive.select", "PriorityNonPreemptive": "NonPreemptive.select",
+                 "PriorityPreemptive": "Preemptive.select", "RoundRobin": "RoundRobin.select",
+                 "RoundRobinPriorityAging": "RoundRobinAging.select"}
+
+
+def spec():
+    rng = random.Random(1)
+    return [(f"P{i + 1}", rng.randint(0, 40), rng.randint(1, 6), rng.randint(0, 3)) for i in range(30)]
+
+
+def profile(mode):
+    profiler = Profiler()
+    profiler.install()
+    try:
+        for method in ALGORITHMS:
+            engine = {"tick": "tick", "tick-fast": "tick", "smp": "smp"}.get(mode, "event")
+            scheduling = Scheduling(quantum=2, aging=1, engine=engine, seed=1,
+                                    **({"cores": 2} if mode == "smp" else {}))
+            scheduling.fast_path = mode.endswith("fast")
+            if mode == "stream":
+                ordered = sorted(spec(), key=lambda record: record[1])
+                scheduling.set_workload(StreamWorkload.from_lines(f"{a} {b} {p}" for _, a, b, p in ordered))
+            else:
+                for record in spec():
+                    scheduling.add_process(Process(*record))
+            if mode == "summary":
+                scheduling.set_summary()
+            scheduling.run_algorithm(method)
+    finally:
+        profiler.uninstall()
+    return profiler.as_dict()
+
+
+# Rótulos que têm que aparecer com contagem > 0 para o algoritmo no modo
+def expected_labels(mode, method):
+    labels = {"TimelineSummary.append" if mode == "summary" else "Timeline.append"}
+    if mode.endswith("fast") and method in FastPath.METHODS:
+        labels.add("FastPath._fcfs_numpy" if method == "FCFS" and fast_path.np is not None
+                   else "FastPath._by_completion")
+        return labels
+    if method == "RoundRobinPriorityAging":
+        labels |= {"MultiLevelQueue.push", "MultiLevelQueue.pop_best", "MultiLevelQueue.age"}
+    elif method != "RoundRobin": # o RR do motor por ticks usa a deque direto
+        labels |= {"ReadyQueue.push", "ReadyQueue.pop_best"}
+    if not mode.startswith("tick"):
+        labels.add(POLICY_SELECT[method])
+    if mode == "smp":
+        labels |= {"LoadIndex.update", "LoadIndex.least_loaded", "LoadIndex.busiest"}
+    return labels
+
+
+@pytest.mark.parametrize("mode", ["tick", "tick-fast", "event", "event-fast", "smp", "summary", "stream"])
+def test_counters_are_non_zero(mode):
+    result = profile(mode)
+    assert set(result) == set(ALGORITHMS)
+    for method in ALGORITHMS:
+        counts, seconds = result[method]["counts"], result[method]["seconds"]
+        for label in expected_labels(mode, method):
+            assert counts.get(label, 0) > 0, (mode, method, label)
+        assert seconds["simulação"] > 0 and sum(seconds.values()) > seconds["simulação"], (mode, method)
+
+
+def test_uninstall_restores_methods():
+    originals = (ReadyQueue.pop_best, TimelineSummary.append, Scheduling.run_algorithm)
+    profiler = Profiler()
+    profiler.install()
+    assert ReadyQueue.pop_best is not originals[0]
+    profiler.uninstall()
+    assert (ReadyQueue.pop_best, TimelineSummary.append, Scheduling.run_algorithm) == originals
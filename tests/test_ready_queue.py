@@ -0,0 +1,108 @@
+import heapq
+import random
+import time
+import ReadyQueue as ready_queue
+from ReadyQueue import ReadyQueue, OrderedBucket
+from Process import Process
+from Scheduling import Scheduling
+from WorkloadGenerator import WorkloadGenerator
+
+
+# Conta as operações de heap da ReadyQueue numa execução do motor event
+def heap_operations(method, n, monkeypatch):
+    counts = {"ops": 0}
+
+    def counted(function):
+        def wrapper(*args):
+            counts["ops"] += 1
+            return function(*args)
+        return wrapper
+
+    monkeypatch.setattr(ready_queue.heapq, "heappush", counted(heapq.heappush))
+    monkeypatch.setattr(ready_queue.heapq, "heappop", counted(heapq.heappop))
+    scheduling = Scheduling(quantum=2, aging=1, engine="event", seed=1)
+    scheduling.fast_path = False
+    for record in WorkloadGenerator(seed=3, load=1.2).generate(n):
+        scheduling.add_process(Process(*record))
+    scheduling.run_algorithm(method)
+    monkeypatch.undo()
+    return counts["ops"]
+
+
+# Com a carga acima da capacidade os grupos de empatados crescem com a fila; as operações de
+# heap por processo não podem crescer junto (cada decisão tira só o escolhido do balde)
+def test_heap_operations_scale_linearly(monkeypatch):
+    for method in ("PriorityPreemptive", "PriorityNonPreemptive", "SJF", "SRTF", "FCFS"):
+        small = heap_operations(method, 5000, monkeypatch) / 5000
+        large = heap_operations(method, 20000, monkeypatch) / 20000
+        assert large < 1.5 * small + 1, (method, small, large)
+
+
+def test_pop_best_keeps_insertion_order_among_ties():
+    queue = ReadyQueue(key=lambda p: p.burst)
+    procs = [Process(f"P{i}", 0, burst, 1) for i, burst in enumerate([3, 1, 1, 2, 1])]
+    for p in procs:
+        queue.push(p)
+    seen = []
+    assert queue.pop_best(lambda tied: seen.append(list(tied)) or tied[1]) is procs[2]
+    assert seen == [[procs[1], procs[2], procs[4]]]
+    queue.discard(procs[1])
+    assert queue.pop_best(lambda tied: tied[0]) is procs[4]
+    assert queue.peek_key() == 2
+    assert [queue.pop_best(lambda tied: tied[0]) for _ in range(2)] == [procs[3], procs[0]]
+    assert queue.pop_best(lambda tied: tied[0]) is None and not queue
+
+
+# Tempo de uma execução em que todos os processos empatam (mesma chegada, execução e prioridade)
+def tied_run_time(method, n):
+    scheduling = Scheduling(quantum=2, aging=1, engine="event", seed=1)
+    scheduling.fast_path = False
+    for i in range(n):
+        scheduling.add_process(Process(f"P{i + 1}", 0, 5, 1))
+    start = time.perf_counter()
+    scheduling.run_algorithm(method)
+    return time.perf_counter() - start
+
+
+# Com todos empatados o balde tem a fila inteira: cada decisão tem que custar O(log n) e não
+# O(n), senão 4x mais processos custam 16x mais tempo
+def test_all_tied_decisions_scale_near_linearly():
+    for method in ("SJF", "SRTF", "PriorityPreemptive", "RoundRobinPriorityAging"):
+        tied_run_time(method, 2000) # aquece
+        small = min(tied_run_time(method, 10000) for _ in range(2))
+        large = min(tied_run_time(method, 40000) for _ in range(2))
+        assert large < 8 * small, (method, small, large)
+
+
+# OrderedBucket se comporta como uma lista com insert(0), append, pop(i) e remove
+def test_ordered_bucket_matches_list():
+    rng = random.Random(7)
+    bucket, reference = OrderedBucket(range(50)), list(range(50))
+    next_item = 50
+    for _ in range(5000):
+        op = rng.randrange(4)
+        if op == 0:
+            bucket.append(next_item)
+            reference.append(next_item)
+            next_item += 1
+        elif op == 1:
+            bucket.appendleft(next_item)
+            reference.insert(0, next_item)
+            next_item += 1
+        elif reference and op == 2:
+            k = rng.randrange(len(reference))
+            assert bucket.pop(k) == reference.pop(k)
+        elif reference:
+            item = rng.choice(reference)
+            bucket.remove(item)
+            reference.remove(item)
+        assert len(bucket) == len(reference)
+        if reference:
+            k = rng.randrange(len(reference))
+            assert bucket[k] == reference[k] and bucket[-1] == reference[-1]
+    assert list(bucket) == reference
+    # o sorteio escolhe a mesma posição que numa lista
+    state = random.getstate()
+    chosen = random.choice(bucket)
+    random.setstate(state)
+    assert chosen == random.choice(reference)
@@ -0,0 +1,57 @@
+import random
+import pytest
+from Metrics import ReplicationSummary
+from Process import Process
+from Scheduling import Scheduling
+
+# Replicação de Monte Carlo: sem desempates aleatórios só a primeira replicação executa; com
+# desempates as n executam, com sementes que só dependem de base_seed
+
+ALGORITHMS = [method for _, method in Scheduling.ALGORITHMS]
+
+
+def scheduler(spec):
+    scheduling = Scheduling(quantum=2, aging=1, engine="event")
+    for record in spec:
+        scheduling.add_process(Process(*record))
+    return scheduling
+
+
+def test_workload_without_ties_runs_one_replication():
+    # chegadas espaçadas: nunca há dois processos prontos ao mesmo tempo
+    spec = [(f"P{i + 1}", 10 * i, 1 + i % 5, i % 3) for i in range(30)]
+    summaries = scheduler(spec).run_replications(20, workers=2)
+    assert list(summaries) == ALGORITHMS
+    for method, summary in summaries.items():
+        assert summary.n == 1 and summary.ties == 0, method
+        mean, low, high = summary.avg_turnaround
+        assert low == mean == high
+
+
+def test_workload_with_ties_runs_every_replication():
+    rng = random.Random(2)
+    spec = [(f"P{i + 1}", rng.randint(0, 3), rng.choice([2, 4]), 1) for i in range(25)]
+    first = scheduler(spec).run_replications(6, workers=2, base_seed=7)
+    second = scheduler(spec).run_replications(6, workers=3, base_seed=7)
+    for method in ALGORITHMS:
+        summary = first[method]
+        assert summary.as_dict() == second[method].as_dict(), method # não depende do pool
+        if method == "RoundRobin": # não sorteia
+            assert summary.n == 1 and summary.ties == 0
+        else:
+            assert summary.n == 6 and summary.ties > 0, method
+            mean, low, high = summary.avg_waiting
+            assert low <= mean <= high
+
+
+def test_confidence_interval_uses_student_t():
+    # quantis tabelados da t de Student: exatos com 1 e 2 graus, Cornish-Fisher a partir de 3
+    for p, dof, expected in ((0.975, 1, 12.706), (0.975, 2, 4.303), (0.995, 2, 9.925)):
+        assert ReplicationSummary._t_quantile(p, dof) == pytest.approx(expected, abs=2e-3)
+    for p, dof, expected in ((0.975, 3, 3.182), (0.975, 5, 2.571), (0.975, 10, 2.228),
+                             (0.975, 30, 2.042), (0.995, 5, 4.032), (0.995, 10, 3.169)):
+        assert ReplicationSummary._t_quantile(p, dof) == pytest.approx(expected, rel=0.01)
+    summary = ReplicationSummary([(1.0, 2.0, 3), (3.0, 2.0, 3)])
+    mean, low, high = summary.avg_turnaround
+    assert mean == 2.0 and high - mean == pytest.approx(12.706, abs=2e-3) # s = sqrt(2), n = 2
+    assert summary.avg_waiting == (2.0, 2.0, 2.0)
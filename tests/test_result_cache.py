@@ -0,0 +1,102 @@
+import os
+import subprocess
+import sys
+from Process import Process
+from ResultCache import ResultCache
+from Scheduling import Scheduling
+
+# Cache de resultados: acerto sem simular de novo, remoção LRU pela data de modificação,
+# --no-cache sem tocar no cache e chave separada por modo das métricas
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SPEC = [("P1", 0, 5, 1), ("P2", 1, 3, 2), ("P3", 2, 3, 2), ("P4", 9, 2, 0), ("P5", 9, 2, 0)]
+
+
+def scheduler(cache):
+    scheduling = Scheduling(quantum=2, aging=1, engine="event", seed=1)
+    for record in SPEC:
+        scheduling.add_process(Process(*record))
+    scheduling.set_cache(cache)
+    return scheduling
+
+
+def entries(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".bin"))
+
+
+def test_hit_skips_simulation(tmp_path, monkeypatch, capsys):
+    cache = ResultCache(str(tmp_path))
+    first = scheduler(cache).run_all_algorithms()
+    output = capsys.readouterr().out
+    assert len(entries(tmp_path)) == len(Scheduling.ALGORITHMS)
+
+    def fail(self, method):
+        raise AssertionError(f"{method} simulado de novo")
+
+    monkeypatch.setattr(Scheduling, "_run", fail)
+    second = scheduler(cache).run_all_algorithms()
+    assert {m: r.as_dict() for m, r in second.items()} == {m: r.as_dict() for m, r in first.items()}
+    assert capsys.readouterr().out == output # mesma impressão, com a timeline vinda do cache
+
+
+def test_get_missing_and_corrupted_entries(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    key = ResultCache.key("carga", "FCFS", 2, 1, 1)
+    assert cache.get(key) is None
+    cache.put(key, [(0, 2, "P1")], 0, {"cs": 0})
+    assert cache.get(key) == ([(0, 2, "P1")], 0, {"cs": 0})
+    with open(tmp_path / f"{key}.bin", 'wb') as file:
+        file.write(b"lixo")
+    assert cache.get(key) is None
+    assert entries(tmp_path) == [] # entrada corrompida é removida
+
+
+def test_evicts_least_recently_used_by_mtime(tmp_path):
+    segments = [(i, i + 1, f"P{i}") for i in range(200)]
+    cache = ResultCache(str(tmp_path), max_bytes=10**9)
+    keys = [ResultCache.key("carga", f"A{i}", 2, 1, 1) for i in range(3)]
+    for age, key in zip((300, 200, 100), keys):
+        cache.put(key, segments, 0, None)
+        path = tmp_path / f"{key}.bin"
+        os.utime(path, (path.stat().st_mtime - age,) * 2) # A0 mais antigo, A2 mais novo
+    size = (tmp_path / f"{keys[0]}.bin").stat().st_size
+    assert cache.get(keys[0]) is not None # a leitura faz de A0 o mais recente
+    cache.max_bytes = 3 * size + size // 2
+    cache.put(ResultCache.key("carga", "A3", 2, 1, 1), segments, 0, None)
+    assert cache.get(keys[1]) is None # A1 era o usado há mais tempo
+    assert cache.get(keys[0]) is not None and cache.get(keys[2]) is not None
+    # maior que o cache inteiro: não é guardado
+    cache.max_bytes = 10
+    cache.put(ResultCache.key("carga", "grande", 2, 1, 1), segments, 0, None)
+    assert cache.get(ResultCache.key("carga", "grande", 2, 1, 1)) is None
+
+
+def test_key_depends_on_metrics_mode(tmp_path, monkeypatch):
+    exact = ResultCache.key("carga", "FCFS", 2, 1, 1)
+    assert exact == ResultCache.key("carga", "FCFS", 2, 1, 1, mode="exact")
+    assert exact != ResultCache.key("carga", "FCFS", 2, 1, 1, mode="stream")
+    monkeypatch.setattr(Scheduling, "workload_digest", lambda self: "carga")
+    scheduling = scheduler(ResultCache(str(tmp_path)))
+    assert scheduling.cache_key("FCFS") == exact
+    scheduling.workload = object() # carga em streaming: percentis aproximados
+    assert scheduling.cache_key("FCFS") == ResultCache.key("carga", "FCFS", 2, 1, 1, mode="stream")
+
+
+def run_main(cwd, *args):
+    with open(os.path.join(ROOT, "processos.txt")) as stdin:
+        return subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), *args], cwd=cwd, stdin=stdin,
+                              capture_output=True, text=True, check=True).stdout
+
+
+def test_no_cache_flag_bypasses_cache(tmp_path):
+    cache_dir = tmp_path / "cache"
+    output = run_main(tmp_path, "--seed", "1", "--cache-dir", str(cache_dir))
+    stored = entries(cache_dir)
+    assert len(stored) == len(Scheduling.ALGORITHMS)
+    for name in stored:
+        os.utime(cache_dir / name, ns=(1, 1))
+    assert run_main(tmp_path, "--seed", "1", "--no-cache", "--cache-dir", str(cache_dir)) == output
+    assert entries(cache_dir) == stored
+    assert all((cache_dir / name).stat().st_mtime_ns == 1 for name in stored) # nem lidas
+    assert run_main(tmp_path, "--seed", "1", "--no-cache", "--cache-dir", str(tmp_path / "outro")) == output
+    assert not (tmp_path / "outro").exists()
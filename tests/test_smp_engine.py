@@ -0,0 +1,74 @@
+import random
+from collections import defaultdict
+import pytest
+from Process import Process
+from Scheduling import Scheduling
+
+# Motor smp com 2 a 4 núcleos em cargas aleatórias com semente: nenhum processo executa em
+# dois núcleos ao mesmo tempo, cada um executa exatamente a sua execução e termina, e um
+# núcleo que fica sem trabalho rouba da fila de um núcleo sobrecarregado
+
+ALGORITHMS = [method for _, method in Scheduling.ALGORITHMS]
+
+
+def workload(seed):
+    rng = random.Random(seed)
+    return [(f"P{i + 1}", rng.randint(-3, 50), rng.randint(1, 8), rng.randint(0, 4))
+            for i in range(rng.randint(5, 40))]
+
+
+def run(spec, method, cores, seed, placement="least-loaded", steal=True):
+    scheduling = Scheduling(quantum=2, aging=1, engine="smp", seed=seed, cores=cores,
+                            placement=placement, steal=steal)
+    processes = [Process(*record) for record in spec]
+    for process in processes:
+        scheduling.add_process(process)
+    _, result, cs = scheduling.run_algorithm(method)
+    return processes, result, cs
+
+
+def check_schedule(processes, cores):
+    runs = defaultdict(list) # pid -> trechos (início, fim, núcleo)
+    for core in cores:
+        previous_end = None
+        for start, end, pid in core.timeline:
+            assert start < end
+            assert previous_end is None or start >= previous_end # trechos do núcleo em ordem
+            previous_end = end
+            if pid is not None:
+                runs[pid].append((start, end, core.id))
+    for p in processes:
+        segments = sorted(runs[p.pid])
+        for (_, end, _), (start, _, _) in zip(segments, segments[1:]):
+            assert start >= end, (p.pid, segments) # nunca em dois núcleos no mesmo tick
+        assert sum(end - start for start, end, _ in segments) == p.burst, p.pid
+        assert p.remaining == 0 and p.finish_time == segments[-1][1], p.pid
+        assert p.start_time == segments[0][0] >= max(p.arrival, 0), p.pid
+
+
+@pytest.mark.parametrize("cores", [2, 3, 4])
+@pytest.mark.parametrize("placement", ["least-loaded", "round-robin"])
+def test_every_process_runs_on_one_core_at_a_time_and_completes(cores, placement):
+    for seed in range(15):
+        spec = workload(seed)
+        for method in ALGORITHMS:
+            processes, result, cs = run(spec, method, cores, seed, placement)
+            assert len(result) == cores
+            check_schedule(processes, result)
+            assert cs == sum(core.cs for core in result)
+
+
+# Na distribuição em rodízio o núcleo 0 recebe todos os processos longos; os outros terminam
+# os curtos, ficam ociosos e roubam da fila dele
+@pytest.mark.parametrize("cores", [2, 3, 4])
+def test_idle_cores_steal_from_overloaded_core(cores):
+    spec = [(f"P{i + 1}", 0, 30 if i % cores == 0 else 1, 1) for i in range(8 * cores)]
+    for method in ALGORITHMS:
+        processes, result, _ = run(spec, method, cores, 1, placement="round-robin")
+        check_schedule(processes, result)
+        assert result[0].steals == 0 and sum(core.steals for core in result[1:]) > 0, method
+        _, without, _ = run(spec, method, cores, 1, placement="round-robin", steal=False)
+        assert sum(core.steals for core in without) == 0
+        # com roubo o trabalho longo é dividido e tudo termina antes
+        makespan = max(p.finish_time for p in processes)
+        assert makespan < max(core.timeline[-1][1] for core in without), method
@@ -0,0 +1,91 @@
+import csv
+import gzip
+import io
+import json
+import random
+import pytest
+from Process import Process
+from Scheduling import Scheduling
+from TimelineExport import TimelineExporter
+
+# Exportação da timeline: volta igual nos três formatos, com e sem gzip, e o leitor binário
+# recusa arquivos truncados, de outra versão ou que não são timelines
+
+
+def timeline():
+    rng = random.Random(3)
+    scheduling = Scheduling(quantum=2, aging=1, engine="event", seed=1)
+    for i in range(200):
+        scheduling.add_process(Process(f"P{i + 1}", rng.randint(0, 900), rng.randint(1, 9), rng.randint(0, 4)))
+    segments = list(scheduling.run_algorithm("RoundRobinPriorityAging")[1])
+    # trechos que o motor não gera: antes do anterior (intervalo negativo), pid não ASCII e tempos grandes
+    return segments + [(segments[-1][1] - 5, segments[-1][1] + 2, "tarefa-ç"), (10**12, 10**12 + 300, None)]
+
+
+def read(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, 'rb') as file:
+        text = io.TextIOWrapper(file, encoding='utf-8').read()
+    if ".csv" in path:
+        rows = list(csv.reader(io.StringIO(text)))
+        assert rows[0] == ["start", "end", "pid"]
+        return [(int(start), int(end), pid or None) for start, end, pid in rows[1:]]
+    return [(row["start"], row["end"], row["pid"]) for row in map(json.loads, text.splitlines())]
+
+
+@pytest.mark.parametrize("fmt", TimelineExporter.FORMATS)
+@pytest.mark.parametrize("suffix", ["", ".gz"])
+def test_round_trip(tmp_path, monkeypatch, fmt, suffix):
+    monkeypatch.setattr(TimelineExporter, "BUFFER_SIZE", 64) # muitos blocos no leitor binário
+    monkeypatch.setattr(TimelineExporter, "BATCH", 7)
+    segments = timeline()
+    path = str(tmp_path / f"timeline.{fmt}{suffix}")
+    TimelineExporter.export(path, segments)
+    if suffix:
+        with open(path, 'rb') as file:
+            assert file.read(2) == b"\x1f\x8b" # gzip
+    got = list(TimelineExporter.read_binary(path)) if fmt == "bin" else read(path)
+    assert got == segments
+
+
+def test_format_from_argument_and_unknown_format(tmp_path):
+    path = str(tmp_path / "timeline.out")
+    TimelineExporter.export(path, [(0, 2, "P1")], fmt="bin")
+    assert list(TimelineExporter.read_binary(path)) == [(0, 2, "P1")]
+    with pytest.raises(ValueError, match="desconhecido"):
+        TimelineExporter(str(tmp_path / "timeline.txt"))
+
+
+@pytest.mark.parametrize("suffix", ["", ".gz"])
+def test_truncated_binary_is_rejected(tmp_path, suffix):
+    path = str(tmp_path / f"timeline.bin{suffix}")
+    TimelineExporter.export(path, timeline())
+    opener = gzip.open if suffix else open
+    with opener(path, 'rb') as file:
+        data = file.read()
+    truncated = str(tmp_path / f"truncated.bin{suffix}")
+    for cut in (1, 2, len(data) // 2):
+        with opener(truncated, 'wb') as file:
+            file.write(data[:-cut])
+        with pytest.raises(ValueError, match="truncado"):
+            list(TimelineExporter.read_binary(truncated))
+
+
+def test_version_mismatch_and_bad_magic_are_rejected(tmp_path):
+    path = str(tmp_path / "timeline.bin")
+    TimelineExporter.export(path, [(0, 2, "P1")])
+    with open(path, 'rb') as file:
+        data = bytearray(file.read())
+    data[len(TimelineExporter.BINARY_MAGIC)] = TimelineExporter.BINARY_VERSION + 1
+    with open(path, 'wb') as file:
+        file.write(data)
+    with pytest.raises(ValueError, match="Versão"):
+        list(TimelineExporter.read_binary(path))
+    with open(path, 'wb') as file:
+        file.write(TimelineExporter.BINARY_MAGIC) # sem o byte da versão
+    with pytest.raises(ValueError, match="Versão"):
+        list(TimelineExporter.read_binary(path))
+    with open(path, 'wb') as file:
+        file.write(b"start,end,pid\n0,2,P1\n")
+    with pytest.raises(ValueError, match="inválido"):
+        list(TimelineExporter.read_binary(path))
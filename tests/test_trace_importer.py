@@ -0,0 +1,106 @@
+import random
+import pytest
+from TraceImporter import TraceImporter
+
+# Importador de traces: amostras pequenas do ftrace e do perf sched com o resultado esperado,
+# e o parsing paralelo em blocos igual ao sequencial
+
+# Cenário (microssegundos desde o primeiro evento):
+#   0  tarefa 10 acorda (prio 120)         10 passa a executar
+#   15 tarefa 20 acorda (prio 110)         30 preempta a 10 (R), que executou 20
+#   50 a 20 dorme (S) depois de 20, volta a 10   55 a 10 dorme: 20 + 5 = 25
+#   60 a 30 (prio 125) aparece executando sem ter acordado   70 a 40 acorda e nunca executa
+#   100 a 30 é preemptada (R+) e o trace acaba: fica com os 40 executados
+EXPECTED = [("P1", 0, 25, 20), ("P2", 15, 20, 30), ("P3", 60, 40, 15)]
+
+FTRACE = """\
+# tracer: nop
+#
+#           TASK-PID     CPU#  |||||  TIMESTAMP  FUNCTION
+          <idle>-0       [000] dNh2.  1000.000000: sched_wakeup: comm=bash pid=10 prio=120 target_cpu=000
+          <idle>-0       [000] d..2.  1000.000010: sched_switch: prev_comm=swapper/0 prev_pid=0 prev_prio=120 prev_state=R ==> next_comm=bash next_pid=10 next_prio=120
+            bash-10      [000] d.h2.  1000.000015: sched_wakeup: comm=sh pid=20 prio=110 target_cpu=000
+            bash-10      [000] d..2.  1000.000020: irq_handler_entry: irq=24 name=eth0
+            bash-10      [000] d..2.  1000.000030: sched_switch: prev_comm=bash prev_pid=10 prev_prio=120 prev_state=R ==> next_comm=sh next_pid=20 next_prio=110
+              sh-20      [000] d..2.  1000.000050: sched_switch: prev_comm=sh prev_pid=20 prev_prio=110 prev_state=S ==> next_comm=bash next_pid=10 next_prio=120
+            bash-10      [000] d..2.  1000.000055: sched_switch: prev_comm=bash prev_pid=10 prev_prio=120 prev_state=S ==> next_comm=swapper/0 next_pid=0 next_prio=120
+          <idle>-0       [000] d..2.  1000.000060: sched_switch: prev_comm=swapper/0 prev_pid=0 prev_prio=120 prev_state=R ==> next_comm=make next_pid=30 next_prio=125
+            make-30      [000] d.h2.  1000.000070: sched_wakeup: comm=cc1 pid=40 prio=120 target_cpu=001
+            make-30      [000] d..2.  1000.000100: sched_switch: prev_comm=make prev_pid=30 prev_prio=125 prev_state=R+ ==> next_comm=swapper/0 next_pid=0 next_prio=120
+"""
+
+PERF = """\
+         swapper     0 [000]  1000.000000:       sched:sched_wakeup: bash:10 [120] success=1 CPU:000
+         swapper     0 [000]  1000.000010:       sched:sched_switch: swapper/0:0 [120] R ==> bash:10 [120]
+            bash    10 [000]  1000.000015:       sched:sched_wakeup: sh:20 [110] success=1 CPU:000
+            bash    10 [000]  1000.000030:       sched:sched_switch: bash:10 [120] R ==> sh:20 [110]
+              sh    20 [000]  1000.000050:       sched:sched_switch: sh:20 [110] S ==> bash:10 [120]
+            bash    10 [000]  1000.000055:       sched:sched_switch: bash:10 [120] S ==> swapper/0:0 [120]
+         swapper     0 [000]  1000.000060:       sched:sched_switch: swapper/0:0 [120] R ==> make:30 [125]
+            make    30 [000]  1000.000070:       sched:sched_wakeup_new: cc1:40 [120] success=1 CPU:001
+            make    30 [000]  1000.000100:       sched:sched_switch: make:30 [125] R+ ==> swapper/0:0 [120]
+"""
+
+
+@pytest.mark.parametrize("sample", [FTRACE, PERF], ids=["ftrace", "perf"])
+def test_sample_produces_expected_processes(sample):
+    records = list(TraceImporter().records(TraceImporter.events(sample.splitlines(True))))
+    assert records == EXPECTED
+    assert list(TraceImporter.lines(records)) == ["0 25 20\n", "15 20 30\n", "60 40 15\n"]
+
+
+def test_unit_rounds_and_keeps_minimum_burst():
+    records = list(TraceImporter(unit=20000).records(TraceImporter.events(FTRACE.splitlines(True))))
+    assert records == [("P1", 0, 1, 20), ("P2", 1, 1, 30), ("P3", 3, 2, 15)]
+    with pytest.raises(ValueError):
+        TraceImporter(unit=0)
+
+
+# Trace sintético maior: tarefas acordando, sendo preemptadas e dormindo em várias CPUs
+def synthetic_trace(path, events=3000):
+    rng = random.Random(9)
+    running = {}
+    lines = ["# tracer: nop\n"]
+    ns = 5 * 10**9
+    for _ in range(events):
+        ns += rng.randint(1, 5000)
+        cpu = rng.randrange(4)
+        stamp = f"{ns // 10**9}.{ns % 10**9:09d}"
+        if rng.random() < 0.3:
+            pid = rng.randint(1, 60)
+            lines.append(f"  task-{pid} [00{cpu}] d..2. {stamp}: sched_wakeup: comm=t{pid} pid={pid} "
+                         f"prio={rng.randint(100, 139)} target_cpu=00{cpu}\n")
+        else:
+            prev = running.get(cpu, 0)
+            nxt = rng.choice([0] + [p for p in range(1, 61) if p not in running.values()])
+            state = rng.choice(["R", "R+", "S", "D"])
+            lines.append(f"  task-{prev} [00{cpu}] d..2. {stamp}: sched_switch: prev_comm=t{prev} prev_pid={prev} "
+                         f"prev_prio=120 prev_state={state} ==> next_comm=t{nxt} next_pid={nxt} next_prio=120\n")
+            running[cpu] = nxt
+    with open(path, 'w') as file:
+        file.writelines(lines)
+
+
+def test_parallel_chunked_parsing_equals_serial(tmp_path):
+    path = str(tmp_path / "trace.txt")
+    synthetic_trace(path)
+    serial = list(TraceImporter.file_events(path))
+    assert len(serial) == 3000
+    for chunk_size in (97, 4096):
+        assert list(TraceImporter.file_events(path, workers=3, chunk_size=chunk_size)) == serial
+    records = list(TraceImporter().records(iter(serial)))
+    parallel = TraceImporter.file_events(path, workers=2, chunk_size=1000)
+    assert list(TraceImporter().records(parallel)) == records
+    assert [r[1] for r in records] == sorted(r[1] for r in records) # ordem de chegada
+
+
+# Buffer de reordenação limitado: os trechos longos são cortados, o tempo executado é o mesmo
+def test_bounded_pending_keeps_total_run_time(tmp_path):
+    path = str(tmp_path / "trace.txt")
+    synthetic_trace(path)
+    events = list(TraceImporter.file_events(path))
+    unlimited = list(TraceImporter(unit=1).records(iter(events)))
+    bounded = list(TraceImporter(unit=1, max_pending=3).records(iter(events)))
+    assert len(bounded) >= len(unlimited)
+    assert sum(r[2] for r in bounded) == sum(r[2] for r in unlimited)
+    assert [r[1] for r in bounded] == sorted(r[1] for r in bounded)
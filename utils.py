@@ -1,8 +1,15 @@
+import os
 import sys
 import random
 from Process import Process
+from Metrics import Metrics, MetricsAccumulator
+from ProcessTable import RunState
+from Timeline import TimelineSummary
 
 class Utils:
+    ties = 0 # desempates aleatórios com mais de uma opção (ver Utils.choice)
+    draws = 0 # chamadas de random.choice em Utils.choice (com ou sem empate)
+
     @staticmethod
     def readConfig(path="./config"): # Caminho padrão para o arquivo de configuração
         quantum = 2
@@ -26,11 +33,48 @@ class Utils:
             pass # Usa os valores padrão se ocorrer algum erro
         return quantum, aging
     
+    # Acrescenta suffix ao nome do arquivo, antes da extensão (.gz vai junto com a anterior)
+    # Só o nome é separado, então pontos no diretório ("./", "saida.v2/") não atrapalham
+    # "saida/run.csv.gz", "-{algorithm}" -> "saida/run-{algorithm}.csv.gz"
+    @staticmethod
+    def suffixPath(path, suffix, default_ext=""):
+        directory, name = os.path.split(path)
+        stem, ext = os.path.splitext(name)
+        if ext == ".gz":
+            stem, inner = os.path.splitext(stem)
+            ext = inner + ext
+        return os.path.join(directory, f"{stem}{suffix}{ext or default_ext}")
+
+    # Lê uma grade de valores inteiros para a varredura de parâmetros
+    # "1,2,4,8" -> [1, 2, 4, 8]; "1:5" -> [1, 2, 3, 4, 5]; "0:10:2" -> [0, 2, 4, 6, 8, 10]
+    @staticmethod
+    def parseGrid(text):
+        values = []
+        for part in text.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            if ':' in part:
+                bounds = [int(x) for x in part.split(':')]
+                if len(bounds) not in (2, 3) or (len(bounds) == 3 and bounds[2] <= 0):
+                    raise ValueError(f"Intervalo inválido: {part} (use inicio:fim ou inicio:fim:passo)")
+                step = bounds[2] if len(bounds) == 3 else 1
+                values.extend(range(bounds[0], bounds[1] + 1, step)) # fim incluso
+            else:
+                values.append(int(part))
+        return list(dict.fromkeys(values)) # sem repetidos, na ordem dada
+
     @staticmethod
     def readProcessesStdin(): # Lê processos do stdin pelo terminal ou por redirecionamento de arquivo
-        procs = []
+        return list(Utils.iterProcesses(sys.stdin))
+
+    # Lê os processos sob demanda (gerador), uma linha por vez, sem guardar a entrada
+    # lines: qualquer iterável de linhas (stdin, arquivo aberto, ...)
+    # Gera tuplas (pid, chegada, execução, prioridade)
+    @staticmethod
+    def iterProcesses(lines):
         pid = 1 # Contador do PID
-        for line in sys.stdin: # Lê cada linha do stdin e cria um processo se for valido
+        for line in lines: # Lê cada linha e gera um processo se for valido
             line = line.strip()
             if not line:
                 continue
@@ -41,44 +85,175 @@ class Utils:
             burst = int(parts[1])
             priority = int(parts[2])
 
-            # cria e adiciona na lista
-            procs.append((f'P{pid}', arrival, burst, priority))
+            yield (f'P{pid}', arrival, burst, priority)
             pid += 1
-        return procs
     
+    # Calcula as métricas (Metrics), imprime o resumo e a timeline e retorna as métricas
+    # processes: lista de processos, RunState (ProcessTable) ou MetricsAccumulator (streaming)
+    # timeline: Timeline (ou lista) de trechos (tempo_inicio, tempo_fim, pid); None ou
+    #           TimelineSummary (modo resumo) só imprime as métricas
     @staticmethod
     def compute_metrics(processes, timeline, cs):
-        # calcula turnaround e waiting times
-        total_turnaround = 0
-        total_waiting = 0
-        n = len(processes)
-
-        for p in processes:
-            turnaround = p.finish_time - p.arrival
-            waiting = turnaround - p.burst
-            total_turnaround += turnaround
-            total_waiting += waiting
-
-        avg_turnaround = total_turnaround / n if n > 0 else 0
-        avg_waiting = total_waiting / n if n > 0 else 0
-
-        print(f"\nTempo médio de vida (Turnaround Time): {avg_turnaround:.2f}")
-        print(f"Tempo médio de espera (Waiting Time): {avg_waiting:.2f}")
-        print(f"Número de trocas de contexto: {cs}\n")
-
-        print(f"\nTimeline: ")
-        Utils.printTimeline(processes, timeline)
+        metrics = Utils.collectMetrics(processes, cs)
+        if isinstance(processes, MetricsAccumulator):
+            processes = None # os processos não foram guardados
+
+        Utils.printMetrics(metrics)
+
+        # no modo resumo (TimelineSummary) não há trechos para imprimir
+        if timeline is not None and not isinstance(timeline, TimelineSummary):
+            print("\nTimeline: ")
+            Utils.printTimeline(processes, timeline)
+        return metrics
+
+    # Como compute_metrics para o motor smp: métricas da máquina inteira, resumo de cada
+    # núcleo e a timeline de cada núcleo que executou algo
+    # cores: lista de Core (SMPEngine)
+    @staticmethod
+    def compute_metrics_smp(processes, cores, cs):
+        metrics = Utils.collectMetrics(processes, cs).set_cores(len(cores))
+        if isinstance(processes, MetricsAccumulator):
+            processes = None
+
+        Utils.printMetrics(metrics)
+        Utils.printCores(cores, metrics.makespan)
+
+        for core in cores:
+            if len(core.timeline) and not isinstance(core.timeline, TimelineSummary):
+                print(f"\nTimeline do núcleo {core.id}: ")
+                Utils.printTimeline(None, core.timeline)
+        return metrics
+
+    # Resumo por núcleo: tempo ocupado, utilização, trocas de contexto, despachos e roubos
+    @staticmethod
+    def printCores(cores, makespan):
+        header = f"{'Núcleo':<8}{'Ocupado':>10}{'Utilização':>12}{'Trocas':>9}{'Despachos':>11}{'Roubos':>8}"
+        print(header)
+        print("-" * len(header))
+        for core in cores:
+            utilization = core.busy_time / makespan * 100 if makespan > 0 else 0
+            print(f"{core.id:<8}{core.busy_time:>10}{utilization:>11.1f}%{core.cs:>9}"
+                  f"{core.dispatches:>11}{core.steals:>8}")
+
+    # Calcula as métricas (sem imprimir) a partir do resultado de Scheduling.run_algorithm
+    @staticmethod
+    def collectMetrics(processes, cs):
+        if isinstance(processes, MetricsAccumulator):
+            return Metrics.from_accumulator(processes, cs) # já acumulado durante a simulação
+        if isinstance(processes, RunState):
+            return Metrics.from_run_state(processes, cs)
+        return Metrics.from_processes(processes, cs)
+
+    @staticmethod
+    def printMetrics(metrics):
+        print(f"\nTempo médio de vida (Turnaround Time): {metrics.avg_turnaround:.2f}")
+        print(f"Tempo médio de espera (Waiting Time): {metrics.avg_waiting:.2f}")
+        print(f"Número de trocas de contexto: {metrics.cs}\n")
+
+        print(f"Tempo médio de resposta (Response Time): {metrics.avg_response:.2f}")
+        # distribuição (aproximada na carga em streaming e no modo resumo, com o desvio padrão)
+        if metrics.turnaround is not None:
+            keys = [f"p{q}" for q in Metrics.PERCENTILES] + ["max"]
+            header = keys + (["desvio"] if metrics.stddev is not None else [])
+            rows = []
+            for label, field, dist in (("Turnaround", "turnaround", metrics.turnaround),
+                                       ("Espera", "waiting", metrics.waiting),
+                                       ("Resposta", "response", metrics.response)):
+                values = [dist[key] for key in keys] + ([metrics.stddev[field]] if metrics.stddev is not None else [])
+                rows.append((label, [f"{value:.2f}" for value in values]))
+            # colunas separadas por espaço e largas o bastante para o maior valor
+            widths = [max(9, len(key), *(len(cells[i]) for _, cells in rows)) for i, key in enumerate(header)]
+            print(f"{'':<11} " + ' '.join(f"{key:>{width}}" for key, width in zip(header, widths)))
+            for label, cells in rows:
+                print(f"{label:<11} " + ' '.join(f"{cell:>{width}}" for cell, width in zip(cells, widths)))
+        print(f"Utilização da CPU: {metrics.cpu_utilization * 100:.2f}%")
+        print(f"Vazão (Throughput): {metrics.throughput:.4f} processos por unidade de tempo\n")
         
+    # Imprime a tabela da varredura de parâmetros, uma linha por combinação
+    # results: lista de (método, quantum, aging, Metrics) como em Scheduling.run_sweep
+    @staticmethod
+    def printSweep(results):
+        header = (f"{'Algoritmo':<24}{'Quantum':>8}{'Aging':>7}{'Turnaround':>12}{'Espera':>10}"
+                  f"{'Resposta':>10}{'p95 Esp.':>10}{'Trocas':>9}{'CPU':>8}")
+        print(header)
+        print("-" * len(header))
+        for method, quantum, aging, metrics in results:
+            p95 = f"{metrics.waiting['p95']:>10.2f}" if metrics.waiting is not None else f"{'-':>10}"
+            print(f"{method:<24}{quantum:>8}{'-' if aging is None else aging:>7}"
+                  f"{metrics.avg_turnaround:>12.2f}{metrics.avg_waiting:>10.2f}{metrics.avg_response:>10.2f}"
+                  f"{p95}{metrics.cs:>9}{metrics.cpu_utilization * 100:>7.1f}%")
+
+    # Imprime a tabela das replicações: média e intervalo de confiança de cada campo
+    # results: {método: ReplicationSummary} como em Scheduling.run_replications
+    @staticmethod
+    def printReplications(results):
+        header = f"{'Algoritmo':<24}{'N':>6}" + ''.join(f"{label:>30}" for label in ("Turnaround", "Espera", "Trocas"))
+        print(header)
+        print("-" * len(header))
+        for method, summary in results.items():
+            row = f"{method:<24}{summary.n:>6}"
+            for field in summary.FIELDS:
+                mean, low, high = getattr(summary, field)
+                row += f"{f'{mean:.2f} [{low:.2f}, {high:.2f}]':>30}"
+            if summary.ties == 0:
+                row += "  (sem desempates aleatórios)"
+            print(row)
+
+    # Imprime a diferença da re-simulação incremental para a execução de base
+    # result: WhatIfResult como em Scheduling.run_what_if
+    # Mostra no máximo `limit` trechos removidos e adicionados de cada timeline
+    @staticmethod
+    def printWhatIf(result, limit=10):
+        if result.changed_at is None:
+            print("A carga editada é igual à da base")
+        else:
+            resumed = "do início" if result.resumed_from is None else f"do instante {result.resumed_from}"
+            print(f"Primeira chegada alterada: {result.changed_at} (simulação continuou {resumed})")
+        header = f"{'Métrica':<18}{'Base':>12}{'Editada':>12}{'Diferença':>12}"
+        print(header)
+        print("-" * len(header))
+        for field, (old, new, delta) in result.metrics_diff.items():
+            print(f"{field:<18}{old:>12.4f}{new:>12.4f}{delta:>+12.4f}")
+        for diff in result.timeline_diff:
+            if diff["from"] is None:
+                continue
+            label = f" do núcleo {diff['core']}" if len(result.timeline_diff) > 1 else ""
+            print(f"\nTimeline{label} muda a partir de {diff['from']}: "
+                  f"{len(diff['removed'])} trechos da base, {len(diff['added'])} novos")
+            for sign, segments in (("-", diff["removed"]), ("+", diff["added"])):
+                for start, end, pid in segments[:limit]:
+                    print(f"  {sign} {start}-{end} {pid or 'ociosa'}")
+                if len(segments) > limit:
+                    print(f"  {sign} ... mais {len(segments) - limit}")
+
+    # Imprime o perfil de cada algoritmo: tempo por fase e contagem de chamadas
+    # profile: {método: {"counts": {...}, "seconds": {...}}} como em Profiler.as_dict
+    @staticmethod
+    def printProfile(profile):
+        for method, data in profile.items():
+            seconds = data["seconds"]
+            total = sum(seconds.values())
+            print(f"{method} ({total:.3f}s)")
+            for phase, value in sorted(seconds.items(), key=lambda item: -item[1]):
+                share = value / total * 100 if total > 0 else 0
+                print(f"  {phase:<28}{value:>10.3f}s{share:>7.1f}%")
+            for label, count in sorted(data["counts"].items()):
+                print(f"  {label:<28}{count:>11}")
+            print()
+
     @staticmethod
     def printTimeline(processes, timeline):
         col_width = 6  # seta o espaço das colunas
 
-        # Cabeçalho
-        pids = [p.pid for p in sorted(processes, key=lambda x: int(x.pid[1:]))]
+        # Cabeçalho (sem a lista de processos usa os pids que aparecem na timeline)
+        if processes is None:
+            pids = sorted({pid for _, _, pid in timeline if pid is not None}, key=lambda x: int(x[1:]))
+        else:
+            pids = [p.pid for p in sorted(processes, key=lambda x: int(x.pid[1:]))]
         header = f"{'tempo'.ljust(col_width)}" + ''.join(pid.center(col_width) for pid in pids)
         print(header)
 
-        # Corpo da timeline
+        # Corpo da timeline (uma linha por trecho contínuo do mesmo processo)
         for start, end, running in timeline:
             time_label = f"{int(start)}-{int(end)}".ljust(col_width)
             row = [time_label]
@@ -86,75 +261,58 @@ class Utils:
                 row.append(('##' if running == pid else '--').center(col_width))
             print(''.join(row))
     
-    # Escolhe o proximo processo no Round Robin com 
+    # Escolhe o proximo processo no Round Robin com prioridade usando a fila multinível indexada
+    # (MultiLevelQueue) sem juntar todos os prontos numa lista
+    # Regras de desempate entre os do nível de menor prioridade dinâmica; o escolhido sai da fila:
+    #   (1) o processo que estava em execução, se estiver no nível
+    #   (2) o processo com menor tempo restante de processamento
+    #   (3) aleatório entre os com o menor tempo restante iguais
     @staticmethod
     def chooseNext(prio_levels, prefer_current_candidate=None):
+        # caso 1 pelo prefer; casos 2 e 3 entre os de menor tempo restante do nível (os empatados
+        # do nível já têm o mesmo tempo restante, então só falta o sorteio)
+        return prio_levels.pop_best(Utils.choice, prefer_current_candidate)
 
-        all_ready_procs = []
-        # pega todos os processos prontos em uma lista
-        for q in prio_levels.values():
-            all_ready_procs.extend(list(q))
-             
-        if not all_ready_procs: # se não houver ninguem na fila retorna None
-            return None
-            
-        # pega a menor prioridade dinâmica entre os processos prontos
-        best_prio = min(p.dynamic_priority for p in all_ready_procs)
-        
-        # filtra os processos que possuem menor prioridade dinâmica
-        candidates = [p for p in all_ready_procs if p.dynamic_priority == best_prio]
-        
-        # usa o metodo de desempate para escolher entre os candidatos 
-        next = Utils.breakTie(candidates, prefer_current_candidate)
-
-        if next:
-            # remove o processo escolhido da fila de prontos
-            prio_levels[next.dynamic_priority].remove(next)
-            return next
-
-        return None
-
-    # Selecionar entre os candidatos (desempatar)
-    # candidates: lista de processos
-    # prefer_current: processo que está atualmente em execução ou nenhum
-    # Ordem de preferencia: 
-        # (1) o processo ques está em execução e está entre os com menor tempo restante
-        # (2) o processo com menor tempo restante de processamento
-        # (3) Escolhe aleatoriamente entre os processos com menor tempo restante iguais
+    # Escolhe o proximo processo no SRTF usando a fila de prontos indexada (ReadyQueue por tempo restante)
+    # Regras de desempate, sem percorrer a fila; o escolhido sai da fila:
+    #   (1) o processo em execução, se estiver entre os com menor tempo restante
+    #   (2) o processo com menor tempo restante de processamento
+    #   (3) aleatório entre os com o menor tempo restante iguais
     @staticmethod
-    def breakTieSRTF(candidates, prefer_current):
+    def chooseNextSRTF(ready, current):
+        best_remaining = ready.peek_key()
+        # caso 1 o processo atual está entre os com menor tempo restante
+        if current and (best_remaining is None or current.remaining <= best_remaining):
+            return current
+        # casos 2 e 3 entre os prontos com menor tempo restante
+        return ready.pop_best(Utils.choice) # os empatados já têm o menor tempo restante
 
-        if not candidates: # não possui candidatos
-            return None
-        
-        min_remaining = min(p.remaining for p in candidates) # caso 2 pega o com menor tempo
-        tied = [p for p in candidates if p.remaining == min_remaining] # pega os candidatos com o menor tempo iguais
-        
-        # caso 1 caso o processo atual esteja entre os com menor tempo
-        if prefer_current and prefer_current in tied: 
-            return prefer_current 
-
-        # caso 3 retorna um aleatório caso tenha mais de um, se não retorna fixo o com menor tempo(lista de tamanho 1)
-        return random.choice(tied) 
-
-    # Selecionar entre os candidatos (desempatar)
-    # candidates: lista de processos
-    # prefer_current: processo que está atualmente em execução ou nenhum
-    # Ordem de preferencia: 
-        # (1) o processo que está em execução não importa se está entre os com menor tempo restante
-        # (2) o processo com menor tempo restante de processamento
-        # (3) Escolhe aleatoriamente entre os processos com menor tempo restante iguais
+    # Escolhe o proximo processo na prioridade preemptiva usando a fila de prontos indexada
+    # (ReadyQueue por (-prioridade, tempo restante))
+    # Regras de desempate entre os de maior prioridade (prontos + atual); o escolhido sai da fila:
+    #   (1) o processo em execução, se estiver entre eles
+    #   (2) o de menor tempo restante e (3) aleatório entre os com o menor tempo restante iguais
     @staticmethod
-    def breakTie(candidates, prefer_current):
+    def chooseNextPriority(ready, current):
+        best_key = ready.peek_key()
+        # caso 1 o processo atual está entre os de maior prioridade
+        if current and (best_key is None or -current.priority <= best_key[0]):
+            return current
 
-        if not candidates: # não possui candidatos
-            return None
-        
-        if prefer_current and prefer_current in candidates: # caso 1 caso o processo atual esteja entre os candidatos
-            return prefer_current
+        def tie(tied):
+            # só desempata se houver mais de um pronto com a maior prioridade
+            next_key = ready.peek_key()
+            if len(tied) == 1 and (next_key is None or next_key[0] != -tied[0].priority):
+                return tied[0]
+            return Utils.choice(tied) # os do balde já têm o mesmo tempo restante (caso 3)
+        return ready.pop_best(tie)
 
-        min_remaining = min(p.remaining for p in candidates) # caso 2 pega o com menor tempo
-        tied = [p for p in candidates if p.remaining == min_remaining] # pega os candidatos com o menor tempo iguais
-        
-        # caso 3 retorna um aleatório caso tenha mais de um, se não retorna fixo o com menor tempo(lista de tamanho 1)
-        return random.choice(tied) 
\ No newline at end of file
+    # random.choice que conta os desempates de fato aleatórios (mais de uma opção) em Utils.ties
+    # Sem nenhum, a execução não depende da semente (ver Scheduling.run_replications)
+    # Sempre chama random.choice, mesmo com uma opção, para não mudar a sequência do random
+    @staticmethod
+    def choice(options):
+        Utils.draws += 1
+        if len(options) > 1:
+            Utils.ties += 1
+        return random.choice(options) 
\ No newline at end of file